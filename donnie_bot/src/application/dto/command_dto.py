@@ -107,10 +107,11 @@ class DMActionCommand:
 class VoiceCommand:
     """Command for voice-related actions"""
     guild_id: str
-    action: str  # join, leave, speak, change_voice
+    action: str  # join, leave, speak, skip, stop, change_voice
     channel_id: Optional[str] = None
     text_to_speak: Optional[str] = None
     voice_config: Optional[VoiceConfig] = None
+    priority: bool = False  # DM narration plays ahead of other queued audio
 
 
 @dataclass
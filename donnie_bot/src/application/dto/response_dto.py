@@ -68,6 +68,10 @@ class ActionResult(CommandResult):
             updated_episode=episode,
             message=message
         )
+    
+    @classmethod
+    def failure(cls, error: str) -> "ActionResult":
+        return cls(success=False, error=error)
 
 
 @dataclass
@@ -83,6 +87,10 @@ class VoiceResult(CommandResult):
     @classmethod
     def connection_success(cls, is_connected: bool, message: str = "") -> "VoiceResult":
         return cls(success=True, is_connected=is_connected, message=message)
+    
+    @classmethod
+    def failure(cls, error: str) -> "VoiceResult":
+        return cls(success=False, error=error)
 
 
 @dataclass
@@ -1,14 +1,17 @@
 """
 Player and DM action handling use cases
 """
+import asyncio
 import logging
-from typing import Optional
-import hashlib
+from dataclasses import dataclass, field, replace
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
-from ...domain.services import EpisodeService, CharacterService, MemoryService, CombatService
-from ...domain.interfaces.ai_service import AIServiceInterface, AIContext
+from ...domain.entities import Episode, Memory
+from ...domain.services import EpisodeService, CharacterService, MemoryService, CombatService, RollingSummaryService
+from ...domain.interfaces.ai_service import (
+    AIServiceInterface, AIContext, AIResponse, AIPriority, AIServiceBusyError, RoundAction
+)
 from ...domain.interfaces.cache_service import CacheServiceInterface
-from ...infrastructure.cache.memory_cache import CacheKeys
 from ..dto import (
     PlayerActionCommand, DMActionCommand, CombatActionCommand,
     ActionResult, CombatResult
@@ -17,6 +20,15 @@ from ..dto import (
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class _PendingRound:
+    """Actions collected for one guild and episode while a round window is open"""
+    context: AIContext
+    actions: List[RoundAction] = field(default_factory=list)
+    futures: List[asyncio.Future] = field(default_factory=list)
+    full: asyncio.Event = field(default_factory=asyncio.Event)
+
+
 class HandleActionUseCase:
     """Use case for handling player and DM actions"""
     
@@ -26,16 +38,38 @@ class HandleActionUseCase:
                  ai_service: AIServiceInterface,
                  memory_service: Optional[MemoryService] = None,
                  combat_service: Optional[CombatService] = None,
-                 cache_service: Optional[CacheServiceInterface] = None):
+                 cache_service: Optional[CacheServiceInterface] = None,
+                 summary_service: Optional[RollingSummaryService] = None,
+                 round_window_seconds: Optional[float] = None,
+                 round_max_actions: int = 6,
+                 context_memory_limit: int = 20,
+                 relevant_memory_limit: int = 5):
         self.episode_service = episode_service
         self.character_service = character_service
         self.ai_service = ai_service
         self.memory_service = memory_service
         self.combat_service = combat_service
         self.cache_service = cache_service
+        self.summary_service = summary_service
+        
+        # Candidate memories per prompt; the AI service packs the best into its token budget
+        self.context_memory_limit = context_memory_limit
+        self.relevant_memory_limit = relevant_memory_limit
+        
+        # Round mode is off unless a window is configured
+        self.round_window_seconds = round_window_seconds
+        self.round_max_actions = round_max_actions
+        self._rounds: Dict[Tuple[str, int], _PendingRound] = {}
+        self._round_tasks: Set[asyncio.Task] = set()
     
-    async def handle_player_action(self, command: PlayerActionCommand) -> ActionResult:
-        """Handle a player action in the current episode"""
+    async def handle_player_action(self,
+                                   command: PlayerActionCommand,
+                                   on_text: Optional[Callable[[str], Awaitable[None]]] = None) -> ActionResult:
+        """Handle a player action in the current episode
+        
+        When `on_text` is given the AI response is streamed and the callback
+        receives the accumulated text after every delta.
+        """
         try:
             logger.info(f"Handling player action for user {command.discord_user_id}: {command.action_text[:50]}...")
             
@@ -60,38 +94,41 @@ class HandleActionUseCase:
             if not character.is_conscious():
                 return ActionResult.failure(f"**{character.name}** is unconscious and cannot act!")
             
-            # Get recent memories for context
-            recent_memories = []
-            if self.memory_service:
-                recent_memories = await self.memory_service.get_recent_context(command.guild_id, limit=10)
+            # Recent and action-relevant memories for context
+            recent_memories, relevant_memories = await self._gather_memories(command.guild_id, command.action_text)
+            summaries = await self._gather_summaries(episode)
+            
+            # Party roster for the stable (prompt-cached) campaign context
+            party = await self.character_service.get_guild_party(command.guild_id)
             
             # Build AI context
             context = AIContext(
                 episode=episode,
                 character=character,
                 recent_memories=recent_memories,
-                action_text=command.action_text
+                relevant_memories=relevant_memories,
+                summaries=summaries,
+                action_text=command.action_text,
+                party=party,
+                priority=self._action_priority(command.action_type)
             )
             
-            # Check cache for similar actions
+            # Narrative turns depend on the whole scene, so they are never cached.
+            # In round mode, resolve together with other actions posted in the same window.
             ai_response = None
-            if self.cache_service:
-                context_hash = self._hash_action_context(command.action_text, character.name, episode.episode_number)
-                cache_key = CacheKeys.ai_response(context_hash)
-                ai_response = await self.cache_service.get(cache_key)
+            if self._batches_action(command):
+                ai_response = await self._resolve_in_round(context)
+                if ai_response and on_text:
+                    await on_text(ai_response.text)
             
-            # Generate AI response if not cached
+            # Generate AI response (alone in its round, or round mode off)
             if not ai_response:
-                if command.action_type.lower() == "combat":
+                if on_text:
+                    ai_response = await self._stream_action_result(context, command.action_type, on_text)
+                elif command.action_type.lower() == "combat":
                     ai_response = await self.ai_service.generate_combat_narration(context)
                 else:
                     ai_response = await self.ai_service.generate_character_action_result(context)
-                
-                # Cache the response
-                if self.cache_service:
-                    context_hash = self._hash_action_context(command.action_text, character.name, episode.episode_number)
-                    cache_key = CacheKeys.ai_response(context_hash)
-                    await self.cache_service.set(cache_key, ai_response)
             
             # Add interaction to episode
             updated_episode = await self.episode_service.add_player_interaction(
@@ -101,16 +138,7 @@ class HandleActionUseCase:
                 dm_response=ai_response.text,
                 mode="ai_generated"
             )
-            
-            # Update caches
-            if self.cache_service:
-                # Update episode cache
-                episode_key = CacheKeys.episode_current(command.guild_id)
-                await self.cache_service.set(episode_key, updated_episode)
-                
-                # Clear memory cache to force refresh
-                memory_key = CacheKeys.memory_recent(command.guild_id)
-                await self.cache_service.delete(memory_key)
+            self._refresh_summaries(command.guild_id)
             
             logger.info(f"Successfully processed action for {character.name}")
             
@@ -120,7 +148,10 @@ class HandleActionUseCase:
                 episode=updated_episode,
                 message=f"Action processed for **{character.name}**"
             )
-            
+        
+        except AIServiceBusyError as e:
+            logger.info(f"Player action shed in guild {command.guild_id}: AI service busy")
+            return ActionResult(success=False, error=str(e), metadata={"busy": True})
         except Exception as e:
             logger.error(f"Error handling player action: {e}")
             return ActionResult.failure(f"Failed to process action: {str(e)}")
@@ -135,16 +166,19 @@ class HandleActionUseCase:
             if not episode:
                 return ActionResult.failure("No active episode. Start one with `/episode start`!")
             
-            # Get recent memories for context
-            recent_memories = []
-            if self.memory_service:
-                recent_memories = await self.memory_service.get_recent_context(command.guild_id, limit=5)
+            # Recent and scene-relevant memories for context
+            recent_memories, relevant_memories = await self._gather_memories(command.guild_id, command.scene_description)
+            summaries = await self._gather_summaries(episode)
             
             # Build AI context for DM narration
             context = AIContext(
                 episode=episode,
                 recent_memories=recent_memories,
-                action_text=command.scene_description
+                relevant_memories=relevant_memories,
+                summaries=summaries,
+                action_text=command.scene_description,
+                party=await self.character_service.get_guild_party(command.guild_id),
+                priority=AIPriority.HIGH
             )
             
             # Generate DM response
@@ -160,22 +194,13 @@ class HandleActionUseCase:
                 )
             
             # Update episode with DM action
-            episode.interactions.append(
-                episode.SessionInteraction(
-                    character_name="DM",
-                    player_action=command.scene_description,
-                    dm_response=ai_response.text,
-                    timestamp=episode.datetime.now().isoformat(),
-                    mode="dm_narration"
+            if episode.is_active():
+                await self.episode_service.add_dm_interaction(
+                    episode,
+                    command.scene_description,
+                    ai_response.text
                 )
-            )
-            
-            await self.episode_service.episode_repo.save_episode(episode)
-            
-            # Update cache
-            if self.cache_service:
-                episode_key = CacheKeys.episode_current(command.guild_id)
-                await self.cache_service.set(episode_key, episode)
+                self._refresh_summaries(command.guild_id)
             
             logger.info(f"Successfully processed DM action")
             
@@ -184,7 +209,10 @@ class HandleActionUseCase:
                 episode=episode,
                 message="DM narration added to episode"
             )
-            
+        
+        except AIServiceBusyError as e:
+            logger.info(f"DM action shed in guild {command.guild_id}: AI service busy")
+            return ActionResult(success=False, error=str(e), metadata={"busy": True})
         except Exception as e:
             logger.error(f"Error handling DM action: {e}")
             return ActionResult.failure(f"Failed to process DM action: {str(e)}")
@@ -249,13 +277,14 @@ class HandleActionUseCase:
             episode = await self.episode_service.get_current_episode(command.guild_id)
             if episode and episode.is_active():
                 # Add combat interaction to episode
-                await self.episode_service.add_player_interaction(
+                episode = await self.episode_service.add_player_interaction(
                     guild_id=command.guild_id,
                     character=character,
                     player_action=f"Combat: {command.action_type} {command.target or ''}",
                     dm_response=combat_result.narrative,
                     mode="combat"
                 )
+                self._refresh_summaries(command.guild_id)
             
             # Apply damage if any
             if combat_result.damage_dealt > 0:
@@ -276,7 +305,7 @@ class HandleActionUseCase:
                 narrative=combat_result.narrative,
                 message=f"Combat action resolved for **{character.name}**"
             )
-            
+        
         except Exception as e:
             logger.error(f"Error handling combat action: {e}")
             return CombatResult(success=False, error=f"Failed to process combat: {str(e)}")
@@ -308,12 +337,149 @@ class HandleActionUseCase:
                     "episode_context": episode.name if episode else "No active episode"
                 }
             )
-            
+        
         except Exception as e:
             logger.error(f"Error analyzing player intent: {e}")
             return ActionResult.failure(f"Failed to analyze intent: {str(e)}")
     
-    def _hash_action_context(self, action_text: str, character_name: str, episode_number: int) -> str:
-        """Create a hash for action context caching"""
-        context_string = f"{action_text.lower().strip()}_{character_name}_{episode_number}"
-        return hashlib.md5(context_string.encode()).hexdigest()[:16]
\ No newline at end of file
+    async def _stream_action_result(self,
+                                    context: AIContext,
+                                    action_type: str,
+                                    on_text: Callable[[str], Awaitable[None]]) -> AIResponse:
+        """Stream an action result, reporting accumulated text as it arrives"""
+        text = ""
+        async for delta in self.ai_service.stream_action_result(context, action_type):
+            text += delta
+            await on_text(text)
+        
+        return AIResponse(
+            text=text.strip(),
+            metadata={
+                "type": "combat_narration" if action_type.lower() == "combat" else "action_result",
+                "character": context.character.name if context.character else None,
+                "streamed": True
+            }
+        )
+    
+    def _batches_action(self, command: PlayerActionCommand) -> bool:
+        """Round mode covers regular actions; combat keeps its own narration"""
+        return bool(self.round_window_seconds) and command.action_type.lower() != "combat"
+    
+    async def _resolve_in_round(self, context: AIContext) -> Optional[AIResponse]:
+        """Join the open round for this guild and episode, or open one
+        
+        Returns this action's part of the round narration, or None if no
+        other action arrived in the window and it should be resolved alone.
+        """
+        key = (context.episode.guild_id, context.episode.episode_number)
+        pending = self._rounds.get(key)
+        
+        if pending is None or pending.full.is_set():
+            # The round narrates a shared scene, not one character's action
+            pending = _PendingRound(context=replace(context, character=None, action_text=None))
+            self._rounds[key] = pending
+            
+            # Kept referenced until done: the loop only holds tasks weakly
+            task = asyncio.create_task(self._run_round(key, pending))
+            self._round_tasks.add(task)
+            task.add_done_callback(self._round_tasks.discard)
+        
+        if context.priority == AIPriority.HIGH:
+            pending.context.priority = AIPriority.HIGH
+        
+        future = asyncio.get_running_loop().create_future()
+        pending.actions.append(RoundAction(character=context.character, action_text=context.action_text))
+        pending.futures.append(future)
+        
+        if len(pending.actions) >= self.round_max_actions:
+            pending.full.set()
+        
+        return await future
+    
+    async def _run_round(self, key: Tuple[str, int], pending: _PendingRound) -> None:
+        """Resolve a round, making sure no waiting action is left hanging if that fails"""
+        try:
+            await self._resolve_round(key, pending)
+        except asyncio.CancelledError:
+            self._abandon_round(key, pending, RuntimeError("Round was cancelled"))
+            raise
+        except Exception as e:
+            # Each waiting action gets the error and reports it like any failed AI call
+            self._abandon_round(key, pending, e)
+    
+    async def _resolve_round(self, key: Tuple[str, int], pending: _PendingRound) -> None:
+        """Wait out the round window, then resolve every collected action with one AI call"""
+        try:
+            await asyncio.wait_for(pending.full.wait(), timeout=self.round_window_seconds)
+        except asyncio.TimeoutError:
+            pass
+        
+        # Actions arriving from now on open the next round
+        if self._rounds.get(key) is pending:
+            del self._rounds[key]
+        
+        if len(pending.actions) == 1:
+            self._settle_round(pending, [None])
+            return
+        
+        logger.info(f"Resolving a round of {len(pending.actions)} actions in guild {key[0]}")
+        
+        responses = await self.ai_service.generate_round_results(pending.context, pending.actions)
+        self._settle_round(pending, responses)
+    
+    def _abandon_round(self, key: Tuple[str, int], pending: _PendingRound, error: Exception) -> None:
+        """Close a round that could not be resolved, failing every action still waiting on it"""
+        if self._rounds.get(key) is pending:
+            del self._rounds[key]
+        
+        for future in pending.futures:
+            if not future.done():
+                future.set_exception(error)
+    
+    @staticmethod
+    def _settle_round(pending: _PendingRound, responses: List[Optional[AIResponse]]) -> None:
+        """Hand each waiting action its response (skipping callers that gave up)
+        
+        Actions the AI left without a part of the narration are resolved alone.
+        """
+        responses = list(responses) + [None] * (len(pending.futures) - len(responses))
+        for future, response in zip(pending.futures, responses):
+            if not future.done():
+                future.set_result(response)
+    
+    async def _gather_memories(self, guild_id: str, text: str) -> Tuple[List[Memory], List[Memory]]:
+        """Recent memories plus full-text matches for an action"""
+        if not self.memory_service:
+            return [], []
+        
+        recent = await self.memory_service.get_recent_context(guild_id, limit=self.context_memory_limit)
+        
+        try:
+            relevant = await self.memory_service.find_relevant_memories(guild_id, text, limit=self.relevant_memory_limit)
+        except Exception as e:
+            # Relevance only improves the prompt; never fail the action over it
+            logger.warning(f"Memory search failed in guild {guild_id}: {e}")
+            relevant = []
+        
+        return recent, relevant
+    
+    async def _gather_summaries(self, episode: Episode) -> List[Memory]:
+        """Rolling summaries of everything before the recent interactions"""
+        if not self.summary_service:
+            return []
+        
+        try:
+            return await self.summary_service.get_context_summaries(episode.guild_id, episode)
+        except Exception as e:
+            logger.warning(f"Loading rolling summaries failed in guild {episode.guild_id}: {e}")
+            return []
+    
+    def _refresh_summaries(self, guild_id: str) -> None:
+        """Compact the guild's history in the background once enough has happened"""
+        if self.summary_service:
+            self.summary_service.request_refresh(guild_id)
+    
+    @staticmethod
+    def _action_priority(action_type: str) -> AIPriority:
+        """Explicit commands outrank actions picked up from RP channel chatter"""
+        return AIPriority.NORMAL if action_type.lower() == "natural" else AIPriority.HIGH
@@ -6,7 +6,6 @@ from typing import Optional
 
 from ...domain.services import CharacterService
 from ...domain.interfaces.cache_service import CacheServiceInterface
-from ...infrastructure.cache.memory_cache import CacheKeys
 from ..dto import (
     CreateCharacterCommand, GenerateCharacterCommand, UpdateCharacterCommand,
     LevelUpCommand, HealCommand, DamageCommand, GetContextCommand,
@@ -54,11 +53,6 @@ class ManageCharacterUseCase:
                 ability_scores=command.ability_scores
             )
             
-            # Cache the character
-            if self.cache_service:
-                cache_key = CacheKeys.character(command.discord_user_id, command.guild_id)
-                await self.cache_service.set(cache_key, character)
-            
             logger.info(f"Successfully created character {character.name}")
             
             return CharacterResult.success_with_character(
@@ -98,11 +92,6 @@ class ManageCharacterUseCase:
                 guild_id=command.guild_id
             )
             
-            # Cache the character
-            if self.cache_service:
-                cache_key = CacheKeys.character(command.discord_user_id, command.guild_id)
-                await self.cache_service.set(cache_key, character)
-            
             logger.info(f"Successfully generated character {character.name}")
             
             return CharacterResult.success_with_character(
@@ -122,27 +111,12 @@ class ManageCharacterUseCase:
     async def get_character(self, discord_user_id: str, guild_id: str) -> CharacterResult:
         """Get a character"""
         try:
-            # Check cache first
-            if self.cache_service:
-                cache_key = CacheKeys.character(discord_user_id, guild_id)
-                cached_character = await self.cache_service.get(cache_key)
-                if cached_character:
-                    return CharacterResult.success_with_character(
-                        character=cached_character,
-                        message="Character retrieved from cache"
-                    )
-            
-            # Get from repository
+            # Get from repository (cached by the repository layer)
             character = await self.character_service.get_character(discord_user_id, guild_id)
             
             if not character:
                 return CharacterResult.failure("No character found. Create one with `/character create`!")
             
-            # Cache for next time
-            if self.cache_service:
-                cache_key = CacheKeys.character(discord_user_id, guild_id)
-                await self.cache_service.set(cache_key, character)
-            
             return CharacterResult.success_with_character(
                 character=character,
                 message=f"Found {character.name}"
@@ -163,11 +137,6 @@ class ManageCharacterUseCase:
                 command.new_level
             )
             
-            # Update cache
-            if self.cache_service:
-                cache_key = CacheKeys.character(command.discord_user_id, command.guild_id)
-                await self.cache_service.set(cache_key, character)
-            
             logger.info(f"Successfully leveled up {character.name} to level {character.level}")
             
             return CharacterResult.success_with_character(
@@ -194,11 +163,6 @@ class ManageCharacterUseCase:
                 command.amount
             )
             
-            # Update cache
-            if self.cache_service:
-                cache_key = CacheKeys.character(command.discord_user_id, command.guild_id)
-                await self.cache_service.set(cache_key, character)
-            
             if actual_healing > 0:
                 message = f"💚 **{character.name}** healed for {actual_healing} HP!\n" \
                          f"Current HP: {character.current_hp}/{character.max_hp} ({character.get_health_status()})"
@@ -228,11 +192,6 @@ class ManageCharacterUseCase:
                 command.amount
             )
             
-            # Update cache
-            if self.cache_service:
-                cache_key = CacheKeys.character(command.discord_user_id, command.guild_id)
-                await self.cache_service.set(cache_key, character)
-            
             if is_alive:
                 message = f"💔 **{character.name}** took {command.amount} {command.damage_type} damage!\n" \
                          f"Current HP: {character.current_hp}/{character.max_hp} ({character.get_health_status()})"
@@ -257,22 +216,7 @@ class ManageCharacterUseCase:
         try:
             logger.info(f"Getting party for guild {guild_id}")
             
-            # Check cache first
-            if self.cache_service:
-                cache_key = CacheKeys.party(guild_id)
-                cached_party = await self.cache_service.get(cache_key)
-                if cached_party:
-                    party_level = self.character_service.calculate_party_level(cached_party)
-                    health_summary = self.character_service.get_party_health_summary(cached_party)
-                    
-                    return PartyResult.success_with_party(
-                        party=cached_party,
-                        level=party_level,
-                        health_summary=health_summary,
-                        message="Party retrieved from cache"
-                    )
-            
-            # Get from repository
+            # Get from repository (cached by the repository layer)
             party = await self.character_service.get_guild_party(guild_id)
             
             if not party:
@@ -287,11 +231,6 @@ class ManageCharacterUseCase:
             party_level = self.character_service.calculate_party_level(party)
             health_summary = self.character_service.get_party_health_summary(party)
             
-            # Cache for next time
-            if self.cache_service:
-                cache_key = CacheKeys.party(guild_id)
-                await self.cache_service.set(cache_key, party)
-            
             logger.info(f"Found {len(party)} party members")
             
             return PartyResult.success_with_party(
@@ -321,15 +260,6 @@ class ManageCharacterUseCase:
             if not deleted:
                 return CharacterResult.failure("Failed to delete character.")
             
-            # Remove from cache
-            if self.cache_service:
-                cache_key = CacheKeys.character(discord_user_id, guild_id)
-                await self.cache_service.delete(cache_key)
-                
-                # Also invalidate party cache
-                party_key = CacheKeys.party(guild_id)
-                await self.cache_service.delete(party_key)
-            
             logger.info(f"Successfully deleted character {character.name}")
             
             return CharacterResult(
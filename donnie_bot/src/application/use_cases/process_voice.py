@@ -1,8 +1,10 @@
 """
 Voice processing use cases
 """
+import asyncio
 import logging
-from typing import Optional
+import re
+from typing import List, Optional, Tuple
 
 from ...domain.interfaces.voice_service import VoiceServiceInterface, VoiceConfig
 from ...domain.interfaces.cache_service import CacheServiceInterface
@@ -10,15 +12,198 @@ from ..dto import VoiceCommand, VoiceResult
 
 logger = logging.getLogger(__name__)
 
+# Terminal punctuation (with closing quotes/brackets/markdown) followed by
+# whitespace, or a blank line. Requiring the whitespace means "3.5" or a
+# sentence still being streamed is never cut early.
+SENTENCE_END = re.compile(r"[.!?…]+[\"'”’)\]*_]*(?=\s)|\n\s*\n")
+
+# Words whose trailing period does not end a sentence
+ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "mt", "vs", "etc", "lt", "capt", "sgt", "e.g", "i.e"}
+
+
+def take_sentences(text: str, start: int, max_chars: int, final: bool = False) -> Tuple[List[str], int]:
+    """Split the complete sentences after `start` off `text`
+    
+    Returns the speakable chunks and the offset the next call continues
+    from. Sentences over `max_chars` are cut at a comma or space; with
+    `final` the unfinished tail is flushed too.
+    """
+    chunks: List[str] = []
+    position = start
+    
+    for match in SENTENCE_END.finditer(text, start):
+        words = text[position:match.start()].split()
+        if words and words[-1].lower().strip("\"'“‘(*_") in ABBREVIATIONS:
+            continue
+        position = _split_long(text, position, match.end(), max_chars, chunks)
+    
+    if final:
+        position = _split_long(text, position, len(text), max_chars, chunks)
+    elif len(text) - position > max_chars:
+        # A runaway sentence: speak what is there rather than wait for its end
+        cut = _cut_point(text, position, max_chars)
+        chunks.append(text[position:cut].strip())
+        position = cut
+    
+    return [chunk for chunk in chunks if any(char.isalnum() for char in chunk)], position
+
+
+def _split_long(text: str, start: int, end: int, max_chars: int, chunks: List[str]) -> int:
+    """Append text[start:end] to chunks in pieces of at most max_chars. Returns end."""
+    while end - start > max_chars:
+        cut = _cut_point(text, start, max_chars)
+        chunks.append(text[start:cut].strip())
+        start = cut
+    
+    chunks.append(text[start:end].strip())
+    return end
+
+
+def _cut_point(text: str, start: int, max_chars: int) -> int:
+    """Where to break a long stretch of text: after a clause, else between words"""
+    window = text[start:start + max_chars]
+    for separator in ("; ", ", ", " "):
+        index = window.rfind(separator)
+        if index > max_chars // 3:
+            return start + index + len(separator)
+    return start + max_chars
+
+
+class SpeechStream:
+    """Narration spoken sentence by sentence while it is still being written
+    
+    `feed` takes the text so far (as streamed) and queues every sentence it
+    completes for synthesis. Synthesis runs ahead of playback by at most
+    `lookahead` clips, so the next sentence is usually ready the moment the
+    current one ends, and the first is heard long before the narration is
+    finished.
+    """
+    
+    def __init__(self,
+                 voice_service: VoiceServiceInterface,
+                 guild_id: str,
+                 config: VoiceConfig,
+                 priority: bool = False,
+                 lookahead: int = 2,
+                 max_chunk_chars: int = 300):
+        self.voice_service = voice_service
+        self.guild_id = guild_id
+        self.config = config
+        self.priority = priority
+        self.max_chunk_chars = max_chunk_chars
+        
+        self._text = ""
+        self._offset = 0
+        self._closed = False
+        self._started_at = asyncio.get_running_loop().time()
+        self._sentences: asyncio.Queue = asyncio.Queue()
+        self._clips: asyncio.Queue = asyncio.Queue(maxsize=max(1, lookahead))
+        self._stats = {"chunks": 0, "played": 0, "failed": 0, "first_audio_seconds": None}
+        
+        self._synthesizer = asyncio.create_task(self._synthesize_loop())
+        self._player = asyncio.create_task(self._play_loop())
+    
+    async def feed(self, text: str) -> None:
+        """Take the narration so far and queue any newly completed sentences"""
+        if self._closed:
+            return
+        
+        self._text = text
+        chunks, self._offset = take_sentences(text, self._offset, self.max_chunk_chars)
+        self._queue(chunks)
+    
+    async def finish(self, text: Optional[str] = None) -> VoiceResult:
+        """Flush the last sentence and wait until everything has been spoken
+        
+        `text` is only used when nothing was fed (the narration was not streamed).
+        """
+        if not self._closed:
+            self._closed = True
+            if text and not self._text:
+                self._text = text
+            
+            chunks, self._offset = take_sentences(self._text, self._offset, self.max_chunk_chars, final=True)
+            self._queue(chunks)
+            self._sentences.put_nowait(None)
+        
+        try:
+            await self._player
+        except asyncio.CancelledError:
+            await self.cancel()
+            raise
+        
+        if not self._stats["played"]:
+            return VoiceResult.failure("Failed to play audio in voice channel")
+        
+        spoken = self._text.strip()
+        return VoiceResult(
+            success=True,
+            message=f"🗣️ Spoke: {spoken[:100]}{'...' if len(spoken) > 100 else ''}",
+            metadata=self.get_stats()
+        )
+    
+    async def cancel(self) -> None:
+        """Stop speaking: drop queued sentences and cut off the one playing"""
+        self._closed = True
+        for task in (self._synthesizer, self._player):
+            task.cancel()
+        await asyncio.gather(self._synthesizer, self._player, return_exceptions=True)
+    
+    def get_stats(self) -> dict:
+        """Get chunk counts and time to first audio"""
+        return dict(self._stats)
+    
+    def _queue(self, chunks: List[str]) -> None:
+        """Hand sentences to the synthesizer"""
+        for chunk in chunks:
+            self._sentences.put_nowait(chunk)
+        self._stats["chunks"] += len(chunks)
+    
+    async def _synthesize_loop(self) -> None:
+        """Synthesize sentences in order, blocking once `lookahead` clips are waiting"""
+        while (sentence := await self._sentences.get()) is not None:
+            try:
+                audio = await self.voice_service.text_to_speech(text=sentence, config=self.config)
+            except Exception as e:
+                # Skip the sentence rather than silence the rest of the narration
+                self._stats["failed"] += 1
+                logger.warning(f"⚠️ TTS failed for a narration chunk in guild {self.guild_id}: {e}")
+                continue
+            
+            await self._clips.put(audio)
+        
+        await self._clips.put(None)
+    
+    async def _play_loop(self) -> None:
+        """Play clips in order as they become ready"""
+        try:
+            while (audio := await self._clips.get()) is not None:
+                if self._stats["first_audio_seconds"] is None:
+                    elapsed = asyncio.get_running_loop().time() - self._started_at
+                    self._stats["first_audio_seconds"] = round(elapsed, 3)
+                
+                if not await self.voice_service.play_audio(self.guild_id, audio, priority=self.priority):
+                    # Disconnected: nothing more can be heard
+                    return
+                
+                self._stats["played"] += 1
+        finally:
+            # However playback ends, the synthesizer must not stay blocked on a full clip queue
+            self._synthesizer.cancel()
+
 
 class ProcessVoiceUseCase:
     """Use case for voice-related operations"""
     
     def __init__(self,
                  voice_service: VoiceServiceInterface,
-                 cache_service: Optional[CacheServiceInterface] = None):
+                 cache_service: Optional[CacheServiceInterface] = None,
+                 lookahead: int = 2,
+                 max_chunk_chars: int = 300):
         self.voice_service = voice_service
         self.cache_service = cache_service
+        self.lookahead = lookahead
+        self.max_chunk_chars = max_chunk_chars
     
     async def join_voice_channel(self, command: VoiceCommand) -> VoiceResult:
         """Join a voice channel"""
@@ -50,7 +235,7 @@ class ProcessVoiceUseCase:
                 )
             else:
                 return VoiceResult.failure("Failed to join voice channel")
-            
+        
         except Exception as e:
             logger.error(f"Error joining voice channel: {e}")
             return VoiceResult.failure(f"Failed to join voice: {str(e)}")
@@ -76,7 +261,7 @@ class ProcessVoiceUseCase:
                 is_connected=False,
                 message="🔇 Left voice channel"
             )
-            
+        
         except Exception as e:
             logger.error(f"Error leaving voice channel: {e}")
             return VoiceResult.failure(f"Failed to leave voice: {str(e)}")
@@ -94,59 +279,79 @@ class ProcessVoiceUseCase:
             if not is_connected:
                 return VoiceResult.failure("Not connected to a voice channel. Join one first!")
             
-            # Limit text length for TTS
-            max_length = 500
-            text_to_speak = command.text_to_speak
-            if len(text_to_speak) > max_length:
-                text_to_speak = text_to_speak[:max_length] + "..."
-                logger.warning(f"Truncated TTS text to {max_length} characters")
-            
-            # Use provided voice config or default
-            voice_config = command.voice_config or VoiceConfig()
-            
-            # Generate TTS audio
-            audio_data = await self.voice_service.text_to_speech(
-                text=text_to_speak,
-                config=voice_config
-            )
-            
-            # Play audio in voice channel
-            success = await self.voice_service.play_audio(command.guild_id, audio_data)
-            
-            if success:
-                logger.info(f"Successfully played TTS audio")
-                return VoiceResult.success_with_audio(
-                    audio_data=audio_data,
-                    message=f"🗣️ Spoke: {text_to_speak[:100]}{'...' if len(text_to_speak) > 100 else ''}"
-                )
-            else:
-                return VoiceResult.failure("Failed to play audio in voice channel")
-            
+            # Spoken sentence by sentence, so long narration is never cut short
+            return await self._open_stream(command).finish(command.text_to_speak)
+        
         except Exception as e:
             logger.error(f"Error speaking text: {e}")
             return VoiceResult.failure(f"Failed to speak: {str(e)}")
     
+    async def open_speech_stream(self, command: VoiceCommand) -> Optional[SpeechStream]:
+        """Start speaking narration that is still being written, or None if not in voice"""
+        if not await self.voice_service.is_connected(command.guild_id):
+            return None
+        return self._open_stream(command)
+    
+    def _open_stream(self, command: VoiceCommand) -> SpeechStream:
+        """Speech stream for a command, with the provided voice config or the default"""
+        return SpeechStream(
+            self.voice_service,
+            command.guild_id,
+            command.voice_config or VoiceConfig(),
+            priority=command.priority,
+            lookahead=self.lookahead,
+            max_chunk_chars=self.max_chunk_chars
+        )
+    
     async def get_voice_status(self, guild_id: str) -> VoiceResult:
         """Get current voice connection status"""
         try:
             logger.info(f"Getting voice status for guild {guild_id}")
             
             is_connected = await self.voice_service.is_connected(guild_id)
+            queue_depth = await self.voice_service.get_queue_depth(guild_id)
             
             if is_connected:
-                message = "🔊 Connected to voice channel"
+                message = f"🔊 Connected to voice channel ({queue_depth} clip{'s' if queue_depth != 1 else ''} queued)"
             else:
                 message = "🔇 Not connected to voice channel"
             
-            return VoiceResult.connection_success(
+            result = VoiceResult.connection_success(
                 is_connected=is_connected,
                 message=message
             )
-            
+            result.metadata["queue_depth"] = queue_depth
+            return result
+        
         except Exception as e:
             logger.error(f"Error getting voice status: {e}")
             return VoiceResult.failure(f"Failed to get voice status: {str(e)}")
     
+    async def skip_audio(self, guild_id: str) -> VoiceResult:
+        """Skip the clip that is playing"""
+        try:
+            if await self.voice_service.skip_audio(guild_id):
+                return VoiceResult(success=True, message="⏭️ Skipped")
+            return VoiceResult.failure("Nothing is playing")
+        
+        except Exception as e:
+            logger.error(f"Error skipping audio: {e}")
+            return VoiceResult.failure(f"Failed to skip audio: {str(e)}")
+    
+    async def stop_audio(self, guild_id: str) -> VoiceResult:
+        """Stop the clip that is playing and drop everything queued"""
+        try:
+            dropped = await self.voice_service.clear_audio_queue(guild_id, stop_current=True)
+            return VoiceResult(
+                success=True,
+                message=f"⏹️ Stopped playback ({dropped} queued clip{'s' if dropped != 1 else ''} dropped)",
+                metadata={"dropped": dropped}
+            )
+        
+        except Exception as e:
+            logger.error(f"Error stopping audio: {e}")
+            return VoiceResult.failure(f"Failed to stop audio: {str(e)}")
+    
     async def list_available_voices(self) -> VoiceResult:
         """Get list of available TTS voices"""
         try:
@@ -161,7 +366,7 @@ class ProcessVoiceUseCase:
                 message=voices_text,
                 metadata={"voices": voices}
             )
-            
+        
         except Exception as e:
             logger.error(f"Error getting available voices: {e}")
             return VoiceResult.failure(f"Failed to get voices: {str(e)}")
@@ -188,7 +393,7 @@ class ProcessVoiceUseCase:
                 message=settings_text,
                 metadata={"voice_config": command.voice_config.__dict__}
             )
-            
+        
         except Exception as e:
             logger.error(f"Error changing voice settings: {e}")
             return VoiceResult.failure(f"Failed to change settings: {str(e)}")
\ No newline at end of file
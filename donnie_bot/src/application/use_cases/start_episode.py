@@ -6,7 +6,6 @@ from typing import Optional
 
 from ...domain.services import EpisodeService, CharacterService, MemoryService
 from ...domain.interfaces.cache_service import CacheServiceInterface
-from ...infrastructure.cache.memory_cache import CacheKeys
 from ..dto import (
     StartEpisodeCommand, EndEpisodeCommand, GetContextCommand,
     EpisodeResult, ContextResult
@@ -69,11 +68,6 @@ class StartEpisodeUseCase:
             # Save episode with snapshots
             await self.episode_service.episode_repo.save_episode(started_episode)
             
-            # Update cache
-            if self.cache_service:
-                episode_key = CacheKeys.episode_current(command.guild_id)
-                await self.cache_service.set(episode_key, started_episode)
-            
             # Create opening memory if we have memory service
             if self.memory_service and command.opening_scene:
                 await self.memory_service.save_event_memory(
@@ -116,11 +110,6 @@ class StartEpisodeUseCase:
                 episode.status = episode.status.ACTIVE
                 episode.start_time = episode.start_time or episode.created_at
                 await self.episode_service.episode_repo.save_episode(episode)
-                
-                # Update cache
-                if self.cache_service:
-                    episode_key = CacheKeys.episode_current(guild_id)
-                    await self.cache_service.set(episode_key, episode)
             
             # Get current context
             context = await self.episode_service.get_episode_context(guild_id)
@@ -152,15 +141,6 @@ class StartEpisodeUseCase:
                 command.closing_scene
             )
             
-            # Update cache
-            if self.cache_service:
-                episode_key = CacheKeys.episode_current(command.guild_id)
-                await self.cache_service.set(episode_key, episode)
-                
-                # Also clear history cache to force refresh
-                history_key = CacheKeys.episode_history(command.guild_id)
-                await self.cache_service.delete(history_key)
-            
             # Get episode stats
             stats = self.episode_service.get_episode_stats(episode)
             
@@ -202,18 +182,19 @@ class StartEpisodeUseCase:
             
             # Get the episode for additional context
             if episode_number:
-                history = await self.episode_service.get_episode_history(guild_id, limit=50)
-                episode = next((ep for ep in history if ep.episode_number == episode_number), None)
+                episode = await self.episode_service.get_episode(guild_id, episode_number)
             else:
                 episode = await self.episode_service.get_current_episode(guild_id)
             
             if not episode:
                 return EpisodeResult.failure("Episode not found.")
             
-            return EpisodeResult.success_with_episode(
+            result = EpisodeResult.success_with_episode(
                 episode=episode,
                 message=f"📚 **Episode Summary**\n\n{summary}"
             )
+            result.metadata["summary"] = summary
+            return result
             
         except Exception as e:
             logger.error(f"Error getting episode summary: {e}")
@@ -224,19 +205,7 @@ class StartEpisodeUseCase:
         try:
             logger.info(f"Getting episode history for guild {guild_id}")
             
-            # Check cache first
-            if self.cache_service:
-                history_key = CacheKeys.episode_history(guild_id)
-                cached_history = await self.cache_service.get(history_key)
-                if cached_history:
-                    limited_history = cached_history[:limit]
-                    return EpisodeResult(
-                        success=True,
-                        message="Episode history retrieved from cache",
-                        metadata={"episodes": [ep.to_dict() for ep in limited_history]}
-                    )
-            
-            # Get from repository
+            # Get from repository (cached by the repository layer)
             episodes = await self.episode_service.get_episode_history(guild_id, limit)
             
             if not episodes:
@@ -246,11 +215,6 @@ class StartEpisodeUseCase:
                     metadata={"episodes": []}
                 )
             
-            # Cache for next time
-            if self.cache_service:
-                history_key = CacheKeys.episode_history(guild_id)
-                await self.cache_service.set(history_key, episodes)
-            
             # Format history message
             message = f"📚 **Episode History** ({len(episodes)} episodes)\n\n"
             
@@ -80,6 +80,7 @@ class Character:
     personality_traits: List[str] = field(default_factory=list)
     
     # Metadata
+    guild_id: str = ""
     created_at: Optional[str] = None
     last_updated: Optional[str] = None
     
@@ -223,6 +224,7 @@ class Character:
             "spells": self.spells,
             "affiliations": self.affiliations,
             "personality_traits": self.personality_traits,
+            "guild_id": self.guild_id,
             "created_at": self.created_at,
             "last_updated": self.last_updated,
         }
@@ -247,6 +249,7 @@ class Character:
             spells=data.get("spells", []),
             affiliations=data.get("affiliations", []),
             personality_traits=data.get("personality_traits", []),
+            guild_id=data.get("guild_id", ""),
             created_at=data.get("created_at"),
             last_updated=data.get("last_updated"),
         )
\ No newline at end of file
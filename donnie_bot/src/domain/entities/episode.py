@@ -20,6 +20,7 @@ class SessionInteraction:
     dm_response: str
     timestamp: str
     mode: str = "standard"  # How the response was generated
+    seq: Optional[int] = None  # Position within the episode, assigned on persist
     
     def to_dict(self) -> Dict:
         return {
@@ -28,6 +29,7 @@ class SessionInteraction:
             "dm_response": self.dm_response,
             "timestamp": self.timestamp,
             "mode": self.mode,
+            "seq": self.seq,
         }
     
     @classmethod
@@ -54,8 +56,12 @@ class Episode:
     summary: str = ""
     
     # Session Data
+    # Interactions are loaded lazily: `interactions` holds the most recent page,
+    # while the counters below describe the whole episode.
     interactions: List[SessionInteraction] = field(default_factory=list)
     character_snapshots: Dict[str, Dict] = field(default_factory=dict)  # user_id -> snapshot
+    interaction_count: int = 0
+    participant_names: List[str] = field(default_factory=list)
     
     # Metadata
     created_at: Optional[datetime] = None
@@ -71,6 +77,14 @@ class Episode:
         
         if not self.guild_id.strip():
             raise ValueError("Guild ID cannot be empty")
+        
+        # Fully loaded episodes don't need to carry counters
+        if self.interaction_count < len(self.interactions):
+            self.interaction_count = len(self.interactions)
+        
+        for interaction in self.interactions:
+            if interaction.character_name not in self.participant_names:
+                self.participant_names.append(interaction.character_name)
     
     def start_episode(self, opening_scene: str = None) -> bool:
         """Start the episode"""
@@ -101,7 +115,7 @@ class Episode:
         return True
     
     def add_interaction(self, character_name: str, player_action: str, 
-                       dm_response: str, mode: str = "standard") -> None:
+                       dm_response: str, mode: str = "standard") -> SessionInteraction:
         """Add a player interaction to the session"""
         if self.status != EpisodeStatus.ACTIVE:
             raise ValueError("Cannot add interactions to inactive episode")
@@ -115,7 +129,20 @@ class Episode:
         )
         
         self.interactions.append(interaction)
+        self.interaction_count += 1
+        if character_name not in self.participant_names:
+            self.participant_names.append(character_name)
         self.updated_at = datetime.now()
+        
+        return interaction
+    
+    def prepend_interactions(self, older: List[SessionInteraction]) -> None:
+        """Add an older page of interactions in front of the loaded ones"""
+        self.interactions = list(older) + self.interactions
+    
+    def has_unloaded_interactions(self) -> bool:
+        """Check if older interactions exist that are not loaded"""
+        return len(self.interactions) < self.interaction_count
     
     def add_character_snapshot(self, user_id: str, character_data: Dict) -> None:
         """Take a snapshot of character state"""
@@ -136,11 +163,11 @@ class Episode:
     
     def get_interaction_count(self) -> int:
         """Get total number of interactions"""
-        return len(self.interactions)
+        return max(self.interaction_count, len(self.interactions))
     
     def get_character_count(self) -> int:
         """Get number of unique characters"""
-        return len(set(interaction.character_name for interaction in self.interactions))
+        return len(set(self.participant_names))
     
     def get_recent_interactions(self, count: int = 5) -> List[SessionInteraction]:
         """Get the most recent interactions"""
@@ -168,6 +195,8 @@ class Episode:
             "summary": self.summary,
             "interactions": [interaction.to_dict() for interaction in self.interactions],
             "character_snapshots": self.character_snapshots,
+            "interaction_count": self.get_interaction_count(),
+            "participant_names": list(self.participant_names),
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
@@ -192,6 +221,8 @@ class Episode:
             summary=data.get("summary", ""),
             interactions=interactions,
             character_snapshots=data.get("character_snapshots", {}),
+            interaction_count=data.get("interaction_count", 0),
+            participant_names=list(data.get("participant_names", [])),
             created_at=datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None,
             updated_at=datetime.fromisoformat(data["updated_at"]) if data.get("updated_at") else None,
         )
\ No newline at end of file
@@ -1,12 +1,24 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 from dataclasses import dataclass
+from enum import Enum
 
 from ..entities.character import Character
 from ..entities.episode import Episode
 from ..entities.memory import Memory
 
 
+class AIPriority(Enum):
+    """Scheduling lane for an AI request."""
+    HIGH = "high"        # Explicit commands: /dm narration, /action
+    NORMAL = "normal"    # Natural-language actions in RP channels
+    LOW = "low"          # Summaries and intent analysis
+
+
+class AIServiceBusyError(Exception):
+    """Raised when an AI request is shed because the service is overloaded."""
+
+
 @dataclass
 class AIResponse:
     """Response from AI service."""
@@ -26,10 +38,27 @@ class AIContext:
     character: Optional[Character] = None
     recent_memories: List[Memory] = None
     action_text: Optional[str] = None
+    party: List[Character] = None
+    priority: AIPriority = AIPriority.NORMAL
+    relevant_memories: List[Memory] = None  # Full-text matches for the action, best first
+    summaries: List[Memory] = None  # Rolling campaign summaries, broadest and oldest first
     
     def __post_init__(self):
         if self.recent_memories is None:
             self.recent_memories = []
+        if self.relevant_memories is None:
+            self.relevant_memories = []
+        if self.summaries is None:
+            self.summaries = []
+        if self.party is None:
+            self.party = []
+
+
+@dataclass
+class RoundAction:
+    """One player's action within a round resolved by a single AI call."""
+    character: Character
+    action_text: str
 
 
 class AIServiceInterface(ABC):
@@ -50,6 +79,16 @@ class AIServiceInterface(ABC):
         """Generate combat narration and results."""
         pass
     
+    @abstractmethod
+    async def generate_round_results(self, context: AIContext, actions: List[RoundAction]) -> List[AIResponse]:
+        """Narrate several simultaneous actions together, returning one response per action."""
+        pass
+    
+    @abstractmethod
+    def stream_action_result(self, context: AIContext, action_type: str = "general") -> AsyncIterator[str]:
+        """Stream an action result (or combat narration) as text deltas."""
+        pass
+    
     @abstractmethod
     async def generate_character_sheet(self, character_description: str) -> Character:
         """Generate a character sheet from a description."""
@@ -60,6 +99,15 @@ class AIServiceInterface(ABC):
         """Create a summary of an episode."""
         pass
     
+    @abstractmethod
+    async def condense_summary(self,
+                               guild_id: str,
+                               level: str,
+                               passages: List[str],
+                               previous: Optional[str] = None) -> str:
+        """Condense passages (and an earlier summary they continue) into one summary. Raises on failure."""
+        pass
+    
     @abstractmethod
     async def analyze_player_intent(self, action_text: str) -> Dict[str, Any]:
         """Analyze what the player is trying to do."""
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Optional
 from datetime import timedelta
 
 
@@ -21,6 +21,11 @@ class CacheServiceInterface(ABC):
         """Delete a key from cache. Returns True if existed."""
         pass
     
+    @abstractmethod
+    async def delete_prefix(self, prefix: str) -> int:
+        """Delete all keys starting with prefix. Returns count deleted."""
+        pass
+    
     @abstractmethod
     async def clear(self) -> None:
         """Clear all cache entries."""
@@ -29,4 +34,15 @@ class CacheServiceInterface(ABC):
     @abstractmethod
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache."""
+        pass
+    
+    @abstractmethod
+    async def get_or_load(self,
+                          key: str,
+                          loader: Callable[[], Awaitable[Any]],
+                          ttl: Optional[timedelta] = None) -> Optional[Any]:
+        """Get a value, loading and caching it on a miss.
+        
+        Concurrent misses on the same key share a single in-flight load.
+        """
         pass
\ No newline at end of file
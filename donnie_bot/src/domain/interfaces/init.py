@@ -5,12 +5,16 @@ from .repositories import (
     EpisodeRepositoryInterface,
     GuildRepositoryInterface,
     MemoryRepositoryInterface,
+    SummaryJobRepositoryInterface,
 )
 
 from .ai_service import (
     AIServiceInterface,
     AIResponse,
     AIContext,
+    AIPriority,
+    AIServiceBusyError,
+    RoundAction,
 )
 
 from .voice_service import (
@@ -27,11 +31,15 @@ __all__ = [
     "EpisodeRepositoryInterface", 
     "GuildRepositoryInterface",
     "MemoryRepositoryInterface",
+    "SummaryJobRepositoryInterface",
     
     # AI service interfaces
     "AIServiceInterface",
     "AIResponse",
     "AIContext",
+    "AIPriority",
+    "AIServiceBusyError",
+    "RoundAction",
     
     # Voice service interfaces
     "VoiceServiceInterface",
@@ -3,7 +3,7 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 
 from ..entities.character import Character
-from ..entities.episode import Episode
+from ..entities.episode import Episode, SessionInteraction
 from ..entities.guild import Guild
 from ..entities.memory import Memory
 
@@ -50,6 +50,30 @@ class EpisodeRepositoryInterface(ABC):
         """Get recent episode history for a guild."""
         pass
     
+    @abstractmethod
+    async def append_interaction(self, episode: Episode, interaction: SessionInteraction) -> None:
+        """Append a single interaction to an episode. Assigns interaction.seq."""
+        pass
+    
+    @abstractmethod
+    async def get_interactions(self,
+                               guild_id: str,
+                               episode_number: int,
+                               before_seq: Optional[int] = None,
+                               limit: int = 20) -> List[SessionInteraction]:
+        """Get a page of interactions in chronological order, ending before before_seq."""
+        pass
+    
+    @abstractmethod
+    async def get_episode(self, guild_id: str, episode_number: int) -> Optional[Episode]:
+        """Get one episode by number (interaction counters only)."""
+        pass
+    
+    @abstractmethod
+    async def update_summary(self, guild_id: str, episode_number: int, summary: str) -> None:
+        """Store an episode's summary."""
+        pass
+    
     @abstractmethod
     async def end_episode(self, episode_id: str) -> None:
         """Mark an episode as ended."""
@@ -88,7 +112,58 @@ class MemoryRepositoryInterface(ABC):
         """Search memories by content."""
         pass
     
+    @abstractmethod
+    async def recall_memories(self, guild_id: str, text: str, limit: int = 10) -> List[Memory]:
+        """Find memories related to free text (keyword and semantic match), best first."""
+        pass
+    
+    @abstractmethod
+    async def get_by_episode(self,
+                             guild_id: str,
+                             episode_number: int,
+                             limit: Optional[int] = None) -> List[Memory]:
+        """Get memories from one episode, oldest first."""
+        pass
+    
+    @abstractmethod
+    async def get_by_character(self, guild_id: str, character_name: str, limit: int = 50) -> List[Memory]:
+        """Get memories by or mentioning a character, newest first."""
+        pass
+    
+    @abstractmethod
+    async def get_since(self, guild_id: str, since: datetime, limit: Optional[int] = None) -> List[Memory]:
+        """Get memories at or after a timestamp, oldest first; with a limit, the newest `limit` of them."""
+        pass
+    
+    @abstractmethod
+    async def get_by_type(self, guild_id: str, memory_type: str, limit: int = 50) -> List[Memory]:
+        """Get memories of one type, newest first."""
+        pass
+    
+    @abstractmethod
+    async def get_summaries(self,
+                            guild_id: str,
+                            level: str,
+                            episode_number: Optional[int] = None,
+                            limit: int = 50) -> List[Memory]:
+        """Get rolling summaries of one level (scene, episode, arc), newest first."""
+        pass
+    
     @abstractmethod
     async def clear_old_memories(self, guild_id: str, older_than: datetime) -> int:
         """Clear memories older than specified date. Returns count deleted."""
-        pass
\ No newline at end of file
+        pass
+
+
+class SummaryJobRepositoryInterface(ABC):
+    """Queue of episode summaries to generate offline."""
+    
+    @abstractmethod
+    async def enqueue_summary(self, guild_id: str, episode_number: int) -> bool:
+        """Queue a summary job. Returns False if one is already queued or running."""
+        pass
+    
+    @abstractmethod
+    async def get_summary_status(self, guild_id: str, episode_number: int) -> Optional[str]:
+        """Get the status of an episode's latest summary job, if any."""
+        pass
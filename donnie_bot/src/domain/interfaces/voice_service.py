@@ -35,8 +35,23 @@ class VoiceServiceInterface(ABC):
         pass
     
     @abstractmethod
-    async def play_audio(self, guild_id: str, audio_data: AudioData) -> bool:
-        """Play audio in a voice channel. Returns True if successful."""
+    async def play_audio(self, guild_id: str, audio_data: AudioData, priority: bool = False) -> bool:
+        """Queue audio in a voice channel (priority audio jumps the queue). Returns True once it has played."""
+        pass
+    
+    @abstractmethod
+    async def skip_audio(self, guild_id: str) -> bool:
+        """Skip the audio currently playing. Returns True if something was playing."""
+        pass
+    
+    @abstractmethod
+    async def clear_audio_queue(self, guild_id: str, stop_current: bool = False) -> int:
+        """Drop queued audio (and optionally stop the current clip). Returns the number dropped."""
+        pass
+    
+    @abstractmethod
+    async def get_queue_depth(self, guild_id: str) -> int:
+        """Number of clips queued or playing in a guild."""
         pass
     
     @abstractmethod
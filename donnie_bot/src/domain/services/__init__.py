@@ -5,6 +5,7 @@ from .character_service import CharacterService
 from .episode_service import EpisodeService
 from .combat_service import CombatService, CombatAction, AttackRoll, CombatResult, DamageType, AttackType
 from .memory_service import MemoryService
+from .summary_service import RollingSummaryService
 
 __all__ = [
     "CharacterService",
@@ -15,5 +16,6 @@ __all__ = [
     "CombatResult",
     "DamageType",
     "AttackType",
-    "MemoryService"
+    "MemoryService",
+    "RollingSummaryService"
 ]
\ No newline at end of file
@@ -48,6 +48,7 @@ class CharacterService:
             character_class=character_class,
             background=background.strip(),
             ability_scores=ability_scores,
+            guild_id=guild_id,
             created_at=datetime.now().isoformat()
         )
         
@@ -76,6 +77,7 @@ class CharacterService:
         # Override with provided data
         character.player_name = player_name
         character.discord_user_id = discord_user_id
+        character.guild_id = guild_id
         character.created_at = datetime.now().isoformat()
         
         # Save to repository  
@@ -7,8 +7,10 @@ from datetime import datetime
 from ..entities.episode import Episode, EpisodeStatus, SessionInteraction
 from ..entities.character import Character
 from ..entities.memory import Memory
-from ..interfaces.repositories import EpisodeRepositoryInterface, MemoryRepositoryInterface
-from ..interfaces.ai_service import AIServiceInterface, AIContext
+from ..interfaces.repositories import (
+    EpisodeRepositoryInterface, MemoryRepositoryInterface, SummaryJobRepositoryInterface
+)
+from ..interfaces.ai_service import AIServiceInterface, AIContext, AIServiceBusyError
 
 
 class EpisodeService:
@@ -17,10 +19,13 @@ class EpisodeService:
     def __init__(self,
                  episode_repo: EpisodeRepositoryInterface,
                  memory_repo: Optional[MemoryRepositoryInterface] = None,
-                 ai_service: Optional[AIServiceInterface] = None):
+                 ai_service: Optional[AIServiceInterface] = None,
+                 summary_jobs: Optional[SummaryJobRepositoryInterface] = None):
         self.episode_repo = episode_repo
         self.memory_repo = memory_repo
         self.ai_service = ai_service
+        # When set, summaries are generated offline instead of blocking the caller
+        self.summary_jobs = summary_jobs
     
     async def create_episode(self, 
                            guild_id: str,
@@ -86,10 +91,14 @@ class EpisodeService:
         if not episode:
             raise ValueError("No active episode found")
         
-        # Generate summary if not provided and AI is available
-        if not summary and self.ai_service and self.memory_repo:
-            memories = await self.memory_repo.get_recent_memories(guild_id, limit=100)
-            summary = await self.ai_service.summarize_episode(episode, memories)
+        # Generate summary if not provided and AI is available (unless it is queued below)
+        if not summary and not self.summary_jobs and self.ai_service and self.memory_repo:
+            memories = await self.memory_repo.get_by_episode(guild_id, episode.episode_number)
+            try:
+                summary = await self.ai_service.summarize_episode(episode, memories)
+            except AIServiceBusyError:
+                # Ending the episode matters more than its summary
+                summary = ""
         
         if not episode.end_episode(summary, closing_scene):
             raise ValueError(f"Cannot end episode in {episode.status.value} status")
@@ -107,6 +116,10 @@ class EpisodeService:
             )
             await self.memory_repo.save_memory(closing_memory)
         
+        # Queue the summary after the closing memory so the summarizer sees it
+        if not summary and self.summary_jobs:
+            await self.summary_jobs.enqueue_summary(guild_id, episode.episode_number)
+        
         return episode
     
     async def add_player_interaction(self,
@@ -124,8 +137,9 @@ class EpisodeService:
         if not episode.is_active():
             raise ValueError("Episode is not active")
         
-        # Add interaction to episode
-        episode.add_interaction(character.name, player_action, dm_response, mode)
+        # Add interaction to episode and append it to the interaction log
+        interaction = episode.add_interaction(character.name, player_action, dm_response, mode)
+        await self.episode_repo.append_interaction(episode, interaction)
         
         # Save character snapshot
         episode.add_character_snapshot(character.discord_user_id, character.to_dict())
@@ -146,10 +160,35 @@ class EpisodeService:
         
         return episode
     
+    async def add_dm_interaction(self,
+                                 episode: Episode,
+                                 scene_description: str,
+                                 dm_response: str) -> Episode:
+        """Add a DM narration turn to an active episode"""
+        interaction = episode.add_interaction("DM", scene_description, dm_response, mode="dm_narration")
+        await self.episode_repo.append_interaction(episode, interaction)
+        return episode
+    
+    async def load_older_interactions(self, episode: Episode, limit: int = 20) -> int:
+        """Load the next page of older interactions into the episode. Returns count loaded."""
+        if not episode.has_unloaded_interactions():
+            return 0
+        
+        before_seq = episode.interactions[0].seq if episode.interactions else None
+        older = await self.episode_repo.get_interactions(
+            episode.guild_id, episode.episode_number, before_seq=before_seq, limit=limit
+        )
+        episode.prepend_interactions(older)
+        return len(older)
+    
     async def get_current_episode(self, guild_id: str) -> Optional[Episode]:
         """Get the current episode for a guild"""
         return await self.episode_repo.get_current_episode(guild_id)
     
+    async def get_episode(self, guild_id: str, episode_number: int) -> Optional[Episode]:
+        """Get one episode by number"""
+        return await self.episode_repo.get_episode(guild_id, episode_number)
+    
     async def get_episode_history(self, guild_id: str, limit: int = 10) -> List[Episode]:
         """Get episode history for a guild"""
         return await self.episode_repo.get_episode_history(guild_id, limit)
@@ -182,12 +221,16 @@ class EpisodeService:
         return 3 <= len(name) <= 100
     
     def get_episode_stats(self, episode: Episode) -> Dict[str, Any]:
-        """Get statistics for an episode"""
+        """Get statistics for an episode
+        
+        Totals cover the whole episode; per-character and response-length
+        figures are computed from the loaded page of interactions.
+        """
         if not episode.interactions:
             return {
                 "duration_hours": episode.get_duration_hours(),
-                "interaction_count": 0,
-                "character_count": 0,
+                "interaction_count": episode.get_interaction_count(),
+                "character_count": episode.get_character_count(),
                 "average_response_length": 0,
                 "most_active_character": None
             }
@@ -203,19 +246,17 @@ class EpisodeService:
         
         return {
             "duration_hours": episode.get_duration_hours(),
-            "interaction_count": len(episode.interactions),
-            "character_count": len(character_counts),
+            "interaction_count": episode.get_interaction_count(),
+            "character_count": episode.get_character_count(),
             "average_response_length": sum(response_lengths) / len(response_lengths),
             "most_active_character": most_active[0] if most_active else None,
             "character_interaction_counts": character_counts
         }
     
     async def generate_episode_summary(self, guild_id: str, episode_number: Optional[int] = None) -> str:
-        """Generate a summary of an episode"""
+        """Get an episode's summary, generating one if none is stored"""
         if episode_number:
-            # Get specific episode from history
-            history = await self.episode_repo.get_episode_history(guild_id, limit=50)
-            episode = next((ep for ep in history if ep.episode_number == episode_number), None)
+            episode = await self.episode_repo.get_episode(guild_id, episode_number)
         else:
             # Get current episode
             episode = await self.episode_repo.get_current_episode(guild_id)
@@ -223,13 +264,25 @@ class EpisodeService:
         if not episode:
             raise ValueError("Episode not found")
         
-        # If AI service available, generate intelligent summary
-        if self.ai_service and self.memory_repo:
-            memories = await self.memory_repo.get_recent_memories(guild_id, limit=100)
-            episode_memories = [m for m in memories if m.episode_number == episode.episode_number]
-            return await self.ai_service.summarize_episode(episode, episode_memories)
+        # A stored summary (given at episode end or written by the batch summarizer) is served as is
+        if episode.summary:
+            return episode.summary
         
-        # Otherwise, create basic summary
+        # Completed episodes are summarized offline; make sure one is queued
+        summary_pending = False
+        if self.summary_jobs and episode.status == EpisodeStatus.COMPLETED:
+            await self.summary_jobs.enqueue_summary(guild_id, episode.episode_number)
+            summary_pending = True
+        
+        # If AI service available, generate intelligent summary
+        elif self.ai_service and self.memory_repo:
+            episode_memories = await self.memory_repo.get_by_episode(guild_id, episode.episode_number)
+            try:
+                return await self.ai_service.summarize_episode(episode, episode_memories)
+            except AIServiceBusyError:
+                pass
+        
+        # Otherwise (or if the AI is too busy), create basic summary
         stats = self.get_episode_stats(episode)
         summary_parts = [
             f"Episode {episode.episode_number}: {episode.name}",
@@ -244,4 +297,7 @@ class EpisodeService:
         if episode.closing_scene:
             summary_parts.append(f"Closing: {episode.closing_scene[:100]}...")
         
+        if summary_pending:
+            summary_parts.append("\n📝 A full summary is being written and will be ready shortly.")
+        
         return "\n".join(summary_parts)
\ No newline at end of file
@@ -72,33 +72,32 @@ class MemoryService:
         """Search memories by content"""
         return await self.memory_repo.search_memories(guild_id, query, limit)
     
+    async def find_relevant_memories(self,
+                                     guild_id: str,
+                                     text: str,
+                                     limit: int = 5) -> List[Memory]:
+        """Find memories related to free text (e.g. a player action), best match first"""
+        return await self.memory_repo.recall_memories(guild_id, text, limit)
+    
     async def get_character_memories(self,
                                    guild_id: str,
                                    character_name: str,
                                    limit: int = 50) -> List[Memory]:
         """Get memories involving a specific character"""
-        all_memories = await self.memory_repo.get_recent_memories(guild_id, limit * 2)
-        
-        # Filter for character-specific memories
-        character_memories = [
-            memory for memory in all_memories
-            if memory.character_name == character_name or character_name.lower() in memory.content.lower()
-        ]
-        
-        return character_memories[:limit]
+        return await self.memory_repo.get_by_character(guild_id, character_name, limit)
     
     async def get_episode_memories(self,
                                  guild_id: str,
                                  episode_number: int) -> List[Memory]:
         """Get all memories from a specific episode"""
-        all_memories = await self.memory_repo.get_recent_memories(guild_id, limit=1000)
-        
-        episode_memories = [
-            memory for memory in all_memories
-            if memory.episode_number == episode_number
-        ]
-        
-        return sorted(episode_memories, key=lambda m: m.timestamp)
+        return await self.memory_repo.get_by_episode(guild_id, episode_number)
+    
+    async def get_memories_by_type(self,
+                                 guild_id: str,
+                                 memory_type: str,
+                                 limit: int = 50) -> List[Memory]:
+        """Get memories of a specific type"""
+        return await self.memory_repo.get_by_type(guild_id, memory_type, limit)
     
     async def summarize_recent_events(self,
                                     guild_id: str,
@@ -107,15 +106,9 @@ class MemoryService:
         if not self.ai_service:
             return None
         
-        # Get recent memories
-        memories = await self.memory_repo.get_recent_memories(guild_id, limit=100)
-        
-        # Filter to recent timeframe
+        # Get memories within the lookback window
         cutoff_time = datetime.now() - timedelta(hours=lookback_hours)
-        recent_memories = [
-            memory for memory in memories
-            if memory.timestamp >= cutoff_time
-        ]
+        recent_memories = await self.memory_repo.get_since(guild_id, cutoff_time, limit=100)
         
         if not recent_memories:
             return "No recent activity to summarize."
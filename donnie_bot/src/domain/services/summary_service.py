@@ -0,0 +1,261 @@
+"""
+Rolling Summary Service - Hierarchical campaign summaries
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from ..entities.episode import Episode
+from ..entities.memory import Memory
+from ..interfaces.repositories import EpisodeRepositoryInterface, MemoryRepositoryInterface
+from ..interfaces.ai_service import AIServiceInterface
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_MEMORY_TYPE = "summary"
+
+# Summary levels, narrowest first
+SCENE_LEVEL = "scene"
+EPISODE_LEVEL = "episode"
+ARC_LEVEL = "arc"
+
+LEVEL_IMPORTANCE = {SCENE_LEVEL: 3, EPISODE_LEVEL: 4, ARC_LEVEL: 5}
+
+
+class RollingSummaryService:
+    """Service that compacts campaign history into a fixed-size summary hierarchy
+    
+    Every `scene_size` interactions become a scene summary; once
+    `scenes_per_episode` scenes pile up they are folded into a rolling
+    "episode so far" summary; every `episodes_per_arc` completed episodes
+    are folded into a rolling arc summary. Summaries are stored as
+    `memory_type="summary"` memories and only the newest of each level is
+    used for prompts, so context stays the same size however long the
+    campaign runs.
+    """
+    
+    def __init__(self,
+                 memory_repo: MemoryRepositoryInterface,
+                 episode_repo: EpisodeRepositoryInterface,
+                 ai_service: AIServiceInterface,
+                 scene_size: int = 10,
+                 scenes_per_episode: int = 4,
+                 episodes_per_arc: int = 5):
+        self.memory_repo = memory_repo
+        self.episode_repo = episode_repo
+        self.ai_service = ai_service
+        self.scene_size = scene_size
+        self.scenes_per_episode = scenes_per_episode
+        self.episodes_per_arc = episodes_per_arc
+        
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._rerun: Set[str] = set()
+        self._stats = {SCENE_LEVEL: 0, EPISODE_LEVEL: 0, ARC_LEVEL: 0, "errors": 0}
+    
+    def request_refresh(self, guild_id: str) -> None:
+        """Refresh a guild's summaries in the background
+        
+        Requests made while a refresh is running fold into one more pass.
+        """
+        task = self._tasks.get(guild_id)
+        if task and not task.done():
+            self._rerun.add(guild_id)
+            return
+        
+        self._tasks[guild_id] = asyncio.create_task(self._refresh_in_background(guild_id))
+    
+    async def stop(self) -> None:
+        """Cancel background refreshes"""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+    
+    async def refresh(self, guild_id: str) -> int:
+        """Write any summaries that are due. Returns the number written."""
+        lock = self._locks.setdefault(guild_id, asyncio.Lock())
+        async with lock:
+            current = await self.episode_repo.get_current_episode(guild_id)
+            if not current:
+                return 0
+            
+            written = 0
+            if current.is_active():
+                written += await self._refresh_scenes(current)
+                written += await self._refresh_episode(current)
+            
+            written += await self._refresh_arcs(guild_id, self._last_completed(current))
+            return written
+    
+    async def get_context_summaries(self, guild_id: str, episode: Episode) -> List[Memory]:
+        """Summaries covering everything before the raw interaction tail, broadest first
+        
+        At most: the latest arc, the completed episodes since it, the current
+        episode's rolling summary and the scenes since that.
+        """
+        summaries = []
+        
+        arcs = await self.memory_repo.get_summaries(guild_id, ARC_LEVEL, limit=1)
+        arc_through = 0
+        if arcs:
+            summaries.append(arcs[0])
+            arc_through = arcs[0].metadata.get("through", 0)
+        
+        last_completed = self._last_completed(episode)
+        first = max(arc_through + 1, last_completed - self.episodes_per_arc + 1)
+        for number in range(first, last_completed + 1):
+            text = await self._episode_text(guild_id, number)
+            if text:
+                summaries.append(self._summary_memory(guild_id, number, EPISODE_LEVEL, text, {"through": "end"}))
+        
+        if episode.is_active():
+            rollup, scenes = await self._current_episode_summaries(episode)
+            if rollup:
+                summaries.append(rollup)
+            summaries.extend(scenes)
+        
+        return summaries
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get counts of summaries written per level"""
+        return dict(self._stats)
+    
+    async def _refresh_in_background(self, guild_id: str) -> None:
+        """Refresh until no further requests came in meanwhile"""
+        while True:
+            self._rerun.discard(guild_id)
+            try:
+                await self.refresh(guild_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Nothing was stored for the failed step; the next request retries it
+                self._stats["errors"] += 1
+                logger.warning(f"⚠️ Rolling summary refresh failed in guild {guild_id}: {e}")
+                return
+            
+            if guild_id not in self._rerun:
+                return
+    
+    async def _refresh_scenes(self, episode: Episode) -> int:
+        """Summarize every full block of `scene_size` interactions not yet covered"""
+        scenes = await self.memory_repo.get_summaries(episode.guild_id, SCENE_LEVEL, episode.episode_number, limit=1)
+        covered = scenes[0].metadata.get("end", 0) if scenes else 0
+        
+        written = 0
+        while episode.get_interaction_count() - covered >= self.scene_size:
+            start, end = covered + 1, covered + self.scene_size
+            interactions = await self.episode_repo.get_interactions(
+                episode.guild_id, episode.episode_number, before_seq=end + 1, limit=self.scene_size
+            )
+            
+            passages = [
+                f"{interaction.character_name}: {interaction.player_action}\nDM: {interaction.dm_response}"
+                for interaction in interactions
+            ]
+            text = await self.ai_service.condense_summary(episode.guild_id, SCENE_LEVEL, passages)
+            await self._save(episode.guild_id, episode.episode_number, SCENE_LEVEL, text, {"start": start, "end": end})
+            
+            covered = end
+            written += 1
+        
+        return written
+    
+    async def _refresh_episode(self, episode: Episode) -> int:
+        """Fold scenes into the episode's rolling summary once enough have piled up"""
+        rollup, scenes = await self._current_episode_summaries(episode)
+        if len(scenes) < self.scenes_per_episode:
+            return 0
+        
+        text = await self.ai_service.condense_summary(
+            episode.guild_id,
+            EPISODE_LEVEL,
+            [scene.content for scene in scenes],
+            previous=rollup.content if rollup else None
+        )
+        await self._save(
+            episode.guild_id, episode.episode_number, EPISODE_LEVEL, text,
+            {"through": scenes[-1].metadata.get("end", 0)}
+        )
+        return 1
+    
+    async def _refresh_arcs(self, guild_id: str, last_completed: int) -> int:
+        """Fold every `episodes_per_arc` completed episodes into the rolling arc summary"""
+        arcs = await self.memory_repo.get_summaries(guild_id, ARC_LEVEL, limit=1)
+        previous = arcs[0] if arcs else None
+        through = previous.metadata.get("through", 0) if previous else 0
+        
+        written = 0
+        while last_completed - through >= self.episodes_per_arc:
+            numbers = range(through + 1, through + self.episodes_per_arc + 1)
+            passages = [text for text in [await self._episode_text(guild_id, number) for number in numbers] if text]
+            through = numbers[-1]
+            
+            text = await self.ai_service.condense_summary(
+                guild_id, ARC_LEVEL, passages, previous=previous.content if previous else None
+            )
+            previous = await self._save(guild_id, through, ARC_LEVEL, text, {"through": through})
+            written += 1
+        
+        return written
+    
+    async def _current_episode_summaries(self, episode: Episode):
+        """The episode's latest rolling summary and the scenes after it (oldest first)"""
+        rollups = await self.memory_repo.get_summaries(episode.guild_id, EPISODE_LEVEL, episode.episode_number, limit=1)
+        rollup = rollups[0] if rollups else None
+        through = rollup.metadata.get("through", 0) if rollup else 0
+        
+        scenes = await self.memory_repo.get_summaries(episode.guild_id, SCENE_LEVEL, episode.episode_number)
+        scenes = sorted(
+            (scene for scene in scenes if scene.metadata.get("start", 0) > through),
+            key=lambda scene: scene.metadata.get("start", 0)
+        )
+        return rollup, scenes
+    
+    async def _episode_text(self, guild_id: str, episode_number: int) -> Optional[str]:
+        """Best available summary of a finished episode"""
+        episode = await self.episode_repo.get_episode(guild_id, episode_number)
+        if not episode:
+            return None
+        
+        heading = f"Episode {episode.episode_number}: {episode.name}"
+        if episode.summary:
+            return f"{heading}\n{episode.summary}"
+        
+        # The offline summary may not be written yet; use the rolling summaries
+        rollup, scenes = await self._current_episode_summaries(episode)
+        parts = ([rollup.content] if rollup else []) + [scene.content for scene in scenes]
+        if parts:
+            return "\n".join([heading] + parts)
+        
+        if episode.opening_scene:
+            return f"{heading}\n{episode.opening_scene[:300]}"
+        return heading
+    
+    async def _save(self, guild_id: str, episode_number: int, level: str, text: str, coverage: Dict) -> Memory:
+        """Store a summary and count it"""
+        memory = self._summary_memory(guild_id, episode_number, level, text, coverage)
+        await self.memory_repo.save_memory(memory)
+        self._stats[level] += 1
+        return memory
+    
+    @staticmethod
+    def _summary_memory(guild_id: str, episode_number: int, level: str, text: str, coverage: Dict) -> Memory:
+        """Build a summary memory (coverage: which interactions/episodes it spans)"""
+        return Memory(
+            guild_id=guild_id,
+            episode_number=episode_number,
+            content=text,
+            memory_type=SUMMARY_MEMORY_TYPE,
+            importance=LEVEL_IMPORTANCE[level],
+            metadata={"level": level, **coverage},
+            timestamp=datetime.now()
+        )
+    
+    @staticmethod
+    def _last_completed(episode: Episode) -> int:
+        """Number of the latest episode that has finished"""
+        return episode.episode_number - 1 if episode.is_active() else episode.episode_number
@@ -2,7 +2,21 @@
 AI service infrastructure
 """
 from .claude_service import ClaudeService
+from .request_scheduler import AIRequestScheduler, CircuitOpenError
+from .fair_scheduler import FairAIScheduler
+from .response_cache import AIResponseCache
+from .context_assembler import ContextAssembler, estimate_tokens
+from .batch_summarizer import BatchSummarizer
+from .fake_batch_client import FakeBatchClient
 
 __all__ = [
-    "ClaudeService"
+    "ClaudeService",
+    "AIRequestScheduler",
+    "CircuitOpenError",
+    "FairAIScheduler",
+    "AIResponseCache",
+    "ContextAssembler",
+    "estimate_tokens",
+    "BatchSummarizer",
+    "FakeBatchClient"
 ]
\ No newline at end of file
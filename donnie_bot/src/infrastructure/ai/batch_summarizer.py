@@ -0,0 +1,171 @@
+"""
+Offline episode summaries through the Message Batches API
+"""
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from ...domain.interfaces.repositories import EpisodeRepositoryInterface, MemoryRepositoryInterface
+from ..config.settings import AIConfig
+from ..database.sqlite_repository import SQLiteSummaryJobRepository
+from .claude_service import ClaudeService
+
+logger = logging.getLogger(__name__)
+
+CUSTOM_ID_PREFIX = "summary-"
+
+
+class BatchSummarizer:
+    """Background worker that turns queued summary jobs into stored episode summaries
+    
+    Every poll interval it submits pending jobs in one batch (the same
+    request ClaudeService would send live), then checks submitted batches
+    and writes finished summaries to `episodes.summary`. Failed or expired
+    requests go back to the queue until they run out of attempts.
+    """
+    
+    def __init__(self,
+                 ai_service: ClaudeService,
+                 jobs: SQLiteSummaryJobRepository,
+                 episode_repo: EpisodeRepositoryInterface,
+                 memory_repo: MemoryRepositoryInterface,
+                 config: AIConfig,
+                 client: Optional[Any] = None):
+        self.ai_service = ai_service
+        self.jobs = jobs
+        self.episode_repo = episode_repo
+        self.memory_repo = memory_repo
+        self.config = config
+        # Anything exposing messages.batches.create/retrieve/results (see FakeBatchClient)
+        self.client = client or ai_service.client
+        self._task: Optional[asyncio.Task] = None
+        
+        self._stats = {
+            "batches_submitted": 0,
+            "jobs_submitted": 0,
+            "summaries_written": 0,
+            "jobs_failed": 0,
+            "errors": 0,
+        }
+    
+    def start(self) -> None:
+        """Start the background polling loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_loop())
+            logger.info(f"📝 Batch summarizer started (every {self.config.batch_poll_interval_seconds:.0f}s)")
+    
+    async def stop(self) -> None:
+        """Stop the background polling loop"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def run_once(self) -> None:
+        """Submit pending jobs, then collect finished batches"""
+        await self.submit_pending()
+        await self.collect_results()
+    
+    async def submit_pending(self) -> Optional[str]:
+        """Submit pending jobs as one batch. Returns the batch id, if one was created."""
+        jobs = await self.jobs.get_pending(self.config.batch_max_requests)
+        if not jobs:
+            return None
+        
+        requests = []
+        submitted_ids = []
+        for job in jobs:
+            episode = await self.episode_repo.get_episode(job.guild_id, job.episode_number)
+            if not episode:
+                await self.jobs.mark_failed(job.id, "episode not found", max_attempts=0)
+                self._stats["jobs_failed"] += 1
+                continue
+            
+            memories = await self.memory_repo.get_by_episode(job.guild_id, job.episode_number)
+            requests.append({
+                "custom_id": f"{CUSTOM_ID_PREFIX}{job.id}",
+                "params": self.ai_service.build_summary_request(episode, memories)
+            })
+            submitted_ids.append(job.id)
+        
+        if not requests:
+            return None
+        
+        batch = await self.client.messages.batches.create(requests=requests)
+        await self.jobs.mark_submitted(submitted_ids, batch.id)
+        
+        self._stats["batches_submitted"] += 1
+        self._stats["jobs_submitted"] += len(submitted_ids)
+        logger.info(f"📝 Submitted {len(submitted_ids)} episode summaries in batch {batch.id}")
+        return batch.id
+    
+    async def collect_results(self) -> int:
+        """Write results of ended batches. Returns the number of summaries written."""
+        written = 0
+        for batch_id in await self.jobs.get_submitted_batch_ids():
+            batch = await self.client.messages.batches.retrieve(batch_id)
+            if batch.processing_status != "ended":
+                continue
+            
+            jobs = {job.id: job for job in await self.jobs.get_batch_jobs(batch_id)}
+            
+            async for entry in await self.client.messages.batches.results(batch_id):
+                job = jobs.pop(self._job_id(entry.custom_id), None)
+                if job is None:
+                    continue
+                
+                result = entry.result
+                if result.type == "succeeded":
+                    summary = result.message.content[0].text.strip()
+                    await self.episode_repo.update_summary(job.guild_id, job.episode_number, summary)
+                    await self.jobs.mark_done(job.id)
+                    written += 1
+                else:
+                    error = getattr(getattr(result, "error", None), "message", None) or result.type
+                    await self._fail(job.id, f"batch request {result.type}: {error}")
+            
+            # Anything the batch did not report on is retried
+            for job in jobs.values():
+                await self._fail(job.id, "missing from batch results")
+        
+        self._stats["summaries_written"] += written
+        if written:
+            logger.info(f"📝 Stored {written} episode summaries from batch results")
+        return written
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get worker statistics"""
+        return dict(self._stats)
+    
+    async def _fail(self, job_id: int, error: str) -> None:
+        """Requeue a job (or fail it for good) and count it"""
+        await self.jobs.mark_failed(job_id, error, self.config.summary_job_max_attempts)
+        self._stats["jobs_failed"] += 1
+        logger.warning(f"⚠️ Summary job {job_id} failed: {error}")
+    
+    async def _run_loop(self) -> None:
+        """Run the worker every poll interval"""
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Jobs stay queued/submitted and are picked up again next round
+                self._stats["errors"] += 1
+                logger.warning(f"⚠️ Batch summarizer round failed: {e}")
+            
+            await asyncio.sleep(self.config.batch_poll_interval_seconds)
+    
+    @staticmethod
+    def _job_id(custom_id: str) -> Optional[int]:
+        """Parse a job id from a batch request custom_id"""
+        if not custom_id.startswith(CUSTOM_ID_PREFIX):
+            return None
+        try:
+            return int(custom_id[len(CUSTOM_ID_PREFIX):])
+        except ValueError:
+            return None
@@ -2,21 +2,57 @@
 Claude AI service implementation
 """
 import asyncio
-from typing import List, Optional, Dict, Any
+import re
+from typing import AsyncIterator, List, Optional, Dict, Any
 from anthropic import AsyncAnthropic
 
-from ...domain.entities import Character, Episode, Memory
+from ...domain.entities import Character, Episode, EpisodeStatus, Memory
 from ...domain.entities.character import Race, CharacterClass, AbilityScores
-from ...domain.interfaces.ai_service import AIServiceInterface, AIResponse, AIContext
+from ...domain.interfaces.ai_service import (
+    AIServiceInterface, AIResponse, AIContext, AIPriority, AIServiceBusyError, RoundAction
+)
 from ..config.settings import AIConfig
+from .context_assembler import AssembledContext, ContextAssembler, estimate_tokens
+from .request_scheduler import AIRequestScheduler, CircuitOpenError
+from .response_cache import AIResponseCache
+
+# What each rolling summary level covers, and its length in words
+ROLLING_SUMMARY_SCOPES = {
+    "scene": ("one scene of a D&D session", 120),
+    "episode": ("the D&D episode so far", 220),
+    "arc": ("a multi-episode D&D campaign arc", 300),
+    "digest": ("minor moments of a D&D session, kept for the campaign record", 150),
+}
+
+# Section markers ([[1]], [[2]], ...) separating each player's part of a round narration
+ROUND_SECTION_PATTERN = re.compile(r"^\s*\[\[(\d+)\]\]\s*$", re.MULTILINE)
 
 
 class ClaudeService(AIServiceInterface):
     """Claude AI service implementation"""
     
-    def __init__(self, config: AIConfig):
+    def __init__(self, config: AIConfig, response_cache: Optional[AIResponseCache] = None):
         self.config = config
-        self.client = AsyncAnthropic(api_key=config.api_key)
+        # Only repeatable calls are cached; narrative turns never are
+        self.response_cache = response_cache
+        # Retries and timeouts are owned by the scheduler, not the SDK
+        self.client = AsyncAnthropic(
+            api_key=config.api_key,
+            max_retries=0,
+            timeout=config.timeout_seconds
+        )
+        self.scheduler = AIRequestScheduler(config)
+        self.context_assembler = ContextAssembler(
+            token_budget=config.context_token_budget,
+            max_item_chars=config.context_item_max_chars
+        )
+        self.usage_totals = {
+            "requests": 0,
+            "input_tokens": 0,
+            "output_tokens": 0,
+            "cache_creation_input_tokens": 0,
+            "cache_read_input_tokens": 0,
+        }
         
         # D&D context prompt
         self.system_prompt = """You are Donnie, an expert D&D Dungeon Master with years of experience running campaigns. 
@@ -31,23 +67,23 @@ Key traits:
 - Uses appropriate D&D mechanics and terminology
 
 Always respond in character as the DM, providing engaging narrative responses to player actions."""
-    
+
     async def generate_dm_response(self, context: AIContext) -> AIResponse:
         """Generate a DM response for game progression"""
         
         # Build context prompt
-        prompt = self._build_dm_prompt(context)
+        assembled = self.context_assembler.assemble(context)
+        prompt = self._build_dm_prompt(context, assembled)
         
         try:
-            message = await self.client.messages.create(
+            message = await self._create_message(
+                guild_id=context.episode.guild_id,
+                lane=AIPriority.HIGH,
                 model=self.config.model,
                 max_tokens=self.config.max_tokens,
                 temperature=self.config.temperature,
-                system=self.system_prompt,
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }]
+                system=self._system_blocks(),
+                messages=self._build_messages(context, prompt)
             )
             
             response_text = message.content[0].text.strip()
@@ -57,10 +93,14 @@ Always respond in character as the DM, providing engaging narrative responses to
                 metadata={
                     "model": self.config.model,
                     "tokens_used": message.usage.input_tokens + message.usage.output_tokens,
-                    "type": "dm_response"
+                    "type": "dm_response",
+                    "context": assembled.report(),
+                    **self._record_usage(message.usage)
                 }
             )
-            
+        
+        except AIServiceBusyError:
+            raise
         except Exception as e:
             return AIResponse(
                 text=f"*The DM pauses, gathering their thoughts...* (Error: {str(e)})",
@@ -70,32 +110,18 @@ Always respond in character as the DM, providing engaging narrative responses to
     async def generate_character_action_result(self, context: AIContext) -> AIResponse:
         """Generate result of a character's action"""
         
-        prompt = f"""
-        Character Action Resolution:
-        
-        Episode: {context.episode.name}
-        Current Scene: {context.episode.interactions[-1].dm_response if context.episode.interactions else context.episode.opening_scene}
-        
-        Character: {context.character.name if context.character else "Unknown"}
-        Player Action: {context.action_text}
-        
-        Provide a detailed result of this action, including:
-        - Immediate consequences
-        - Any dice rolls needed (describe the roll and outcome)
-        - Environmental changes
-        - NPC reactions
-        - Next story beats
-        
-        Be descriptive and engaging while maintaining game balance.
-        """
+        assembled = self.context_assembler.assemble(context)
+        prompt = self._build_action_prompt(context, assembled)
         
         try:
-            message = await self.client.messages.create(
+            message = await self._create_message(
+                guild_id=context.episode.guild_id,
+                lane=context.priority,
                 model=self.config.model,
                 max_tokens=self.config.max_tokens,
                 temperature=self.config.temperature,
-                system=self.system_prompt,
-                messages=[{"role": "user", "content": prompt}]
+                system=self._system_blocks(),
+                messages=self._build_messages(context, prompt)
             )
             
             return AIResponse(
@@ -103,10 +129,14 @@ Always respond in character as the DM, providing engaging narrative responses to
                 metadata={
                     "model": self.config.model,
                     "type": "action_result",
-                    "character": context.character.name if context.character else None
+                    "character": context.character.name if context.character else None,
+                    "context": assembled.report(),
+                    **self._record_usage(message.usage)
                 }
             )
-            
+        
+        except AIServiceBusyError:
+            raise
         except Exception as e:
             return AIResponse(
                 text=f"*Something magical interferes with the action...* (Error: {str(e)})",
@@ -116,49 +146,146 @@ Always respond in character as the DM, providing engaging narrative responses to
     async def generate_combat_narration(self, context: AIContext) -> AIResponse:
         """Generate combat narration and results"""
         
-        prompt = f"""
-        Combat Narration:
-        
-        Episode: {context.episode.name}
-        Character: {context.character.name if context.character else "Unknown"}
-        Combat Action: {context.action_text}
-        
-        Recent Context:
-        {self._format_recent_memories(context.recent_memories)}
-        
-        Provide exciting combat narration including:
-        - Vivid description of the action
-        - Environmental details
-        - Enemy reactions
-        - Tactical situation updates
-        - Dramatic tension
-        
-        Keep it fast-paced and engaging for D&D combat.
-        """
+        assembled = self.context_assembler.assemble(context)
+        prompt = self._build_combat_prompt(context, assembled)
         
         try:
-            message = await self.client.messages.create(
+            message = await self._create_message(
+                guild_id=context.episode.guild_id,
+                lane=context.priority,
                 model=self.config.model,
                 max_tokens=self.config.max_tokens,
                 temperature=self.config.temperature + 0.1,  # Slightly more creative for combat
-                system=self.system_prompt,
-                messages=[{"role": "user", "content": prompt}]
+                system=self._system_blocks(),
+                messages=self._build_messages(context, prompt)
             )
             
             return AIResponse(
                 text=message.content[0].text.strip(),
                 metadata={
                     "model": self.config.model,
-                    "type": "combat_narration"
+                    "type": "combat_narration",
+                    "context": assembled.report(),
+                    **self._record_usage(message.usage)
                 }
             )
-            
+        
+        except AIServiceBusyError:
+            raise
         except Exception as e:
             return AIResponse(
                 text=f"*The battle rages on...* (Error: {str(e)})",
                 metadata={"error": str(e)}
             )
     
+    async def generate_round_results(self, context: AIContext, actions: List[RoundAction]) -> List[AIResponse]:
+        """Narrate several simultaneous actions in one call and split the result per action"""
+        
+        assembled = self.context_assembler.assemble(context)
+        prompt = self._build_round_prompt(context, actions, assembled)
+        
+        try:
+            message = await self._create_message(
+                guild_id=context.episode.guild_id,
+                lane=context.priority,
+                model=self.config.model,
+                # Room for every player's section, capped at three normal replies
+                max_tokens=self.config.max_tokens * min(len(actions), 3),
+                temperature=self.config.temperature,
+                system=self._system_blocks(),
+                messages=self._build_messages(context, prompt)
+            )
+            
+            usage = self._record_usage(message.usage)
+            sections = self._split_round_sections(message.content[0].text, len(actions))
+            
+            return [
+                AIResponse(
+                    text=section,
+                    metadata={
+                        "model": self.config.model,
+                        "type": "action_result",
+                        "character": action.character.name,
+                        "round_size": len(actions),
+                        "context": assembled.report(),
+                        # Usage is for the whole round, so only attribute it once
+                        **(usage if index == 0 else {})
+                    }
+                )
+                for index, (action, section) in enumerate(zip(actions, sections))
+            ]
+        
+        except AIServiceBusyError:
+            raise
+        except Exception as e:
+            return [
+                AIResponse(
+                    text=f"*Something magical interferes with the action...* (Error: {str(e)})",
+                    metadata={"error": str(e)}
+                )
+                for _ in actions
+            ]
+    
+    async def stream_action_result(self, context: AIContext, action_type: str = "general") -> AsyncIterator[str]:
+        """Stream an action result (or combat narration) as text deltas"""
+        
+        is_combat = action_type.lower() == "combat"
+        assembled = self.context_assembler.assemble(context)
+        if is_combat:
+            prompt = self._build_combat_prompt(context, assembled)
+            temperature = self.config.temperature + 0.1  # Slightly more creative for combat
+        else:
+            prompt = self._build_action_prompt(context, assembled)
+            temperature = self.config.temperature
+        
+        guild_id = context.episode.guild_id
+        streamed = False
+        attempt = 0
+        try:
+            while True:
+                try:
+                    async with self.scheduler.slot(guild_id, context.priority):
+                        async with self.client.messages.stream(
+                            model=self.config.model,
+                            max_tokens=self.config.max_tokens,
+                            temperature=temperature,
+                            system=self._system_blocks(),
+                            messages=self._build_messages(context, prompt)
+                        ) as stream:
+                            # Timeout applies to the gap between chunks, not the whole stream
+                            deltas = stream.text_stream.__aiter__()
+                            while True:
+                                try:
+                                    text = await asyncio.wait_for(deltas.__anext__(), timeout=self.config.timeout_seconds)
+                                except StopAsyncIteration:
+                                    break
+                                if text:
+                                    streamed = True
+                                    yield text
+                            
+                            final_message = await stream.get_final_message()
+                            self._record_usage(final_message.usage)
+                    
+                    self.scheduler.on_success()
+                    return
+                
+                except (CircuitOpenError, AIServiceBusyError):
+                    raise
+                except Exception as e:
+                    # Text already shown to the player cannot be retried
+                    delay = self.scheduler.on_failure(e, self.config.max_retries if streamed else attempt)
+                    if delay is None:
+                        raise
+                    attempt += 1
+                    await asyncio.sleep(delay)
+        
+        except AIServiceBusyError:
+            raise
+        except Exception as e:
+            fallback = "*The battle rages on...*" if is_combat else "*Something magical interferes with the action...*"
+            separator = "\n\n" if streamed else ""
+            yield f"{separator}{fallback} (Error: {str(e)})"
+    
     async def generate_character_sheet(self, character_description: str) -> Character:
         """Generate a character sheet from a description"""
         
@@ -189,24 +316,31 @@ Always respond in character as the DM, providing engaging narrative responses to
         Use standard D&D ability scores (8-15 range), appropriate equipment for the class, and make it balanced for level 1.
         """
         
+        request = {
+            "model": self.config.model,
+            "max_tokens": 800,
+            "temperature": 0.7,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        
         try:
-            message = await self.client.messages.create(
-                model=self.config.model,
-                max_tokens=800,
-                temperature=0.7,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            # Parse JSON response
-            import json
-            response_text = message.content[0].text.strip()
-            
-            # Extract JSON from response (in case there's extra text)
-            start = response_text.find('{')
-            end = response_text.rfind('}') + 1
-            json_text = response_text[start:end]
+            char_data = await self._cached_payload("character_sheet", request)
+            cache_ttl = 0 if char_data else self.config.character_sheet_cache_ttl
             
-            char_data = json.loads(json_text)
+            if not char_data:
+                message = await self._create_message(lane=AIPriority.NORMAL, **request)
+                self._record_usage(message.usage)
+                
+                # Parse JSON response
+                import json
+                response_text = message.content[0].text.strip()
+                
+                # Extract JSON from response (in case there's extra text)
+                start = response_text.find('{')
+                end = response_text.rfind('}') + 1
+                json_text = response_text[start:end]
+                
+                char_data = json.loads(json_text)
             
             # Create character entity
             ability_scores = AbilityScores(**char_data["ability_scores"])
@@ -225,8 +359,13 @@ Always respond in character as the DM, providing engaging narrative responses to
                 personality_traits=char_data.get("personality_traits", [])
             )
             
-            return character
+            # Only cache sheets that parsed into a valid character
+            await self._cache_payload("character_sheet", request, char_data, cache_ttl)
             
+            return character
+        
+        except AIServiceBusyError:
+            raise
         except Exception as e:
             # Return a default fighter if generation fails
             return Character(
@@ -243,6 +382,44 @@ Always respond in character as the DM, providing engaging narrative responses to
     async def summarize_episode(self, episode: Episode, memories: List[Memory]) -> str:
         """Create a summary of an episode"""
         
+        request = self.build_summary_request(episode, memories)
+        
+        # A completed episode's summary never changes; an active one's goes stale with every turn
+        cache_ttl = self.config.summary_cache_ttl if episode.status == EpisodeStatus.COMPLETED else 0
+        
+        try:
+            if cache_ttl:
+                cached = await self._cached_payload("episode_summary", request)
+                if cached:
+                    return cached
+            
+            message = await self._create_message(guild_id=episode.guild_id, lane=AIPriority.LOW, **request)
+            self._record_usage(message.usage)
+            summary = message.content[0].text.strip()
+            
+            await self._cache_payload("episode_summary", request, summary, cache_ttl)
+            return summary
+        
+        except AIServiceBusyError:
+            raise
+        except Exception as e:
+            # Fallback summary
+            return f"""
+            Episode {episode.episode_number}: {episode.name}
+            
+            The party continued their adventure with {episode.get_interaction_count()} interactions over {episode.get_duration_hours():.1f} hours. {episode.get_character_count()} characters participated in this session.
+            
+            {episode.opening_scene[:200] if episode.opening_scene else "The adventure continued..."}
+            
+            (Summary generation encountered an error: {str(e)})
+            """
+    
+    def build_summary_request(self, episode: Episode, memories: List[Memory]) -> Dict[str, Any]:
+        """Build the messages.create parameters for an episode summary
+        
+        Shared by the live call and the batch summarizer so both send the same request.
+        """
+        
         # Format memories for context
         memory_text = "\n".join([
             f"- {memory.content[:200]}..." if len(memory.content) > 200 else f"- {memory.content}"
@@ -269,28 +446,52 @@ Always respond in character as the DM, providing engaging narrative responses to
         Keep it engaging and suitable for campaign records.
         """
         
-        try:
-            message = await self.client.messages.create(
-                model=self.config.model,
-                max_tokens=500,
-                temperature=0.5,
-                system="You are a D&D campaign chronicler who creates engaging session summaries.",
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            return message.content[0].text.strip()
-            
-        except Exception as e:
-            # Fallback summary
-            return f"""
-            Episode {episode.episode_number}: {episode.name}
-            
-            The party continued their adventure with {episode.get_interaction_count()} interactions over {episode.get_duration_hours():.1f} hours. {episode.get_character_count()} characters participated in this session.
-            
-            {episode.opening_scene[:200] if episode.opening_scene else "The adventure continued..."}
-            
-            (Summary generation encountered an error: {str(e)})
-            """
+        return {
+            "model": self.config.model,
+            "max_tokens": 500,
+            "temperature": 0.5,
+            "system": "You are a D&D campaign chronicler who creates engaging session summaries.",
+            "messages": [{"role": "user", "content": prompt}]
+        }
+    
+    async def condense_summary(self,
+                               guild_id: str,
+                               level: str,
+                               passages: List[str],
+                               previous: Optional[str] = None) -> str:
+        """Condense passages into one rolling summary (scene, episode or arc level)
+        
+        Unlike summarize_episode there is no fallback text: the result is
+        stored and built on, so failures are raised to the caller.
+        """
+        scope, words = ROLLING_SUMMARY_SCOPES.get(level, ("part of the story", 150))
+        passage_text = "\n\n".join(passages)
+        previous_text = f"Summary so far:\n{previous}\n\n" if previous else ""
+        
+        prompt = f"""
+        Condense the following into a summary of {scope}.
+        
+        {previous_text}New material:
+        {passage_text}
+        
+        Write at most {words} words of plain prose. Fold the summary so far
+        (if any) and the new material into one account, oldest events first.
+        Keep names, places, items, open threads and promises; drop dialogue
+        and dice rolls.
+        """
+        
+        message = await self._create_message(
+            guild_id=guild_id,
+            lane=AIPriority.LOW,
+            model=self.config.model,
+            max_tokens=max(200, words * 2),
+            temperature=0.3,
+            system="You are a D&D campaign chronicler who keeps compact, faithful campaign records.",
+            messages=[{"role": "user", "content": prompt}]
+        )
+        self._record_usage(message.usage)
+        
+        return message.content[0].text.strip()
     
     async def analyze_player_intent(self, action_text: str) -> Dict[str, Any]:
         """Analyze what the player is trying to do"""
@@ -310,13 +511,20 @@ Always respond in character as the DM, providing engaging narrative responses to
         }}
         """
         
+        request = {
+            "model": self.config.model,
+            "max_tokens": 300,
+            "temperature": 0.3,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        
         try:
-            message = await self.client.messages.create(
-                model=self.config.model,
-                max_tokens=300,
-                temperature=0.3,
-                messages=[{"role": "user", "content": prompt}]
-            )
+            cached = await self._cached_payload("intent", request)
+            if cached:
+                return cached
+            
+            message = await self._create_message(lane=AIPriority.LOW, **request)
+            self._record_usage(message.usage)
             
             import json
             response_text = message.content[0].text.strip()
@@ -324,8 +532,12 @@ Always respond in character as the DM, providing engaging narrative responses to
             end = response_text.rfind('}') + 1
             json_text = response_text[start:end]
             
-            return json.loads(json_text)
-            
+            analysis = json.loads(json_text)
+            await self._cache_payload("intent", request, analysis, self.config.intent_cache_ttl)
+            return analysis
+        
+        except AIServiceBusyError:
+            raise
         except Exception as e:
             # Default analysis
             return {
@@ -339,12 +551,11 @@ Always respond in character as the DM, providing engaging narrative responses to
                 "error": str(e)
             }
     
-    def _build_dm_prompt(self, context: AIContext) -> str:
+    def _build_dm_prompt(self, context: AIContext, assembled: AssembledContext) -> str:
         """Build a comprehensive prompt for DM responses"""
         
         parts = [
-            f"Episode: {context.episode.name}",
-            f"Current Scene: {context.episode.interactions[-1].dm_response if context.episode.interactions else context.episode.opening_scene}"
+            f"Current Scene: {self._current_scene(context)}"
         ]
         
         if context.character:
@@ -354,9 +565,7 @@ Always respond in character as the DM, providing engaging narrative responses to
         if context.action_text:
             parts.append(f"Player Action: {context.action_text}")
         
-        if context.recent_memories:
-            parts.append("Recent Context:")
-            parts.append(self._format_recent_memories(context.recent_memories))
+        parts.append(assembled.render())
         
         parts.append("\nProvide an engaging DM response that:")
         parts.append("- Acknowledges the player's action")
@@ -366,16 +575,217 @@ Always respond in character as the DM, providing engaging narrative responses to
         
         return "\n".join(parts)
     
-    def _format_recent_memories(self, memories: List[Memory]) -> str:
-        """Format recent memories for AI context"""
-        if not memories:
-            return "No recent context available."
-        
-        formatted = []
-        for memory in memories[-5:]:  # Last 5 memories
-            if memory.character_name:
-                formatted.append(f"- {memory.character_name}: {memory.content[:150]}...")
+    def _build_action_prompt(self, context: AIContext, assembled: AssembledContext) -> str:
+        """Build the prompt for resolving a character action"""
+        
+        return f"""
+        Character Action Resolution:
+        
+        {assembled.render()}
+        
+        Current Scene: {self._current_scene(context)}
+        
+        Character: {context.character.name if context.character else "Unknown"}
+        Player Action: {context.action_text}
+        
+        Provide a detailed result of this action, including:
+        - Immediate consequences
+        - Any dice rolls needed (describe the roll and outcome)
+        - Environmental changes
+        - NPC reactions
+        - Next story beats
+        
+        Be descriptive and engaging while maintaining game balance.
+        """
+    
+    def _build_combat_prompt(self, context: AIContext, assembled: AssembledContext) -> str:
+        """Build the prompt for combat narration"""
+        
+        return f"""
+        Combat Narration:
+        
+        Character: {context.character.name if context.character else "Unknown"}
+        Combat Action: {context.action_text}
+        
+        {assembled.render()}
+        
+        Current Scene: {self._current_scene(context)}
+        
+        Provide exciting combat narration including:
+        - Vivid description of the action
+        - Environmental details
+        - Enemy reactions
+        - Tactical situation updates
+        - Dramatic tension
+        
+        Keep it fast-paced and engaging for D&D combat.
+        """
+    
+    def _build_round_prompt(self, context: AIContext, actions: List[RoundAction], assembled: AssembledContext) -> str:
+        """Build the prompt for resolving a round of simultaneous actions"""
+        
+        action_lines = "\n".join(
+            f"{index}. {action.character.name}: {action.action_text}"
+            for index, action in enumerate(actions, start=1)
+        )
+        
+        return f"""
+        Round Resolution (these actions happen at the same time):
+        
+        {assembled.render()}
+        
+        Current Scene: {self._current_scene(context)}
+        
+        Player Actions:
+        {action_lines}
+        
+        Narrate the round as one scene. Start with a short paragraph setting
+        the shared moment, then write one section per action, in order, each
+        starting with its number on a line of its own, like:
+        [[1]]
+        ...result of action 1...
+        [[2]]
+        ...result of action 2...
+        
+        Each section should describe the consequences, any dice rolls needed,
+        and how it interacts with the other actions. Keep sections concise.
+        """
+    
+    @staticmethod
+    def _split_round_sections(text: str, count: int) -> List[str]:
+        """Split a round narration into one reply per action (shared opening + own section)
+        
+        Falls back to the whole narration for any action whose section is missing.
+        """
+        parts = ROUND_SECTION_PATTERN.split(text)
+        preamble = parts[0].strip()
+        sections = {int(number): body.strip() for number, body in zip(parts[1::2], parts[2::2])}
+        
+        replies = []
+        for index in range(1, count + 1):
+            section = sections.get(index)
+            if not section:
+                replies.append(ROUND_SECTION_PATTERN.sub("", text).strip())
+            elif preamble:
+                replies.append(f"{preamble}\n\n{section}")
             else:
-                formatted.append(f"- {memory.content[:150]}...")
+                replies.append(section)
+        
+        return replies
+    
+    async def _cached_payload(self, call_type: str, request: Dict[str, Any]) -> Optional[Any]:
+        """Look up a cached response payload for a request"""
+        if not self.response_cache:
+            return None
+        return await self.response_cache.get(call_type, request)
+    
+    async def _cache_payload(self, call_type: str, request: Dict[str, Any], payload: Any, ttl: int) -> None:
+        """Cache a response payload (a TTL of 0 means the call type is not cached)"""
+        if self.response_cache and ttl > 0:
+            await self.response_cache.set(call_type, request, payload, ttl)
+    
+    async def _create_message(self, guild_id: Optional[str] = None, lane: AIPriority = AIPriority.NORMAL, **kwargs):
+        """Send a messages.create request through the request scheduler in a priority lane"""
+        return await self.scheduler.run(lambda: self.client.messages.create(**kwargs), guild_id, lane)
+    
+    def _system_blocks(self) -> List[Dict[str, Any]]:
+        """System prompt block, with its own cache breakpoint only if long enough to be cached"""
+        block = {"type": "text", "text": self.system_prompt}
+        if self._cacheable(self.system_prompt):
+            block["cache_control"] = {"type": "ephemeral"}
+        return [block]
+    
+    def _build_messages(self, context: AIContext, prompt: str) -> List[Dict[str, Any]]:
+        """Build the user turn as a stable block followed by the volatile prompt
+        
+        The stable block only changes when the episode or party does. A
+        breakpoint after it caches the system prompt and the block together,
+        but only once that prefix reaches the API's minimum cacheable length;
+        shorter prefixes are never cached, so marking them would gain nothing.
+        """
+        stable_text = self._build_campaign_context(context)
+        stable = {"type": "text", "text": stable_text}
+        if self._cacheable(self.system_prompt, stable_text):
+            stable["cache_control"] = {"type": "ephemeral"}
+        
+        return [{
+            "role": "user",
+            "content": [stable, {"type": "text", "text": prompt}]
+        }]
+    
+    def _cacheable(self, *prefix: str) -> bool:
+        """Whether prompt caching is on and a prefix is long enough for the API to cache"""
+        if not self.config.prompt_caching:
+            return False
+        return sum(estimate_tokens(part) for part in prefix) >= self.config.prompt_cache_min_tokens
+    
+    def _build_campaign_context(self, context: AIContext) -> str:
+        """Build the stable campaign header: episode and the party's character sheets
         
-        return "\n".join(formatted)
\ No newline at end of file
+        Must be deterministic for a given episode and party; anything that
+        changes per action (HP, scene, memories) belongs in the prompt.
+        """
+        episode = context.episode
+        parts = [
+            "Campaign Context:",
+            f"Episode {episode.episode_number}: {episode.name}"
+        ]
+        
+        if episode.opening_scene:
+            parts.append(f"Opening Scene: {episode.opening_scene}")
+        
+        if context.party:
+            parts.append("Party Character Sheets:")
+            for member in sorted(context.party, key=lambda character: character.name):
+                parts.append(self._character_sheet(member))
+        
+        return "\n".join(parts)
+    
+    @staticmethod
+    def _character_sheet(character: Character) -> str:
+        """A character's sheet without the parts that change during play (HP)"""
+        scores = character.ability_scores
+        lines = [
+            f"- {character.name} (Level {character.level} {character.race.value} "
+            f"{character.character_class.value}, played by {character.player_name})",
+            f"  Abilities: STR {scores.strength}, DEX {scores.dexterity}, CON {scores.constitution}, "
+            f"INT {scores.intelligence}, WIS {scores.wisdom}, CHA {scores.charisma}"
+        ]
+        if character.background:
+            lines.append(f"  Background: {character.background}")
+        for label, values in (("Personality", character.personality_traits),
+                              ("Affiliations", character.affiliations),
+                              ("Equipment", character.equipment),
+                              ("Spells", character.spells)):
+            if values:
+                lines.append(f"  {label}: {', '.join(values)}")
+        return "\n".join(lines)
+    
+    def _current_scene(self, context: AIContext) -> str:
+        """Most recent DM narration, or the opening scene"""
+        if context.episode.interactions:
+            return context.episode.interactions[-1].dm_response
+        return context.episode.opening_scene
+    
+    def _record_usage(self, usage) -> Dict[str, int]:
+        """Accumulate token usage (including prompt cache reads/writes) and return it as metadata"""
+        counts = {
+            "input_tokens": usage.input_tokens or 0,
+            "output_tokens": usage.output_tokens or 0,
+            "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", None) or 0,
+            "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", None) or 0,
+        }
+        
+        for name, value in counts.items():
+            self.usage_totals[name] += value
+        self.usage_totals["requests"] += 1
+        
+        return counts
+    
+    def get_usage_stats(self) -> Dict[str, Any]:
+        """Get cumulative token usage and prompt cache hit ratio"""
+        stats = dict(self.usage_totals)
+        cached = stats["cache_read_input_tokens"]
+        total_input = stats["input_tokens"] + stats["cache_creation_input_tokens"] + cached
+        stats["cache_read_ratio"] = round(cached / total_input, 3) if total_input else 0.0
+        return stats
@@ -0,0 +1,212 @@
+"""
+Token-budgeted prompt context assembly
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from ...domain.entities import Memory
+from ...domain.interfaces.ai_service import AIContext
+
+# Section headings, in the order they are rendered
+SECTION_TITLES = {
+    "summary": "Story So Far:",
+    "party": "Party Status:",
+    "memory": "Relevant Memories:",
+    "interaction": "Recent Events:",
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast local token estimate (about four characters per token for English prose)"""
+    return (len(text) + 3) // 4 if text else 0
+
+
+@dataclass
+class ContextItem:
+    """A candidate piece of prompt context"""
+    kind: str  # summary, party, memory, interaction
+    text: str
+    score: float
+    order: float = 0.0  # Chronological sort key within a section
+    tokens: int = field(init=False)
+    
+    def __post_init__(self):
+        self.tokens = estimate_tokens(self.text)
+
+
+@dataclass
+class AssembledContext:
+    """Context items chosen for a prompt, plus a report of what made the cut"""
+    items: List[ContextItem]
+    budget: int
+    candidates: int
+    
+    @property
+    def tokens(self) -> int:
+        return sum(item.tokens for item in self.items)
+    
+    def render(self) -> str:
+        """Render the chosen items by section, oldest first within each"""
+        parts = []
+        for kind, title in SECTION_TITLES.items():
+            section = sorted((item for item in self.items if item.kind == kind), key=lambda item: item.order)
+            if section:
+                parts.append(title)
+                parts.extend(item.text for item in section)
+        
+        return "\n".join(parts) if parts else "No earlier context available."
+    
+    def report(self) -> Dict[str, Any]:
+        """Summary of the assembled context for AIResponse.metadata"""
+        included = {kind: 0 for kind in SECTION_TITLES}
+        for item in self.items:
+            included[item.kind] += 1
+        
+        return {
+            "budget_tokens": self.budget,
+            "used_tokens": self.tokens,
+            "candidates": self.candidates,
+            "dropped": self.candidates - len(self.items),
+            "included": included,
+        }
+
+
+class ContextAssembler:
+    """Ranks candidate context and packs the best of it into a token budget
+    
+    Candidates are the rolling campaign summaries, party state, recent episode
+    interactions and memories (recent ones plus full-text matches for the
+    action). Memories score on recency, importance, whether they involve the
+    acting character and whether they matched the action; the highest
+    scoring items are packed greedily until the budget is spent.
+    """
+    
+    # Rolling summaries: the broad ones are the cheapest way to keep the whole story
+    SUMMARY_SCORES = {"arc": 1.8, "episode": 1.6, "scene": 1.5}
+    
+    # Score weights
+    RECENCY_WEIGHT = 1.0
+    IMPORTANCE_WEIGHT = 0.8
+    CHARACTER_WEIGHT = 0.6
+    MATCH_WEIGHT = 1.2
+    
+    def __init__(self,
+                 token_budget: int = 1200,
+                 max_item_chars: int = 300,
+                 recency_half_life_hours: float = 6.0,
+                 max_interactions: int = 8):
+        self.token_budget = token_budget
+        self.max_item_chars = max_item_chars
+        self.recency_half_life_hours = recency_half_life_hours
+        self.max_interactions = max_interactions
+    
+    def assemble(self, context: AIContext) -> AssembledContext:
+        """Choose the context for one prompt"""
+        candidates = self._candidates(context)
+        
+        chosen = []
+        remaining = self.token_budget
+        for item in sorted(candidates, key=lambda item: item.score, reverse=True):
+            # Keep going after a miss; a smaller item may still fit
+            if item.tokens <= remaining:
+                chosen.append(item)
+                remaining -= item.tokens
+        
+        return AssembledContext(items=chosen, budget=self.token_budget, candidates=len(candidates))
+    
+    def _candidates(self, context: AIContext) -> List[ContextItem]:
+        """Build and score every candidate item"""
+        actor = context.character.name if context.character else None
+        items = []
+        
+        if context.episode.summary:
+            items.append(ContextItem("summary", self._clip(context.episode.summary, self.max_item_chars * 2), score=1.5))
+        
+        for position, summary in enumerate(context.summaries):
+            level = summary.metadata.get("level", "scene")
+            items.append(ContextItem(
+                "summary",
+                self._clip(summary.content, self.max_item_chars * 3),
+                score=self.SUMMARY_SCORES.get(level, 1.5) + 0.01 * position,  # Later scenes first
+                order=position + 1
+            ))
+        
+        for member in context.party:
+            is_actor = member.name == actor
+            items.append(ContextItem(
+                "party",
+                f"- {member.name}: {member.current_hp}/{member.max_hp} HP ({member.get_health_status()})",
+                score=2.0 if is_actor else 0.7,
+                order=0 if is_actor else 1
+            ))
+        
+        # The latest interaction is already the prompt's current scene
+        interactions = context.episode.interactions[:-1][-self.max_interactions:]
+        seen_contents = set()
+        for position, interaction in enumerate(interactions):
+            distance = len(interactions) - position
+            content = f"{interaction.character_name}: {interaction.player_action}\nDM: {interaction.dm_response}"
+            seen_contents.add(content)
+            involves_actor = actor is not None and interaction.character_name == actor
+            items.append(ContextItem(
+                "interaction",
+                f"- {self._clip(content, self.max_item_chars)}",
+                score=1.5 * 0.75 ** distance + (self.CHARACTER_WEIGHT if involves_actor else 0.0),
+                order=position
+            ))
+        
+        for memory, match_score in self._memory_candidates(context):
+            # Interaction memories repeat the episode log above; summary rows
+            # only count through context.summaries (older ones are superseded)
+            if memory.content in seen_contents or memory.memory_type == "summary":
+                continue
+            items.append(ContextItem(
+                "memory",
+                f"- {self._clip(memory.content, self.max_item_chars)}",
+                score=self._memory_score(memory, actor, match_score),
+                order=memory.timestamp.timestamp()
+            ))
+        
+        return items
+    
+    def _memory_candidates(self, context: AIContext) -> List[Tuple[Memory, float]]:
+        """Recent and matching memories, deduplicated, with a match score (1.0 = best match)"""
+        candidates: Dict[Tuple[str, str], Tuple[Memory, float]] = {}
+        
+        matches = context.relevant_memories
+        for rank, memory in enumerate(matches):
+            candidates[self._memory_key(memory)] = (memory, 1.0 - rank / len(matches))
+        
+        # Order does not matter here; get_recent_memories returns newest first
+        for memory in context.recent_memories:
+            candidates.setdefault(self._memory_key(memory), (memory, 0.0))
+        
+        return list(candidates.values())
+    
+    def _memory_score(self, memory: Memory, actor: Optional[str], match_score: float) -> float:
+        """Score a memory on recency, importance, character relevance and action match"""
+        age_hours = max(0.0, (datetime.now() - memory.timestamp).total_seconds() / 3600)
+        recency = 0.5 ** (age_hours / self.recency_half_life_hours)
+        importance = (memory.importance - 1) / 4
+        involves_actor = actor is not None and memory.contains_character(actor)
+        
+        return (
+            self.RECENCY_WEIGHT * recency
+            + self.IMPORTANCE_WEIGHT * importance
+            + (self.CHARACTER_WEIGHT if involves_actor else 0.0)
+            + self.MATCH_WEIGHT * match_score
+        )
+    
+    @staticmethod
+    def _memory_key(memory: Memory) -> Tuple[str, str]:
+        """Identity of a memory (entities carry no row id)"""
+        return (memory.timestamp.isoformat(), memory.content)
+    
+    @staticmethod
+    def _clip(text: str, limit: int) -> str:
+        """Trim text to a character limit on a word boundary"""
+        text = " ".join(text.split())
+        if len(text) <= limit:
+            return text
+        return text[:limit].rsplit(" ", 1)[0] + "..."
@@ -0,0 +1,260 @@
+"""
+Per-guild fair scheduling of AI requests with priority lanes
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+from ...domain.interfaces.ai_service import AIPriority, AIServiceBusyError
+
+logger = logging.getLogger(__name__)
+
+# Share of dispatches each lane gets when several lanes have work queued
+LANE_WEIGHTS = {
+    AIPriority.HIGH: 4,
+    AIPriority.NORMAL: 2,
+    AIPriority.LOW: 1,
+}
+
+# Queue key for requests that are not tied to a guild
+GLOBAL_QUEUE = "global"
+
+BUSY_MESSAGE = "🕰️ The DM is busy with other adventurers right now. Please try again in a moment!"
+
+
+@dataclass
+class _Ticket:
+    """A queued request waiting for an in-flight slot"""
+    guild_id: str
+    lane: AIPriority
+    granted: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class FairAIScheduler:
+    """Admits AI requests fairly across guilds
+    
+    Requests queue per lane and per guild. When a slot frees up, a lane is
+    chosen by smooth weighted round-robin over the lanes that have work
+    (so low-priority work still progresses), then a guild within that lane
+    by weighted round-robin, so one busy guild cannot starve the others.
+    A guild already holding `max_in_flight_per_guild` slots is passed over
+    until one frees up, so its backlog never occupies slots other guilds
+    could use. Queues are depth-limited; requests beyond the limit are shed
+    with AIServiceBusyError. High-priority requests are only shed by the
+    global limit, never because a guild's natural chatter filled its queue.
+    """
+    
+    def __init__(self,
+                 max_in_flight: int = 4,
+                 max_queue_per_guild: int = 10,
+                 max_queue_total: int = 100,
+                 max_in_flight_per_guild: Optional[int] = None):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queue_per_guild = max_queue_per_guild
+        self.max_queue_total = max_queue_total
+        self.max_in_flight_per_guild = max(1, max_in_flight_per_guild) if max_in_flight_per_guild else None
+        self.in_flight = 0
+        self._in_flight_by_guild: Dict[str, int] = {}
+        
+        self._queues: Dict[AIPriority, Dict[str, Deque[_Ticket]]] = {lane: {} for lane in AIPriority}
+        self._rotation: Dict[AIPriority, Deque[str]] = {lane: deque() for lane in AIPriority}
+        self._credits: Dict[AIPriority, Dict[str, int]] = {lane: {} for lane in AIPriority}
+        self._lane_current: Dict[AIPriority, int] = {lane: 0 for lane in AIPriority}
+        self._guild_weights: Dict[str, int] = {}
+        self._queued_by_guild: Dict[str, int] = {}
+        self._queued_total = 0
+        
+        self._lane_stats = {
+            lane: {"enqueued": 0, "dispatched": 0, "shed": 0, "wait_total": 0.0, "wait_max": 0.0}
+            for lane in AIPriority
+        }
+    
+    def set_guild_weight(self, guild_id: str, weight: int) -> None:
+        """Give a guild more (or fewer) consecutive dispatches per round"""
+        self._guild_weights[guild_id] = max(1, weight)
+    
+    @asynccontextmanager
+    async def slot(self, guild_id: Optional[str], lane: AIPriority) -> AsyncIterator[None]:
+        """Wait for this request's turn and hold an in-flight slot"""
+        guild_id = guild_id or GLOBAL_QUEUE
+        ticket = self._enqueue(guild_id, lane)
+        
+        try:
+            await ticket.granted
+        except asyncio.CancelledError:
+            if ticket.granted.done() and not ticket.granted.cancelled():
+                # Granted just as the caller gave up; hand the slot on
+                self._release(guild_id)
+            else:
+                self._withdraw(ticket)
+            raise
+        
+        try:
+            yield
+        finally:
+            self._release(guild_id)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth and wait-time metrics"""
+        lanes = {}
+        for lane, data in self._lane_stats.items():
+            dispatched = data["dispatched"]
+            lanes[lane.value] = {
+                "queued": sum(len(queue) for queue in self._queues[lane].values()),
+                "enqueued": data["enqueued"],
+                "dispatched": dispatched,
+                "shed": data["shed"],
+                "avg_wait_ms": round(data["wait_total"] / dispatched * 1000, 3) if dispatched else 0.0,
+                "max_wait_ms": round(data["wait_max"] * 1000, 3),
+            }
+        
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "in_flight_by_guild": {guild: count for guild, count in self._in_flight_by_guild.items() if count},
+            "queued": self._queued_total,
+            "queued_by_guild": {guild: count for guild, count in self._queued_by_guild.items() if count},
+            "lanes": lanes,
+        }
+    
+    def _enqueue(self, guild_id: str, lane: AIPriority) -> _Ticket:
+        """Queue a ticket, shedding it if queue limits are exceeded"""
+        guild_depth = self._queued_by_guild.get(guild_id, 0)
+        over_guild_limit = lane != AIPriority.HIGH and guild_depth >= self.max_queue_per_guild
+        
+        # Only shed when the request would actually have to wait
+        must_wait = self.in_flight >= self.max_in_flight or not self._has_capacity(guild_id)
+        if must_wait and (over_guild_limit or self._queued_total >= self.max_queue_total):
+            self._lane_stats[lane]["shed"] += 1
+            logger.warning(f"⚠️ Shedding {lane.value} AI request for guild {guild_id} (queued: {guild_depth})")
+            raise AIServiceBusyError(BUSY_MESSAGE)
+        
+        ticket = _Ticket(guild_id, lane, asyncio.get_running_loop().create_future())
+        
+        queues = self._queues[lane]
+        if guild_id not in queues:
+            queues[guild_id] = deque()
+            self._rotation[lane].append(guild_id)
+        queues[guild_id].append(ticket)
+        
+        self._queued_by_guild[guild_id] = guild_depth + 1
+        self._queued_total += 1
+        self._lane_stats[lane]["enqueued"] += 1
+        
+        self._dispatch()
+        return ticket
+    
+    def _withdraw(self, ticket: _Ticket) -> None:
+        """Remove a ticket whose caller gave up while it was still queued"""
+        ticket.granted.cancel()
+        
+        queue = self._queues[ticket.lane].get(ticket.guild_id)
+        if queue is None or ticket not in queue:
+            return
+        
+        queue.remove(ticket)
+        self._queued_total -= 1
+        self._queued_by_guild[ticket.guild_id] -= 1
+        
+        if not queue:
+            del self._queues[ticket.lane][ticket.guild_id]
+            self._rotation[ticket.lane].remove(ticket.guild_id)
+            self._credits[ticket.lane].pop(ticket.guild_id, None)
+    
+    def _release(self, guild_id: str) -> None:
+        """Free an in-flight slot and admit the next request"""
+        self.in_flight -= 1
+        self._in_flight_by_guild[guild_id] -= 1
+        if not self._in_flight_by_guild[guild_id]:
+            del self._in_flight_by_guild[guild_id]
+        self._dispatch()
+    
+    def _has_capacity(self, guild_id: str) -> bool:
+        """Whether a guild may take another slot (requests without a guild are never capped)"""
+        if self.max_in_flight_per_guild is None or guild_id == GLOBAL_QUEUE:
+            return True
+        return self._in_flight_by_guild.get(guild_id, 0) < self.max_in_flight_per_guild
+    
+    def _dispatch(self) -> None:
+        """Grant slots to queued tickets while capacity remains"""
+        while self.in_flight < self.max_in_flight:
+            ticket = self._next_ticket()
+            if ticket is None:
+                return
+            
+            if ticket.granted.done():
+                # Its caller was cancelled but has not withdrawn yet; already off the queue
+                continue
+            
+            wait = time.monotonic() - ticket.enqueued_at
+            stats = self._lane_stats[ticket.lane]
+            stats["dispatched"] += 1
+            stats["wait_total"] += wait
+            stats["wait_max"] = max(stats["wait_max"], wait)
+            
+            self.in_flight += 1
+            self._in_flight_by_guild[ticket.guild_id] = self._in_flight_by_guild.get(ticket.guild_id, 0) + 1
+            ticket.granted.set_result(None)
+    
+    def _next_ticket(self) -> Optional[_Ticket]:
+        """Pop the next ticket: weighted lane choice, then weighted round-robin over guilds
+        
+        The ticket is always taken off the queue and out of the counts, even
+        when its caller was cancelled and it must not be granted.
+        """
+        lane = self._next_lane()
+        if lane is None:
+            return None
+        
+        queues = self._queues[lane]
+        rotation = self._rotation[lane]
+        credits = self._credits[lane]
+        
+        # Guilds at their in-flight cap give up their turn
+        while not self._has_capacity(rotation[0]):
+            credits.pop(rotation[0], None)
+            rotation.rotate(-1)
+        
+        guild_id = rotation[0]
+        if guild_id not in credits:
+            credits[guild_id] = self._guild_weights.get(guild_id, 1)
+        
+        ticket = queues[guild_id].popleft()
+        if not ticket.granted.done():
+            credits[guild_id] -= 1  # A cancelled ticket does not use up the guild's turn
+        self._queued_total -= 1
+        self._queued_by_guild[guild_id] -= 1
+        
+        # Move on once the guild used its turn or has nothing left
+        if not queues[guild_id]:
+            rotation.popleft()
+            del queues[guild_id]
+            credits.pop(guild_id, None)
+        elif credits[guild_id] <= 0:
+            rotation.rotate(-1)
+            del credits[guild_id]
+        
+        return ticket
+    
+    def _next_lane(self) -> Optional[AIPriority]:
+        """Smooth weighted round-robin over lanes that have a ticket that may be granted"""
+        active: List[AIPriority] = [
+            lane for lane in AIPriority
+            if any(self._has_capacity(guild_id) for guild_id in self._rotation[lane])
+        ]
+        if not active:
+            return None
+        
+        total = 0
+        for lane in active:
+            self._lane_current[lane] += LANE_WEIGHTS[lane]
+            total += LANE_WEIGHTS[lane]
+        
+        chosen = max(active, key=lambda lane: self._lane_current[lane])
+        self._lane_current[chosen] -= total
+        return chosen
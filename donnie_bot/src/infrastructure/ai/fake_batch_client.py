@@ -0,0 +1,68 @@
+"""
+In-process stand-in for the Message Batches API
+"""
+import itertools
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set
+
+
+class FakeMessageBatches:
+    """Mimics `client.messages.batches` (create/retrieve/results) without network access
+    
+    Each batch reports `in_progress` until it has been retrieved
+    `polls_until_ended` times, then `ended`. Results are produced by
+    `respond(params) -> str`; custom ids listed in `fail_custom_ids`
+    come back as errored.
+    """
+    
+    def __init__(self,
+                 respond: Optional[Callable[[Dict[str, Any]], str]] = None,
+                 polls_until_ended: int = 1,
+                 fail_custom_ids: Optional[Set[str]] = None):
+        self.respond = respond or (lambda params: "A summary of the episode.")
+        self.polls_until_ended = polls_until_ended
+        self.fail_custom_ids = fail_custom_ids or set()
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+    
+    async def create(self, *, requests: List[Dict[str, Any]]) -> SimpleNamespace:
+        """Accept a batch of requests"""
+        batch_id = f"msgbatch_fake_{next(self._ids)}"
+        self.batches[batch_id] = {"requests": list(requests), "polls": 0}
+        return SimpleNamespace(id=batch_id, processing_status="in_progress")
+    
+    async def retrieve(self, batch_id: str) -> SimpleNamespace:
+        """Report a batch's processing status"""
+        batch = self.batches[batch_id]
+        batch["polls"] += 1
+        status = "ended" if batch["polls"] >= self.polls_until_ended else "in_progress"
+        return SimpleNamespace(id=batch_id, processing_status=status)
+    
+    async def results(self, batch_id: str) -> AsyncIterator[SimpleNamespace]:
+        """Stream per-request results of an ended batch"""
+        return self._iter_results(self.batches[batch_id]["requests"])
+    
+    async def _iter_results(self, requests: List[Dict[str, Any]]) -> AsyncIterator[SimpleNamespace]:
+        """Yield one result entry per request"""
+        for request in requests:
+            custom_id = request["custom_id"]
+            if custom_id in self.fail_custom_ids:
+                result = SimpleNamespace(
+                    type="errored",
+                    error=SimpleNamespace(type="api_error", message="Simulated failure")
+                )
+            else:
+                message = SimpleNamespace(
+                    content=[SimpleNamespace(type="text", text=self.respond(request["params"]))],
+                    usage=SimpleNamespace(input_tokens=0, output_tokens=0)
+                )
+                result = SimpleNamespace(type="succeeded", message=message)
+            
+            yield SimpleNamespace(custom_id=custom_id, result=result)
+
+
+class FakeBatchClient:
+    """Client exposing only `messages.batches`, for BatchSummarizer tests and offline runs"""
+    
+    def __init__(self, **kwargs):
+        self.messages = SimpleNamespace(batches=FakeMessageBatches(**kwargs))
@@ -0,0 +1,273 @@
+"""
+Concurrency, rate limiting and retry policy for AI API calls
+"""
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+
+import anthropic
+
+from ...domain.interfaces.ai_service import AIPriority, AIServiceBusyError
+from ..config.settings import AIConfig
+from .fair_scheduler import FairAIScheduler
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying: timeout, conflict, rate limit, overloaded/server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker is open and calls fail fast"""
+
+
+class TokenBucket:
+    """Token bucket rate limiter (tokens refill continuously at `rate` per second)"""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+    
+    async def acquire(self) -> float:
+        """Take one token, waiting for a refill if needed. Returns seconds waited."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                
+                delay = (1 - self.tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+    
+    def _refill(self) -> None:
+        """Add tokens for the time elapsed since the last refill"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker
+    
+    closed -> open after `failure_threshold` consecutive failures; open fails
+    fast for `reset_timeout` seconds, then half_open lets a single trial call
+    through, which either closes the circuit or re-opens it.
+    """
+    
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._trial_in_flight = False
+    
+    def before_call(self) -> bool:
+        """Raise CircuitOpenError if calls should fail fast. Returns True for the half-open trial call."""
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                raise CircuitOpenError("AI service temporarily unavailable, please try again shortly")
+            self.state = "half_open"
+            self._trial_in_flight = False
+        
+        if self.state == "half_open":
+            if self._trial_in_flight:
+                raise CircuitOpenError("AI service is recovering, please try again shortly")
+            self._trial_in_flight = True
+            return True
+        
+        return False
+    
+    def abandon_trial(self) -> None:
+        """Let another call be the trial when this one ends without an outcome"""
+        if self.state == "half_open":
+            self._trial_in_flight = False
+    
+    def record_success(self) -> None:
+        """Close the circuit after a successful call"""
+        if self.state != "closed":
+            logger.info("✅ AI circuit breaker closed")
+        self.state = "closed"
+        self.failures = 0
+        self._trial_in_flight = False
+    
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold"""
+        self.failures += 1
+        self._trial_in_flight = False
+        
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+                logger.warning(f"⚠️ AI circuit breaker opened after {self.failures} consecutive failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+class AIRequestScheduler:
+    """Admission control for AI requests
+    
+    Every attempt takes a rate-limit token, then an in-flight slot from the
+    FairAIScheduler (the single place global and per-guild concurrency is
+    enforced), and runs under a real timeout. Transient errors are retried
+    with exponential backoff and full jitter (honouring retry-after); the
+    backoff sleep happens after the slot is released. A circuit breaker
+    stops calls for a while once the API keeps failing.
+    """
+    
+    def __init__(self, config: AIConfig):
+        self.config = config
+        self.admission = FairAIScheduler(
+            max_in_flight=config.max_concurrent_requests,
+            max_queue_per_guild=config.max_queue_per_guild,
+            max_queue_total=config.max_queue_total,
+            max_in_flight_per_guild=config.max_concurrent_per_guild
+        )
+        self.bucket = TokenBucket(config.requests_per_minute / 60.0, config.rate_limit_burst)
+        self.breaker = CircuitBreaker(config.circuit_breaker_threshold, config.circuit_breaker_reset_seconds)
+        
+        self._stats = {
+            "attempts": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "retries": 0,
+            "timeouts": 0,
+            "rejected_open_circuit": 0,
+            "rate_limit_wait_total": 0.0,
+        }
+    
+    @asynccontextmanager
+    async def slot(self, guild_id: Optional[str] = None, lane: AIPriority = AIPriority.NORMAL) -> AsyncIterator[None]:
+        """Take a rate-limit token, then hold a fair in-flight slot in the given lane
+        
+        The token is taken first so a slot is only held while a request is
+        actually being sent.
+        """
+        try:
+            trial = self.breaker.before_call()
+        except CircuitOpenError:
+            self._stats["rejected_open_circuit"] += 1
+            raise
+        
+        called = False
+        try:
+            self._stats["rate_limit_wait_total"] += await self.bucket.acquire()
+            async with self.admission.slot(guild_id, lane):
+                called = True
+                yield
+        except BaseException as e:
+            # Callers record an outcome for errors the call raised; a call that never
+            # ran (e.g. shed as busy), was cancelled or was abandoned mid-stream records none
+            if trial and (not called or not isinstance(e, Exception)):
+                self.breaker.abandon_trial()
+            raise
+    
+    async def run(self,
+                  call: Callable[[], Awaitable[T]],
+                  guild_id: Optional[str] = None,
+                  lane: AIPriority = AIPriority.NORMAL) -> T:
+        """Run an API call with admission control, timeout and retries"""
+        attempt = 0
+        while True:
+            self._stats["attempts"] += 1
+            try:
+                async with self.slot(guild_id, lane):
+                    result = await asyncio.wait_for(call(), timeout=self.config.timeout_seconds)
+            except (CircuitOpenError, AIServiceBusyError):
+                raise
+            except Exception as e:
+                delay = self.on_failure(e, attempt)
+                if delay is None:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            
+            self.on_success()
+            return result
+    
+    def on_success(self) -> None:
+        """Record a successful call"""
+        self._stats["succeeded"] += 1
+        self.breaker.record_success()
+    
+    def on_failure(self, error: Exception, attempt: int) -> Optional[float]:
+        """Record a failed call; returns the backoff delay, or None to give up"""
+        if isinstance(error, asyncio.TimeoutError):
+            self._stats["timeouts"] += 1
+        
+        retryable = self.is_retryable(error)
+        if retryable:
+            # Only transient/server-side errors say anything about API health
+            self.breaker.record_failure()
+        else:
+            # The API answered (e.g. a 400), so it is reachable
+            self.breaker.record_success()
+        
+        if not retryable or attempt >= self.config.max_retries or self.breaker.state == "open":
+            self._stats["failed"] += 1
+            return None
+        
+        self._stats["retries"] += 1
+        delay = self.backoff_delay(error, attempt)
+        logger.warning(f"AI request failed ({type(error).__name__}), retrying in {delay:.2f}s (attempt {attempt + 1})")
+        return delay
+    
+    def backoff_delay(self, error: Exception, attempt: int) -> float:
+        """Exponential backoff with full jitter; retry-after from the server wins"""
+        retry_after = self._retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.config.retry_max_delay_seconds)
+        
+        ceiling = min(self.config.retry_max_delay_seconds, self.config.retry_base_delay_seconds * (2 ** attempt))
+        return random.uniform(0, ceiling)
+    
+    @staticmethod
+    def is_retryable(error: Exception) -> bool:
+        """Check if an error is transient (timeouts, connection errors, 408/409/429/5xx)"""
+        if isinstance(error, (asyncio.TimeoutError, anthropic.APIConnectionError)):
+            return True
+        
+        if isinstance(error, anthropic.APIStatusError):
+            return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+        
+        return False
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduler statistics"""
+        stats = dict(self._stats)
+        stats["rate_limit_wait_total"] = round(stats["rate_limit_wait_total"], 3)
+        stats["circuit_state"] = self.breaker.state
+        stats["circuit_times_opened"] = self.breaker.times_opened
+        return stats
+    
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        """Read a retry-after header (seconds) from an API error, if present"""
+        response = getattr(error, "response", None)
+        if response is None:
+            return None
+        
+        value = response.headers.get("retry-after")
+        if value is None:
+            return None
+        
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return None
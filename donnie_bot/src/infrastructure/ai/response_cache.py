@@ -0,0 +1,97 @@
+"""
+Persistent cache for repeatable AI responses
+"""
+import copy
+import hashlib
+import json
+import logging
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from ...domain.interfaces.cache_service import CacheServiceInterface
+from ..cache.memory_cache import CacheKeys
+from ..database.sqlite_repository import SQLiteAIResponseCacheRepository
+
+logger = logging.getLogger(__name__)
+
+
+class AIResponseCache:
+    """Two-level (memory, then SQLite) cache of AI responses
+    
+    Keys are a digest of the call type and the complete request: model,
+    system prompt, prompt text (scene, memories, ...) and sampling
+    parameters. Any change to the inputs is a different key, so entries
+    never go stale; they only expire. Callers decide per call type whether
+    a response is repeatable enough to cache by passing a TTL.
+    """
+    
+    def __init__(self,
+                 store: SQLiteAIResponseCacheRepository,
+                 memory_cache: Optional[CacheServiceInterface] = None):
+        self.store = store
+        self.memory_cache = memory_cache
+        self._stats: Dict[str, Dict[str, int]] = {}
+    
+    @staticmethod
+    def make_key(call_type: str, request: Dict[str, Any]) -> str:
+        """Digest a request into a cache key"""
+        canonical = json.dumps({"type": call_type, "request": request}, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+    
+    async def get(self, call_type: str, request: Dict[str, Any]) -> Optional[Any]:
+        """Get a cached payload for a request"""
+        key = self.make_key(call_type, request)
+        memory_key = CacheKeys.ai_response(key)
+        
+        payload = await self.memory_cache.get(memory_key) if self.memory_cache else None
+        if payload is None:
+            try:
+                payload = await self.store.get(key)
+            except Exception as e:
+                logger.warning(f"⚠️ AI response cache read failed: {e}")
+                payload = None
+            
+            if payload is not None and self.memory_cache:
+                await self.memory_cache.set(memory_key, payload)
+        
+        self._count(call_type, "hits" if payload is not None else "misses")
+        # Callers build entities from payloads; don't let them mutate the memory copy
+        return copy.deepcopy(payload)
+    
+    async def set(self, call_type: str, request: Dict[str, Any], payload: Any, ttl: int) -> None:
+        """Cache a JSON-serializable payload for `ttl` seconds"""
+        if ttl <= 0:
+            return
+        
+        key = self.make_key(call_type, request)
+        
+        try:
+            await self.store.set(key, call_type, str(request.get("model", "")), payload, ttl)
+        except Exception as e:
+            logger.warning(f"⚠️ AI response cache write failed: {e}")
+            return
+        
+        if self.memory_cache:
+            await self.memory_cache.set(CacheKeys.ai_response(key), copy.deepcopy(payload), timedelta(seconds=ttl))
+        
+        self._count(call_type, "stores")
+    
+    async def invalidate(self, call_type: Optional[str] = None) -> int:
+        """Drop cached responses of one call type (or all of them)"""
+        deleted = await self.store.delete_by_type(call_type)
+        if self.memory_cache:
+            await self.memory_cache.delete_prefix(CacheKeys.ai_response(""))
+        return deleted
+    
+    async def purge_expired(self) -> int:
+        """Delete expired responses from the persistent store"""
+        return await self.store.purge_expired()
+    
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get hit/miss/store counts per call type"""
+        return {call_type: dict(counts) for call_type, counts in self._stats.items()}
+    
+    def _count(self, call_type: str, event: str) -> None:
+        """Increment a per-call-type counter"""
+        counts = self._stats.setdefault(call_type, {"hits": 0, "misses": 0, "stores": 0})
+        counts[event] += 1
@@ -2,8 +2,16 @@
 Cache service infrastructure
 """
 from .memory_cache import MemoryCacheService, CacheKeys
+from .cached_repositories import (
+    CachedCharacterRepository,
+    CachedEpisodeRepository,
+    CachedMemoryRepository
+)
 
 __all__ = [
     "MemoryCacheService",
-    "CacheKeys"
+    "CacheKeys",
+    "CachedCharacterRepository",
+    "CachedEpisodeRepository",
+    "CachedMemoryRepository"
 ]
\ No newline at end of file
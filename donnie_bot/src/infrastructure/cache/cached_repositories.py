@@ -0,0 +1,223 @@
+"""
+Caching repository decorators
+"""
+import logging
+from datetime import datetime
+from typing import List, Optional
+
+from ...domain.entities.character import Character
+from ...domain.entities.episode import Episode, SessionInteraction
+from ...domain.entities.memory import Memory
+from ...domain.interfaces.cache_service import CacheServiceInterface
+from ...domain.interfaces.repositories import (
+    CharacterRepositoryInterface, EpisodeRepositoryInterface, MemoryRepositoryInterface
+)
+from .memory_cache import CacheKeys
+
+logger = logging.getLogger(__name__)
+
+
+class CachedCharacterRepository(CharacterRepositoryInterface):
+    """Character repository decorator with read-through and write-through caching
+    
+    Owns the `character:*` and `party:*` keys, so every caller of the
+    character repository shares the same cached view.
+    """
+    
+    def __init__(self, inner: CharacterRepositoryInterface, cache: CacheServiceInterface):
+        self.inner = inner
+        self.cache = cache
+    
+    async def get_character(self, user_id: str, guild_id: str) -> Optional[Character]:
+        """Get character by user and guild ID"""
+        return await self.cache.get_or_load(
+            CacheKeys.character(user_id, guild_id),
+            lambda: self.inner.get_character(user_id, guild_id)
+        )
+    
+    async def save_character(self, character: Character) -> None:
+        """Save a character and refresh its cache entry"""
+        key = CacheKeys.character(character.discord_user_id, character.guild_id)
+        
+        try:
+            await self.inner.save_character(character)
+        except Exception:
+            # The cached instance may hold changes that never reached the database
+            await self.cache.delete(key)
+            raise
+        
+        await self.cache.set(key, character)
+        await self.cache.delete(CacheKeys.party(character.guild_id))
+    
+    async def delete_character(self, user_id: str, guild_id: str) -> bool:
+        """Delete a character and drop its cache entries"""
+        deleted = await self.inner.delete_character(user_id, guild_id)
+        
+        await self.cache.delete(CacheKeys.character(user_id, guild_id))
+        await self.cache.delete(CacheKeys.party(guild_id))
+        
+        return deleted
+    
+    async def get_guild_characters(self, guild_id: str) -> List[Character]:
+        """Get all characters in a guild"""
+        return await self.cache.get_or_load(
+            CacheKeys.party(guild_id),
+            lambda: self.inner.get_guild_characters(guild_id)
+        )
+
+
+class CachedEpisodeRepository(EpisodeRepositoryInterface):
+    """Episode repository decorator with read-through and write-through caching
+    
+    Owns the `episode:{guild}:current` and `episode:{guild}:history:*` keys.
+    The cached current episode keeps only the newest page of interactions,
+    like a fresh load does; older pages are not cached and are only read
+    when scrolling back.
+    """
+    
+    # Same window the database repository loads with the episode
+    INTERACTION_WINDOW = 20
+    
+    def __init__(self, inner: EpisodeRepositoryInterface, cache: CacheServiceInterface):
+        self.inner = inner
+        self.cache = cache
+    
+    async def get_current_episode(self, guild_id: str) -> Optional[Episode]:
+        """Get the currently active episode for a guild"""
+        return await self.cache.get_or_load(
+            CacheKeys.episode_current(guild_id),
+            lambda: self.inner.get_current_episode(guild_id)
+        )
+    
+    async def save_episode(self, episode: Episode) -> None:
+        """Save an episode and refresh the cached current episode"""
+        try:
+            await self.inner.save_episode(episode)
+        except Exception:
+            await self.cache.delete(CacheKeys.episode_current(episode.guild_id))
+            raise
+        
+        await self._refresh_current(episode)
+        await self.cache.delete_prefix(CacheKeys.episode_history_prefix(episode.guild_id))
+    
+    async def get_episode_history(self, guild_id: str, limit: int = 10) -> List[Episode]:
+        """Get recent episode history for a guild"""
+        return await self.cache.get_or_load(
+            CacheKeys.episode_history(guild_id, limit),
+            lambda: self.inner.get_episode_history(guild_id, limit)
+        )
+    
+    async def append_interaction(self, episode: Episode, interaction: SessionInteraction) -> None:
+        """Append an interaction and refresh the cached current episode"""
+        try:
+            await self.inner.append_interaction(episode, interaction)
+        except Exception:
+            await self.cache.delete(CacheKeys.episode_current(episode.guild_id))
+            raise
+        
+        await self._refresh_current(episode)
+    
+    async def get_interactions(self,
+                               guild_id: str,
+                               episode_number: int,
+                               before_seq: Optional[int] = None,
+                               limit: int = 20) -> List[SessionInteraction]:
+        """Get a page of interactions (not cached)"""
+        return await self.inner.get_interactions(guild_id, episode_number, before_seq, limit)
+    
+    async def get_episode(self, guild_id: str, episode_number: int) -> Optional[Episode]:
+        """Get one episode by number (not cached)"""
+        return await self.inner.get_episode(guild_id, episode_number)
+    
+    async def update_summary(self, guild_id: str, episode_number: int, summary: str) -> None:
+        """Store an episode's summary and drop cached copies of it"""
+        await self.inner.update_summary(guild_id, episode_number, summary)
+        
+        await self.cache.delete(CacheKeys.episode_current(guild_id))
+        await self.cache.delete_prefix(CacheKeys.episode_history_prefix(guild_id))
+    
+    async def end_episode(self, episode_id: str) -> None:
+        """Mark an episode as ended"""
+        await self.inner.end_episode(episode_id)
+    
+    async def _refresh_current(self, episode: Episode) -> None:
+        """Write through if this episode is the cached current one, else invalidate
+        
+        Which episode is "current" depends on every episode's status, so a
+        save of some other episode only drops the entry for the next read.
+        """
+        key = CacheKeys.episode_current(episode.guild_id)
+        cached = await self.cache.get(key)
+        
+        if cached is not None and cached.episode_number == episode.episode_number:
+            # Appends would otherwise grow the cached list for the whole episode
+            if len(episode.interactions) > self.INTERACTION_WINDOW:
+                episode.interactions = episode.interactions[-self.INTERACTION_WINDOW:]
+            await self.cache.set(key, episode)
+        else:
+            await self.cache.delete(key)
+
+
+class CachedMemoryRepository(MemoryRepositoryInterface):
+    """Memory repository decorator caching the recent-memories window
+    
+    Owns the `memory:{guild}:recent:*` keys. Any write to a guild's memories
+    drops them; filtered and search queries go straight to the database.
+    """
+    
+    def __init__(self, inner: MemoryRepositoryInterface, cache: CacheServiceInterface):
+        self.inner = inner
+        self.cache = cache
+    
+    async def save_memory(self, memory: Memory) -> None:
+        """Save a memory and invalidate the guild's recent window"""
+        await self.inner.save_memory(memory)
+        await self.cache.delete_prefix(CacheKeys.memory_recent_prefix(memory.guild_id))
+    
+    async def get_recent_memories(self, guild_id: str, limit: int = 50) -> List[Memory]:
+        """Get recent memories for context"""
+        return await self.cache.get_or_load(
+            CacheKeys.memory_recent(guild_id, limit),
+            lambda: self.inner.get_recent_memories(guild_id, limit)
+        )
+    
+    async def search_memories(self, guild_id: str, query: str, limit: int = 10) -> List[Memory]:
+        """Search memories by content"""
+        return await self.inner.search_memories(guild_id, query, limit)
+    
+    async def recall_memories(self, guild_id: str, text: str, limit: int = 10) -> List[Memory]:
+        """Find memories related to free text"""
+        return await self.inner.recall_memories(guild_id, text, limit)
+    
+    async def get_by_episode(self,
+                             guild_id: str,
+                             episode_number: int,
+                             limit: Optional[int] = None) -> List[Memory]:
+        """Get memories from one episode, oldest first"""
+        return await self.inner.get_by_episode(guild_id, episode_number, limit)
+    
+    async def get_by_character(self, guild_id: str, character_name: str, limit: int = 50) -> List[Memory]:
+        """Get memories by or mentioning a character, newest first"""
+        return await self.inner.get_by_character(guild_id, character_name, limit)
+    
+    async def get_since(self, guild_id: str, since: datetime, limit: Optional[int] = None) -> List[Memory]:
+        """Get memories at or after a timestamp, oldest first"""
+        return await self.inner.get_since(guild_id, since, limit)
+    
+    async def get_by_type(self, guild_id: str, memory_type: str, limit: int = 50) -> List[Memory]:
+        """Get memories of one type, newest first"""
+        return await self.inner.get_by_type(guild_id, memory_type, limit)
+    
+    async def get_summaries(self,
+                            guild_id: str,
+                            level: str,
+                            episode_number: Optional[int] = None,
+                            limit: int = 50) -> List[Memory]:
+        """Get rolling summaries of one level, newest first"""
+        return await self.inner.get_summaries(guild_id, level, episode_number, limit)
+    
+    async def clear_old_memories(self, guild_id: str, older_than: datetime) -> int:
+        """Clear old memories and invalidate the guild's recent window"""
+        deleted = await self.inner.clear_old_memories(guild_id, older_than)
+        await self.cache.delete_prefix(CacheKeys.memory_recent_prefix(guild_id))
+        return deleted
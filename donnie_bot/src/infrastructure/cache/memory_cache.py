@@ -2,181 +2,281 @@
 In-memory cache service implementation
 """
 import asyncio
-from typing import Any, Optional, Dict
-from datetime import datetime, timedelta
-from cachetools import TTLCache
-import threading
+import logging
+from typing import Any, Awaitable, Callable, NamedTuple, Optional, Dict
+from datetime import timedelta
+from cachetools import TLRUCache
 
 from ...domain.interfaces.cache_service import CacheServiceInterface
 from ..config.settings import CacheConfig
 
+logger = logging.getLogger(__name__)
+
+
+class _CacheEntry(NamedTuple):
+    """Stored value together with its own time-to-live in seconds"""
+    value: Any
+    ttl: float
+
+
+def _entry_expiry(key: str, entry: _CacheEntry, now: float) -> float:
+    """Time-to-use for TLRUCache: every entry expires on its own TTL"""
+    return now + entry.ttl
+
+
+class _ShardStore(TLRUCache):
+    """TLRUCache that counts capacity evictions and TTL expirations"""
+    
+    def __init__(self, maxsize: int):
+        super().__init__(maxsize=maxsize, ttu=_entry_expiry)
+        self.evictions = 0
+        self.expirations = 0
+    
+    def popitem(self):
+        key, value = super().popitem()
+        self.evictions += 1
+        return key, value
+    
+    def expire(self, time=None):
+        expired = super().expire(time)
+        self.expirations += len(expired)
+        return expired
+
+
+class CacheShard:
+    """Single cache namespace with its own size, TTL and counters
+    
+    Everything runs on one event loop, so plain reads and writes need no
+    locking. `lock` is only for compound operations that await between
+    reading and writing.
+    
+    `ttl` is the namespace default; entries written with an explicit TTL
+    expire on their own schedule.
+    """
+    
+    def __init__(self, name: str, max_size: int, ttl: int):
+        self.name = name
+        self.ttl = ttl
+        self.store = _ShardStore(maxsize=max(1, max_size))
+        self.hits = 0
+        self.misses = 0
+        self._lock: Optional[asyncio.Lock] = None
+    
+    @property
+    def lock(self) -> asyncio.Lock:
+        """Lock for compound operations (created lazily on the running loop)"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get shard statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.store),
+            "max_size": self.store.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.store.evictions,
+            "expirations": self.store.expirations,
+        }
+
 
 class MemoryCacheService(CacheServiceInterface):
-    """In-memory cache service using TTLCache"""
+    """In-memory cache service with one TLRU shard per key namespace, honouring per-entry TTLs"""
+    
+    DEFAULT_SHARD = "default"
     
     def __init__(self, config: CacheConfig):
         self.config = config
         self.enabled = config.enabled
+        self._shards: Dict[str, CacheShard] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.coalesced_loads = 0
         
         if self.enabled:
-            # Main cache with TTL
-            self._cache = TTLCache(
-                maxsize=config.max_size,
-                ttl=config.ttl_seconds
-            )
-            
-            # Specialized caches with different TTLs
-            self._character_cache = TTLCache(
-                maxsize=config.max_size // 4,
-                ttl=config.character_ttl
-            )
-            
-            self._episode_cache = TTLCache(
-                maxsize=config.max_size // 8,
-                ttl=config.episode_ttl
-            )
-            
-            self._memory_cache = TTLCache(
-                maxsize=config.max_size // 2,
-                ttl=config.memory_ttl
-            )
+            # namespace -> (max size, ttl); namespace is the key prefix before ':'
+            shard_specs = {
+                "character": (config.max_size // 4, config.character_ttl),
+                "episode": (config.max_size // 8, config.episode_ttl),
+                "memory": (config.max_size // 2, config.memory_ttl),
+                "ai": (config.max_size // 4, config.ai_ttl),
+                "party": (config.max_size // 8, config.party_ttl),
+                "guild": (config.max_size // 16, config.guild_ttl),
+                self.DEFAULT_SHARD: (config.max_size, config.ttl_seconds),
+            }
             
-            # Thread lock for thread safety
-            self._lock = threading.RLock()
-        else:
-            self._cache = {}
-            self._character_cache = {}
-            self._episode_cache = {}
-            self._memory_cache = {}
-            self._lock = threading.RLock()
+            for name, (max_size, ttl) in shard_specs.items():
+                self._shards[name] = CacheShard(name, max_size, ttl)
     
     async def get(self, key: str) -> Optional[Any]:
         """Get a value from cache"""
         if not self.enabled:
             return None
         
-        with self._lock:
-            # Check specialized caches first
-            cache = self._get_specialized_cache(key)
-            
-            try:
-                value = cache.get(key)
-                if value is not None:
-                    return value
-                
-                # Fallback to main cache
-                return self._cache.get(key)
-                
-            except KeyError:
-                return None
+        shard = self._shard_for(key)
+        entry = shard.store.get(key)
+        
+        if entry is None:
+            shard.misses += 1
+            return None
+        
+        shard.hits += 1
+        return entry.value
     
     async def set(self, key: str, value: Any, ttl: Optional[timedelta] = None) -> None:
         """Set a value in cache with optional TTL"""
         if not self.enabled:
             return
         
-        with self._lock:
-            # Use specialized cache if applicable
-            cache = self._get_specialized_cache(key)
-            
-            if ttl:
-                # For custom TTL, use main cache with timestamp
-                expiry = datetime.now() + ttl
-                cache[key] = {
-                    'value': value,
-                    'expiry': expiry,
-                    'custom_ttl': True
-                }
-            else:
-                # Use default TTL
-                cache[key] = value
+        # A fresher value supersedes any load still in flight for this key
+        self._inflight.pop(key, None)
+        self._put(key, value, ttl)
+    
+    async def get_or_load(self,
+                          key: str,
+                          loader: Callable[[], Awaitable[Any]],
+                          ttl: Optional[timedelta] = None) -> Optional[Any]:
+        """Get a value, loading and caching it on a miss (single-flight)
+        
+        The first caller to miss starts the load as its own task; callers
+        that miss while it is in flight await that same task instead of
+        issuing their own query. The load is shielded, so a caller being
+        cancelled does not cancel it for everyone else. None results are
+        returned but not cached.
+        """
+        if not self.enabled:
+            return await loader()
+        
+        value = await self.get(key)
+        if value is not None:
+            return value
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader, ttl))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget_load(key, done))
+        else:
+            self.coalesced_loads += 1
+        
+        return await asyncio.shield(task)
+    
+    async def _load(self,
+                    key: str,
+                    loader: Callable[[], Awaitable[Any]],
+                    ttl: Optional[timedelta]) -> Optional[Any]:
+        """Run a loader and cache its result"""
+        value = await loader()
+        
+        # Skip the write if the key was set or invalidated while loading
+        if value is not None and self._inflight.get(key) is asyncio.current_task():
+            self._put(key, value, ttl)
+        
+        return value
+    
+    def _forget_load(self, key: str, task: asyncio.Task) -> None:
+        """Drop a finished load from the in-flight table"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+    
+    def _put(self, key: str, value: Any, ttl: Optional[timedelta]) -> None:
+        """Store a value in its shard with an explicit or namespace TTL"""
+        shard = self._shard_for(key)
+        seconds = ttl.total_seconds() if ttl is not None else shard.ttl
+        
+        if seconds <= 0:
+            # Already expired; make sure no stale value survives
+            shard.store.pop(key, None)
+            return
+        
+        shard.store[key] = _CacheEntry(value, seconds)
     
     async def delete(self, key: str) -> bool:
         """Delete a key from cache"""
         if not self.enabled:
             return False
         
-        with self._lock:
-            deleted = False
-            
-            # Check all caches
-            for cache in [self._cache, self._character_cache, self._episode_cache, self._memory_cache]:
-                if key in cache:
-                    del cache[key]
-                    deleted = True
-            
-            return deleted
+        self._inflight.pop(key, None)
+        return self._shard_for(key).store.pop(key, None) is not None
+    
+    async def delete_prefix(self, prefix: str) -> int:
+        """Delete all keys starting with prefix. Returns count deleted."""
+        if not self.enabled:
+            return 0
+        
+        for key in [key for key in self._inflight if key.startswith(prefix)]:
+            del self._inflight[key]
+        
+        shard = self._shard_for(prefix)
+        keys = [key for key in list(shard.store.keys()) if key.startswith(prefix)]
+        
+        for key in keys:
+            shard.store.pop(key, None)
+        
+        return len(keys)
     
     async def clear(self) -> None:
         """Clear all cache entries"""
         if not self.enabled:
             return
         
-        with self._lock:
-            self._cache.clear()
-            self._character_cache.clear()
-            self._episode_cache.clear()
-            self._memory_cache.clear()
+        self._inflight.clear()
+        for shard in self._shards.values():
+            shard.store.clear()
     
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache"""
         if not self.enabled:
             return False
         
-        with self._lock:
-            # Check all caches
-            for cache in [self._cache, self._character_cache, self._episode_cache, self._memory_cache]:
-                if key in cache:
-                    # Check for custom TTL expiry
-                    value = cache[key]
-                    if isinstance(value, dict) and value.get('custom_ttl'):
-                        if datetime.now() > value['expiry']:
-                            del cache[key]
-                            continue
-                    return True
-            
-            return False
+        # TLRUCache treats expired entries as missing
+        return key in self._shard_for(key).store
     
-    def _get_specialized_cache(self, key: str) -> TTLCache:
-        """Get the appropriate specialized cache for a key"""
-        if key.startswith('character:'):
-            return self._character_cache
-        elif key.startswith('episode:'):
-            return self._episode_cache
-        elif key.startswith('memory:'):
-            return self._memory_cache
-        else:
-            return self._cache
+    def purge_expired(self) -> int:
+        """Drop expired entries from every shard. Returns count removed."""
+        if not self.enabled:
+            return 0
+        
+        return sum(len(shard.store.expire()) for shard in self._shards.values())
+    
+    def lock_for(self, key: str) -> asyncio.Lock:
+        """Get the lock guarding compound operations on a key's namespace"""
+        return self._shard_for(key).lock
+    
+    def _shard_for(self, key: str) -> CacheShard:
+        """Route a key to its namespace shard"""
+        namespace = key.split(':', 1)[0]
+        return self._shards.get(namespace) or self._shards[self.DEFAULT_SHARD]
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         if not self.enabled:
             return {"enabled": False}
         
-        with self._lock:
-            return {
-                "enabled": True,
-                "main_cache": {
-                    "size": len(self._cache),
-                    "max_size": self._cache.maxsize,
-                    "ttl": self._cache.ttl
-                },
-                "character_cache": {
-                    "size": len(self._character_cache),
-                    "max_size": self._character_cache.maxsize,
-                    "ttl": self._character_cache.ttl
-                },
-                "episode_cache": {
-                    "size": len(self._episode_cache),
-                    "max_size": self._episode_cache.maxsize,
-                    "ttl": self._episode_cache.ttl
-                },
-                "memory_cache": {
-                    "size": len(self._memory_cache),
-                    "max_size": self._memory_cache.maxsize,
-                    "ttl": self._memory_cache.ttl
-                }
+        # Expired entries linger until the next write; sweep so sizes are accurate
+        self.purge_expired()
+        
+        shards = {name: shard.get_stats() for name, shard in self._shards.items()}
+        hits = sum(stats["hits"] for stats in shards.values())
+        misses = sum(stats["misses"] for stats in shards.values())
+        
+        return {
+            "enabled": True,
+            "coalesced_loads": self.coalesced_loads,
+            "inflight_loads": len(self._inflight),
+            "shards": shards,
+            "totals": {
+                "size": sum(stats["size"] for stats in shards.values()),
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+                "evictions": sum(stats["evictions"] for stats in shards.values()),
+                "expirations": sum(stats["expirations"] for stats in shards.values()),
             }
+        }
     
     async def warm_cache(self, character_service, episode_service, guild_ids: list):
         """Warm up the cache with frequently accessed data"""
@@ -188,16 +288,15 @@ class MemoryCacheService(CacheServiceInterface):
                 # Cache current episode
                 episode = await episode_service.get_current_episode(guild_id)
                 if episode:
-                    await self.set(f"episode:{guild_id}:current", episode)
+                    await self.set(CacheKeys.episode_current(guild_id), episode)
                 
                 # Cache guild characters
                 characters = await character_service.get_guild_party(guild_id)
                 for character in characters:
-                    cache_key = f"character:{character.discord_user_id}:{guild_id}"
-                    await self.set(cache_key, character)
+                    await self.set(CacheKeys.character(character.discord_user_id, guild_id), character)
         
         except Exception as e:
-            print(f"❌ Error warming cache: {e}")
+            logger.error(f"❌ Error warming cache: {e}")
 
 
 # Cache key builders for consistency
@@ -213,8 +312,12 @@ class CacheKeys:
         return f"episode:{guild_id}:current"
     
     @staticmethod
-    def episode_history(guild_id: str) -> str:
-        return f"episode:{guild_id}:history"
+    def episode_history(guild_id: str, limit: int = 10) -> str:
+        return f"episode:{guild_id}:history:{limit}"
+    
+    @staticmethod
+    def episode_history_prefix(guild_id: str) -> str:
+        return f"episode:{guild_id}:history:"
     
     @staticmethod
     def guild_settings(guild_id: str) -> str:
@@ -224,10 +327,14 @@ class CacheKeys:
     def memory_recent(guild_id: str, limit: int = 50) -> str:
         return f"memory:{guild_id}:recent:{limit}"
     
+    @staticmethod
+    def memory_recent_prefix(guild_id: str) -> str:
+        return f"memory:{guild_id}:recent:"
+    
     @staticmethod
     def party(guild_id: str) -> str:
         return f"party:{guild_id}"
     
     @staticmethod
     def ai_response(context_hash: str) -> str:
-        return f"ai:response:{context_hash}"
\ No newline at end of file
+        return f"ai:response:{context_hash}"
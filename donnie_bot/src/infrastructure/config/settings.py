@@ -1,9 +1,10 @@
 """
 Configuration management for infrastructure components.
 """
+import json
 import os
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 from pathlib import Path
 
 try:
@@ -13,6 +14,14 @@ except ImportError:
     pass  # dotenv is optional
 
 
+# SQLite durability profiles: (journal_mode, synchronous)
+DATABASE_DURABILITY_PROFILES = {
+    "safe": ("WAL", "FULL"),        # fsync on every commit
+    "balanced": ("WAL", "NORMAL"),  # fsync at checkpoints only; survives app crashes
+    "fast": ("WAL", "OFF"),         # no fsync; may lose recent commits on power loss
+}
+
+
 @dataclass
 class DatabaseConfig:
     """Database configuration"""
@@ -20,6 +29,16 @@ class DatabaseConfig:
     backup_path: str = "data/backups"
     auto_backup: bool = True
     backup_interval_hours: int = 24
+    pool_size: int = 4  # Reader connections (plus one writer)
+    pool_acquire_timeout_seconds: float = 10.0
+    durability_profile: str = "balanced"  # safe, balanced, fast
+    mmap_size_mb: int = 64
+    cache_size_mb: int = 16
+    busy_timeout_ms: int = 5000
+    wal_checkpoint_interval_seconds: int = 300  # 0 disables the scheduler
+    semantic_search: bool = True  # Embedding-based memory recall alongside FTS5
+    embedding_dim: int = 256
+    hybrid_keyword_weight: float = 0.4  # BM25 share of the recall score; the rest is cosine similarity
     
     def __post_init__(self):
         # Ensure database directory exists
@@ -29,6 +48,22 @@ class DatabaseConfig:
         if self.auto_backup:
             backup_dir = Path(self.backup_path)
             backup_dir.mkdir(parents=True, exist_ok=True)
+    
+    def get_pragmas(self) -> Dict[str, Any]:
+        """Get the PRAGMA settings applied to every pooled connection"""
+        journal_mode, synchronous = DATABASE_DURABILITY_PROFILES.get(
+            self.durability_profile, DATABASE_DURABILITY_PROFILES["balanced"]
+        )
+        
+        return {
+            "auto_vacuum": "INCREMENTAL",  # Only takes effect on new databases (or after a VACUUM)
+            "journal_mode": journal_mode,
+            "synchronous": synchronous,
+            "busy_timeout": self.busy_timeout_ms,
+            "mmap_size": self.mmap_size_mb * 1024 * 1024,
+            "cache_size": -self.cache_size_mb * 1024,  # Negative value means KiB
+            "temp_store": "MEMORY",
+        }
 
 
 @dataclass 
@@ -39,6 +74,55 @@ class AIConfig:
     max_tokens: int = 1000
     temperature: float = 0.7
     timeout_seconds: int = 30
+    prompt_caching: bool = True  # cache_control breakpoints on the stable prompt prefix
+    prompt_cache_min_tokens: int = 1024  # API minimum cacheable prefix (2048 for Haiku); shorter ones are not marked
+    
+    # Request scheduling
+    max_concurrent_requests: int = 4
+    max_concurrent_per_guild: int = 2
+    requests_per_minute: int = 50
+    rate_limit_burst: int = 5
+    max_retries: int = 3
+    retry_base_delay_seconds: float = 1.0
+    retry_max_delay_seconds: float = 30.0
+    circuit_breaker_threshold: int = 5         # Consecutive transient failures before failing fast
+    circuit_breaker_reset_seconds: float = 30.0
+    max_queue_per_guild: int = 10              # Queued requests per guild before shedding
+    max_queue_total: int = 100                 # Queued requests across all guilds before shedding
+    
+    # Prompt context (memories, recent events, party state) packed into a token budget
+    context_token_budget: int = 1200
+    context_item_max_chars: int = 300    # Longer memories/events are trimmed
+    context_candidate_memories: int = 20 # Recent memories considered per prompt
+    context_relevant_memories: int = 5   # Full-text matches for the action considered per prompt
+    
+    # Rolling summaries (interactions -> scenes -> episode so far -> arcs)
+    rolling_summaries: bool = True
+    scene_summary_interactions: int = 10  # Interactions per scene summary
+    scenes_per_episode_summary: int = 4   # Scenes folded into the episode's rolling summary at a time
+    episodes_per_arc_summary: int = 5     # Completed episodes folded into the arc summary at a time
+    
+    # Streaming (progressive Discord message edits)
+    stream_responses: bool = True
+    stream_edit_interval_ms: int = 750   # Minimum time between message edits
+    stream_edit_min_chars: int = 200     # ...unless this much new text arrived
+    
+    # Round mode (actions posted close together are narrated in one call)
+    round_mode: bool = False
+    round_window_ms: int = 2000          # How long a round collects actions
+    round_max_actions: int = 6           # Resolve early once this many arrive
+    
+    # Response cache for repeatable calls (narrative turns are never cached)
+    response_cache_enabled: bool = True
+    intent_cache_ttl: int = 86400            # 1 day
+    character_sheet_cache_ttl: int = 604800  # 7 days
+    summary_cache_ttl: int = 2592000         # 30 days (completed episodes only)
+    
+    # Offline episode summaries through the Message Batches API
+    batch_summaries: bool = True
+    batch_poll_interval_seconds: float = 60.0  # How often to submit queued jobs and poll batches
+    batch_max_requests: int = 100              # Jobs per submitted batch
+    summary_job_max_attempts: int = 3
     
     def __post_init__(self):
         if not self.api_key:
@@ -52,6 +136,18 @@ class AIConfig:
         return bool(self.api_key.strip())
 
 
+# Lines spoken often enough to synthesize ahead of time
+PRERENDER_PHRASES = (
+    "Critical hit!",
+    "Critical success!",
+    "Critical fumble!",
+    "Roll for initiative!",
+    "Welcome, adventurers. Your story begins...",
+    "Welcome back, adventurers. When last we left our heroes...",
+    "And so this chapter of your adventure comes to a close.",
+)
+
+
 @dataclass
 class VoiceConfig:
     """Voice service configuration"""
@@ -61,6 +157,10 @@ class VoiceConfig:
     cache_directory: str = "data/audio_cache"
     max_cache_size_mb: int = 500
     cleanup_interval_hours: int = 168  # 1 week
+    tts_cache: bool = True  # Keep synthesized speech in cache_directory
+    prerender_phrases: List[str] = field(default_factory=lambda: list(PRERENDER_PHRASES))
+    speech_lookahead: int = 2  # Sentences synthesized ahead of the one playing
+    speech_chunk_max_chars: int = 300  # Longer sentences are split at commas or spaces
     
     def __post_init__(self):
         if self.enabled:
@@ -91,6 +191,36 @@ class CacheConfig:
     character_ttl: int = 1800  # 30 minutes
     episode_ttl: int = 600    # 10 minutes
     memory_ttl: int = 7200    # 2 hours
+    ai_ttl: int = 3600        # 1 hour
+    party_ttl: int = 600      # 10 minutes
+    guild_ttl: int = 3600     # 1 hour
+
+
+@dataclass
+class RetentionPolicy:
+    """How long a guild's history is kept"""
+    compact_after_days: int = 14  # Low-importance interactions are digested, then dropped; 0 disables
+    compact_max_importance: int = 2
+    delete_after_days: int = 180  # Memories other than summaries and digests; 0 keeps them forever
+    episode_log_days: int = 0  # Raw logs of summarized, completed episodes; 0 keeps them forever
+
+
+@dataclass
+class MaintenanceConfig:
+    """Background retention and compaction configuration"""
+    enabled: bool = True
+    interval_seconds: int = 3600
+    initial_delay_seconds: int = 300
+    delete_chunk_size: int = 500  # Rows per write transaction
+    compact_batch_size: int = 40  # Interactions folded into one digest
+    max_digests_per_guild: int = 10  # Caps AI calls per guild and pass
+    vacuum_pages: int = 1000  # Free pages returned to the OS per pass
+    policy: RetentionPolicy = field(default_factory=RetentionPolicy)
+    guild_policies: Dict[str, RetentionPolicy] = field(default_factory=dict)
+    
+    def get_policy(self, guild_id: str) -> RetentionPolicy:
+        """Get a guild's retention policy (the default unless overridden)"""
+        return self.guild_policies.get(guild_id, self.policy)
 
 
 class Settings:
@@ -102,6 +232,7 @@ class Settings:
         self.voice = VoiceConfig()
         self.discord = DiscordConfig()
         self.cache = CacheConfig()
+        self.maintenance = MaintenanceConfig()
         
         # Environment overrides
         self._apply_env_overrides()
@@ -113,6 +244,18 @@ class Settings:
         if db_path := os.getenv("DB_PATH"):
             self.database.path = db_path
         
+        if pool_size := os.getenv("DB_POOL_SIZE"):
+            try:
+                self.database.pool_size = int(pool_size)
+            except ValueError:
+                pass
+        
+        if semantic_search := os.getenv("DB_SEMANTIC_SEARCH"):
+            self.database.semantic_search = semantic_search.lower() in ("true", "1", "yes")
+        
+        if durability := os.getenv("DB_DURABILITY_PROFILE"):
+            self.database.durability_profile = durability.lower()
+        
         # AI overrides
         if model := os.getenv("AI_MODEL"):
             self.ai.model = model
@@ -129,10 +272,105 @@ class Settings:
             except ValueError:
                 pass
         
+        if max_concurrent := os.getenv("AI_MAX_CONCURRENT_REQUESTS"):
+            try:
+                self.ai.max_concurrent_requests = int(max_concurrent)
+            except ValueError:
+                pass
+        
+        if requests_per_minute := os.getenv("AI_REQUESTS_PER_MINUTE"):
+            try:
+                self.ai.requests_per_minute = int(requests_per_minute)
+            except ValueError:
+                pass
+        
+        if max_queue := os.getenv("AI_MAX_QUEUE_PER_GUILD"):
+            try:
+                self.ai.max_queue_per_guild = int(max_queue)
+            except ValueError:
+                pass
+        
+        if prompt_caching := os.getenv("AI_PROMPT_CACHING"):
+            self.ai.prompt_caching = prompt_caching.lower() in ("true", "1", "yes")
+        
+        if cache_min_tokens := os.getenv("AI_PROMPT_CACHE_MIN_TOKENS"):
+            try:
+                self.ai.prompt_cache_min_tokens = int(cache_min_tokens)
+            except ValueError:
+                pass
+        
+        if stream := os.getenv("AI_STREAM_RESPONSES"):
+            self.ai.stream_responses = stream.lower() in ("true", "1", "yes")
+        
+        if response_cache := os.getenv("AI_RESPONSE_CACHE"):
+            self.ai.response_cache_enabled = response_cache.lower() in ("true", "1", "yes")
+        
+        if batch_summaries := os.getenv("AI_BATCH_SUMMARIES"):
+            self.ai.batch_summaries = batch_summaries.lower() in ("true", "1", "yes")
+        
+        if context_budget := os.getenv("AI_CONTEXT_TOKEN_BUDGET"):
+            try:
+                self.ai.context_token_budget = int(context_budget)
+            except ValueError:
+                pass
+        
+        if rolling_summaries := os.getenv("AI_ROLLING_SUMMARIES"):
+            self.ai.rolling_summaries = rolling_summaries.lower() in ("true", "1", "yes")
+        
+        if round_mode := os.getenv("AI_ROUND_MODE"):
+            self.ai.round_mode = round_mode.lower() in ("true", "1", "yes")
+        
+        if round_window := os.getenv("AI_ROUND_WINDOW_MS"):
+            try:
+                self.ai.round_window_ms = int(round_window)
+            except ValueError:
+                pass
+        
+        # Maintenance overrides
+        if maintenance := os.getenv("MAINTENANCE_ENABLED"):
+            self.maintenance.enabled = maintenance.lower() in ("true", "1", "yes")
+        
+        if interval := os.getenv("MAINTENANCE_INTERVAL_SECONDS"):
+            try:
+                self.maintenance.interval_seconds = int(interval)
+            except ValueError:
+                pass
+        
+        if retention_days := os.getenv("MEMORY_RETENTION_DAYS"):
+            try:
+                self.maintenance.policy.delete_after_days = int(retention_days)
+            except ValueError:
+                pass
+        
+        if compact_days := os.getenv("MEMORY_COMPACT_AFTER_DAYS"):
+            try:
+                self.maintenance.policy.compact_after_days = int(compact_days)
+            except ValueError:
+                pass
+        
+        # Per-guild overrides, e.g. {"123456789": {"delete_after_days": 365}}
+        if guild_policies := os.getenv("MAINTENANCE_GUILD_POLICIES"):
+            try:
+                self.maintenance.guild_policies = {
+                    guild_id: RetentionPolicy(**{**vars(self.maintenance.policy), **overrides})
+                    for guild_id, overrides in json.loads(guild_policies).items()
+                }
+            except (ValueError, TypeError, AttributeError):
+                pass
+        
         # Voice overrides
         if voice_enabled := os.getenv("VOICE_ENABLED"):
             self.voice.enabled = voice_enabled.lower() in ("true", "1", "yes")
         
+        if tts_cache := os.getenv("VOICE_TTS_CACHE"):
+            self.voice.tts_cache = tts_cache.lower() in ("true", "1", "yes")
+        
+        if speech_lookahead := os.getenv("VOICE_SPEECH_LOOKAHEAD"):
+            try:
+                self.voice.speech_lookahead = int(speech_lookahead)
+            except ValueError:
+                pass
+        
         # Discord overrides  
         if prefix := os.getenv("COMMAND_PREFIX"):
             self.discord.command_prefix = prefix
@@ -157,8 +395,68 @@ class Settings:
             if self.ai.max_tokens < 1:
                 errors.append("AI max_tokens must be positive")
             
-            return len(errors) == 0 or (len(errors) == 1 and "AI features will be disabled" in errors[0]), errors
+            if self.ai.max_concurrent_requests < 1 or self.ai.max_concurrent_per_guild < 1:
+                errors.append("AI concurrency limits must be positive")
+            
+            if self.ai.max_queue_per_guild < 0 or self.ai.max_queue_total < 0:
+                errors.append("AI queue limits cannot be negative")
+            
+            if self.ai.requests_per_minute < 1:
+                errors.append("AI requests_per_minute must be positive")
+            
+            if self.ai.timeout_seconds <= 0:
+                errors.append("AI timeout_seconds must be positive")
+            
+            if self.ai.stream_edit_interval_ms < 0 or self.ai.stream_edit_min_chars < 0:
+                errors.append("AI stream edit interval and min chars cannot be negative")
+            
+            if self.ai.batch_poll_interval_seconds <= 0 or self.ai.batch_max_requests < 1:
+                errors.append("AI batch poll interval and batch size must be positive")
+            
+            if self.ai.context_token_budget < 1 or self.ai.context_item_max_chars < 1:
+                errors.append("AI context token budget and item length must be positive")
             
+            if min(self.ai.scene_summary_interactions, self.ai.scenes_per_episode_summary,
+                   self.ai.episodes_per_arc_summary) < 1:
+                errors.append("AI rolling summary intervals must be positive")
+            
+            if self.ai.round_window_ms < 0 or self.ai.round_max_actions < 2:
+                errors.append("AI round window cannot be negative and rounds need at least 2 actions")
+            
+            if self.maintenance.interval_seconds < 1 or self.maintenance.initial_delay_seconds < 0:
+                errors.append("Maintenance interval must be positive and initial delay cannot be negative")
+            
+            if min(self.maintenance.delete_chunk_size, self.maintenance.compact_batch_size,
+                   self.maintenance.max_digests_per_guild) < 1 or self.maintenance.vacuum_pages < 0:
+                errors.append("Maintenance chunk and batch sizes must be positive")
+            
+            for policy in [self.maintenance.policy, *self.maintenance.guild_policies.values()]:
+                if min(policy.compact_after_days, policy.delete_after_days, policy.episode_log_days) < 0:
+                    errors.append("Retention periods cannot be negative")
+                    break
+                if not (1 <= policy.compact_max_importance <= 5):
+                    errors.append("Retention compact_max_importance must be between 1 and 5")
+                    break
+            
+            if self.voice.max_cache_size_mb < 1:
+                errors.append("Voice max_cache_size_mb must be positive")
+            
+            if self.voice.speech_lookahead < 1 or self.voice.speech_chunk_max_chars < 40:
+                errors.append("Voice speech_lookahead must be positive and speech_chunk_max_chars at least 40")
+            
+            if self.database.pool_size < 1:
+                errors.append("Database pool_size must be positive")
+            
+            if self.database.embedding_dim < 1 or not (0.0 <= self.database.hybrid_keyword_weight <= 1.0):
+                errors.append("Database embedding_dim must be positive and hybrid_keyword_weight between 0.0 and 1.0")
+            
+            if self.database.durability_profile not in DATABASE_DURABILITY_PROFILES:
+                errors.append(
+                    f"Database durability_profile must be one of: {', '.join(DATABASE_DURABILITY_PROFILES)}"
+                )
+            
+            return len(errors) == 0 or (len(errors) == 1 and "AI features will be disabled" in errors[0]), errors
+        
         except Exception as e:
             errors.append(f"Configuration validation error: {e}")
             return False, errors
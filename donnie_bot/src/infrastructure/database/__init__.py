@@ -6,13 +6,23 @@ from .sqlite_repository import (
     SQLiteCharacterRepository,
     SQLiteEpisodeRepository,
     SQLiteGuildRepository,
-    SQLiteMemoryRepository
+    SQLiteMemoryRepository,
+    SQLiteAIResponseCacheRepository,
+    SQLiteSummaryJobRepository,
+    SummaryJob
 )
+from .connection_pool import SQLiteConnectionPool
+from .maintenance import DatabaseMaintenanceWorker
 
 __all__ = [
     "SQLiteRepositoryFactory",
     "SQLiteCharacterRepository",
     "SQLiteEpisodeRepository",
     "SQLiteGuildRepository", 
-    "SQLiteMemoryRepository"
+    "SQLiteMemoryRepository",
+    "SQLiteAIResponseCacheRepository",
+    "SQLiteSummaryJobRepository",
+    "SummaryJob",
+    "SQLiteConnectionPool",
+    "DatabaseMaintenanceWorker"
 ]
\ No newline at end of file
@@ -0,0 +1,294 @@
+"""
+Pooled SQLite connection management
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteConnectionPool:
+    """Long-lived aiosqlite connections: one writer plus N readers
+    
+    Every aiosqlite connection owns a worker thread, so opening one per
+    repository call makes connection setup dominate command latency. The
+    pool opens its connections once and hands them out for the lifetime of
+    the bot. SQLite only allows a single writer at a time, so writes are
+    serialized through one dedicated connection while reads are spread
+    across a small set of reader connections.
+    
+    The PRAGMA profile is applied once per connection when it is opened. In
+    WAL mode readers keep working while the writer commits, and a background
+    task periodically checkpoints the WAL back into the main database file.
+    """
+    
+    def __init__(self,
+                 db_path: str,
+                 pool_size: int = 4,
+                 acquire_timeout: float = 10.0,
+                 pragmas: Optional[Dict[str, Any]] = None,
+                 checkpoint_interval: float = 0):
+        self.db_path = db_path
+        self.pool_size = max(1, pool_size)
+        self.acquire_timeout = acquire_timeout
+        self.pragmas = dict(pragmas or {})
+        self.checkpoint_interval = checkpoint_interval
+        self._checkpoint_task: Optional[asyncio.Task] = None
+        
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._writer_lock = asyncio.Lock()
+        self._readers: "asyncio.Queue[aiosqlite.Connection]" = asyncio.Queue()
+        self._all_readers: List[aiosqlite.Connection] = []
+        self._open_lock = asyncio.Lock()
+        self._closed = False
+        
+        # Usage metrics
+        self._stats = {
+            "reader": {"acquired": 0, "in_use": 0, "wait_total": 0.0, "wait_max": 0.0, "timeouts": 0},
+            "writer": {"acquired": 0, "in_use": 0, "wait_total": 0.0, "wait_max": 0.0, "timeouts": 0},
+        }
+        self._checkpoint_stats = {"runs": 0, "busy": 0, "errors": 0, "last_wal_pages": 0, "last_checkpointed": 0}
+    
+    @property
+    def is_open(self) -> bool:
+        """Check if pool connections have been opened"""
+        return self._writer is not None and not self._closed
+    
+    async def open(self) -> None:
+        """Open writer and reader connections (idempotent)"""
+        async with self._open_lock:
+            if self._writer is not None:
+                return
+            
+            if self._closed:
+                raise RuntimeError("Connection pool has been closed")
+            
+            # Writer first so persistent settings like journal_mode are in place
+            self._writer = await self._connect()
+            
+            for _ in range(self.pool_size):
+                connection = await self._connect(read_only=True)
+                self._all_readers.append(connection)
+                self._readers.put_nowait(connection)
+            
+            if self.checkpoint_interval > 0:
+                self._checkpoint_task = asyncio.create_task(self._checkpoint_loop())
+            
+            logger.info(
+                f"SQLite pool opened: 1 writer + {self.pool_size} readers ({self.db_path}, "
+                f"journal_mode={self.pragmas.get('journal_mode', 'default')}, "
+                f"synchronous={self.pragmas.get('synchronous', 'default')})"
+            )
+    
+    async def close(self) -> None:
+        """Close all pooled connections"""
+        async with self._open_lock:
+            if self._closed:
+                return
+            
+            self._closed = True
+            
+            if self._checkpoint_task:
+                self._checkpoint_task.cancel()
+                try:
+                    await self._checkpoint_task
+                except asyncio.CancelledError:
+                    pass
+                self._checkpoint_task = None
+            
+            # Fold the WAL back into the database so it is not left behind
+            if self._writer is not None and self._is_wal():
+                try:
+                    await self._writer.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                except Exception as e:
+                    logger.warning(f"Final WAL checkpoint failed: {e}")
+            
+            connections = list(self._all_readers)
+            if self._writer is not None:
+                connections.append(self._writer)
+            
+            for connection in connections:
+                try:
+                    await connection.close()
+                except Exception as e:
+                    logger.warning(f"Error closing SQLite connection: {e}")
+            
+            self._all_readers.clear()
+            self._writer = None
+            
+            logger.info(f"SQLite pool closed ({self.db_path})")
+    
+    @asynccontextmanager
+    async def read(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a reader connection"""
+        await self._ensure_open()
+        
+        start = time.perf_counter()
+        try:
+            connection = await asyncio.wait_for(self._readers.get(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self._stats["reader"]["timeouts"] += 1
+            raise TimeoutError(f"Timed out waiting {self.acquire_timeout}s for a database reader")
+        
+        self._record_acquire("reader", time.perf_counter() - start)
+        try:
+            yield connection
+        finally:
+            self._stats["reader"]["in_use"] -= 1
+            self._readers.put_nowait(connection)
+    
+    @asynccontextmanager
+    async def write(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow the single writer connection
+        
+        Any transaction left open by a failing caller is rolled back so the
+        next writer starts from a clean state.
+        """
+        await self._ensure_open()
+        
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._writer_lock.acquire(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self._stats["writer"]["timeouts"] += 1
+            raise TimeoutError(f"Timed out waiting {self.acquire_timeout}s for the database writer")
+        
+        self._record_acquire("writer", time.perf_counter() - start)
+        try:
+            yield self._writer
+        except BaseException:
+            if self._writer.in_transaction:
+                await self._writer.rollback()
+            raise
+        finally:
+            self._stats["writer"]["in_use"] -= 1
+            self._writer_lock.release()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool wait/usage statistics"""
+        stats: Dict[str, Any] = {
+            "db_path": self.db_path,
+            "open": self.is_open,
+            "pool_size": self.pool_size,
+            "readers_available": self._readers.qsize(),
+        }
+        
+        for role, data in self._stats.items():
+            acquired = data["acquired"]
+            stats[role] = {
+                "acquired": acquired,
+                "in_use": data["in_use"],
+                "timeouts": data["timeouts"],
+                "avg_wait_ms": round(data["wait_total"] / acquired * 1000, 3) if acquired else 0.0,
+                "max_wait_ms": round(data["wait_max"] * 1000, 3),
+            }
+        
+        stats["checkpoints"] = dict(self._checkpoint_stats)
+        
+        return stats
+    
+    async def checkpoint(self, mode: str = "PASSIVE") -> Optional[tuple]:
+        """Run a WAL checkpoint; returns (busy, wal_pages, checkpointed_pages)"""
+        if not self._is_wal():
+            return None
+        
+        async with self.write() as db:
+            async with db.execute(f"PRAGMA wal_checkpoint({mode})") as cursor:
+                row = await cursor.fetchone()
+        
+        busy, wal_pages, checkpointed = row
+        self._checkpoint_stats["runs"] += 1
+        self._checkpoint_stats["last_wal_pages"] = wal_pages
+        self._checkpoint_stats["last_checkpointed"] = checkpointed
+        if busy:
+            self._checkpoint_stats["busy"] += 1
+        
+        return busy, wal_pages, checkpointed
+    
+    async def optimize(self, vacuum_pages: int = 1000, analysis_limit: int = 1000) -> Dict[str, int]:
+        """Refresh planner statistics and return up to vacuum_pages free pages to the OS
+        
+        Pages are only released when the database was created with
+        auto_vacuum=INCREMENTAL (or converted by a one-off VACUUM); other
+        databases just report their free page count.
+        """
+        async with self.write() as db:
+            # analysis_limit samples each index instead of scanning it fully
+            await db.execute(f"PRAGMA analysis_limit = {int(analysis_limit)}")
+            await db.execute("ANALYZE")
+            await db.commit()
+            
+            auto_vacuum = await self._pragma_value(db, "auto_vacuum")
+            free_before = await self._pragma_value(db, "freelist_count")
+            
+            if auto_vacuum == 2 and vacuum_pages > 0 and free_before:
+                # Each step frees one page, so the cursor must be drained
+                async with db.execute(f"PRAGMA incremental_vacuum({int(vacuum_pages)})") as cursor:
+                    await cursor.fetchall()
+            
+            free_after = await self._pragma_value(db, "freelist_count")
+        
+        return {
+            "auto_vacuum": auto_vacuum,
+            "free_pages_before": free_before,
+            "free_pages_after": free_after,
+        }
+    
+    @staticmethod
+    async def _pragma_value(db: aiosqlite.Connection, name: str) -> int:
+        """Read a single-valued integer PRAGMA"""
+        async with db.execute(f"PRAGMA {name}") as cursor:
+            row = await cursor.fetchone()
+        return row[0] if row else 0
+    
+    async def _checkpoint_loop(self) -> None:
+        """Periodically checkpoint the WAL"""
+        while True:
+            await asyncio.sleep(self.checkpoint_interval)
+            try:
+                result = await self.checkpoint()
+                if result:
+                    logger.debug(f"WAL checkpoint: busy={result[0]} wal_pages={result[1]} checkpointed={result[2]}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._checkpoint_stats["errors"] += 1
+                logger.warning(f"WAL checkpoint failed: {e}")
+    
+    async def _ensure_open(self) -> None:
+        """Lazily open the pool on first use"""
+        if self._writer is None:
+            await self.open()
+    
+    async def _connect(self, read_only: bool = False) -> aiosqlite.Connection:
+        """Open a single connection and apply the PRAGMA profile"""
+        connection = await aiosqlite.connect(self.db_path)
+        
+        try:
+            for name, value in self.pragmas.items():
+                await connection.execute(f"PRAGMA {name} = {value}")
+            
+            if read_only:
+                await connection.execute("PRAGMA query_only = ON")
+        except Exception:
+            await connection.close()
+            raise
+        
+        return connection
+    
+    def _is_wal(self) -> bool:
+        """Check if the pool runs in WAL journal mode"""
+        return str(self.pragmas.get("journal_mode", "")).upper() == "WAL"
+    
+    def _record_acquire(self, role: str, waited: float) -> None:
+        """Record acquisition metrics"""
+        data = self._stats[role]
+        data["acquired"] += 1
+        data["in_use"] += 1
+        data["wait_total"] += waited
+        data["wait_max"] = max(data["wait_max"], waited)
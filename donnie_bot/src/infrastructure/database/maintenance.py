@@ -0,0 +1,222 @@
+"""
+Background retention and compaction for the SQLite store
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from ...domain.entities import Memory
+from ...domain.interfaces.ai_service import AIServiceInterface
+from ...domain.interfaces.cache_service import CacheServiceInterface
+from ..cache.memory_cache import CacheKeys
+from ..config.settings import MaintenanceConfig, RetentionPolicy
+from .connection_pool import SQLiteConnectionPool
+from .sqlite_repository import SQLiteAIResponseCacheRepository, SQLiteEpisodeRepository, SQLiteMemoryRepository
+
+logger = logging.getLogger(__name__)
+
+DIGEST_MEMORY_TYPE = "digest"
+
+# Never expired by age: they stand in for rows that already were
+KEEP_MEMORY_TYPES = ("summary", DIGEST_MEMORY_TYPE)
+
+
+class DatabaseMaintenanceWorker:
+    """Background worker that keeps the database from growing without bound
+    
+    Each pass applies every guild's retention policy: old low-importance
+    interaction memories are condensed into digest memories before they are
+    dropped, expired memories and raw logs of summarized episodes are
+    deleted, and expired AI responses are purged. Deletes run in small
+    chunks, one write transaction each, so live writers are never held up
+    for long. The pass ends by merging touched FTS indexes, refreshing
+    planner statistics and returning free pages to the OS.
+    """
+    
+    def __init__(self,
+                 pool: SQLiteConnectionPool,
+                 memory_store: SQLiteMemoryRepository,
+                 episode_store: SQLiteEpisodeRepository,
+                 config: MaintenanceConfig,
+                 ai_service: Optional[AIServiceInterface] = None,
+                 response_cache_store: Optional[SQLiteAIResponseCacheRepository] = None,
+                 cache_service: Optional[CacheServiceInterface] = None):
+        self.pool = pool
+        self.memory_store = memory_store
+        self.episode_store = episode_store
+        self.config = config
+        self.ai_service = ai_service  # Without it nothing is compacted, only expired
+        self.response_cache_store = response_cache_store
+        self.cache_service = cache_service
+        self._task: Optional[asyncio.Task] = None
+        
+        self._stats = {
+            "passes": 0,
+            "digests_written": 0,
+            "memories_compacted": 0,
+            "memories_expired": 0,
+            "episode_logs_pruned": 0,
+            "ai_responses_purged": 0,
+            "errors": 0,
+            "last_pass_seconds": 0.0,
+        }
+    
+    def start(self) -> None:
+        """Start the background maintenance loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_loop())
+            logger.info(f"🧹 Database maintenance started (every {self.config.interval_seconds}s)")
+    
+    async def stop(self) -> None:
+        """Stop the background maintenance loop"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def run_once(self) -> Dict[str, int]:
+        """Run one maintenance pass. Returns the rows reclaimed per kind."""
+        start = time.perf_counter()
+        reclaimed = {"compacted": 0, "expired": 0, "episode_logs": 0, "ai_responses": 0}
+        
+        for guild_id in await self.memory_store.get_guild_ids():
+            try:
+                await self._sweep_guild(guild_id, self.config.get_policy(guild_id), reclaimed)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"⚠️ Maintenance failed for guild {guild_id}: {e}")
+        
+        if self.response_cache_store:
+            reclaimed["ai_responses"] = await self.response_cache_store.purge_expired()
+        
+        storage = await self.pool.optimize(self.config.vacuum_pages)
+        elapsed = time.perf_counter() - start
+        
+        self._stats["passes"] += 1
+        self._stats["memories_compacted"] += reclaimed["compacted"]
+        self._stats["memories_expired"] += reclaimed["expired"]
+        self._stats["episode_logs_pruned"] += reclaimed["episode_logs"]
+        self._stats["ai_responses_purged"] += reclaimed["ai_responses"]
+        self._stats["last_pass_seconds"] = round(elapsed, 3)
+        
+        freed = storage["free_pages_before"] - storage["free_pages_after"]
+        logger.info(
+            f"🧹 Maintenance pass reclaimed {sum(reclaimed.values())} rows "
+            f"({', '.join(f'{kind}: {count}' for kind, count in reclaimed.items())}), "
+            f"freed {freed} pages in {elapsed:.2f}s"
+        )
+        if storage["auto_vacuum"] != 2 and storage["free_pages_after"]:
+            logger.info(
+                f"🧹 {storage['free_pages_after']} free pages stay in the file; "
+                "run VACUUM once to enable incremental vacuum"
+            )
+        
+        return reclaimed
+    
+    def get_stats(self) -> Dict[str, float]:
+        """Get worker statistics"""
+        return dict(self._stats)
+    
+    async def _run_loop(self) -> None:
+        """Run passes until cancelled; a failed pass is logged and retried next interval"""
+        await asyncio.sleep(self.config.initial_delay_seconds)
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"⚠️ Maintenance pass failed: {e}")
+            
+            await asyncio.sleep(self.config.interval_seconds)
+    
+    async def _sweep_guild(self, guild_id: str, policy: RetentionPolicy, reclaimed: Dict[str, int]) -> None:
+        """Apply one guild's retention policy"""
+        now = datetime.now()
+        deleted = 0
+        
+        compacting = bool(policy.compact_after_days and self.ai_service)
+        if compacting:
+            compacted = await self._compact(guild_id, policy, now - timedelta(days=policy.compact_after_days))
+            reclaimed["compacted"] += compacted
+            deleted += compacted
+        
+        if policy.delete_after_days:
+            # Interactions still waiting for a digest are left to later passes
+            expired = await self.memory_store.delete_expired(
+                guild_id,
+                now - timedelta(days=policy.delete_after_days),
+                keep_types=KEEP_MEMORY_TYPES,
+                keep_compactable=policy.compact_max_importance if compacting else None,
+                chunk_size=self.config.delete_chunk_size
+            )
+            reclaimed["expired"] += expired
+            deleted += expired
+        
+        if policy.episode_log_days:
+            pruned = await self.episode_store.prune_interaction_logs(
+                guild_id,
+                now - timedelta(days=policy.episode_log_days),
+                chunk_size=self.config.delete_chunk_size
+            )
+            reclaimed["episode_logs"] += pruned
+            if pruned and self.cache_service:
+                # Cached episodes still carry the pruned interactions
+                await self.cache_service.delete(CacheKeys.episode_current(guild_id))
+                await self.cache_service.delete_prefix(CacheKeys.episode_history_prefix(guild_id))
+        
+        if deleted:
+            await self.memory_store.optimize_search_index(guild_id)
+            if self.cache_service:
+                await self.cache_service.delete_prefix(CacheKeys.memory_recent_prefix(guild_id))
+    
+    async def _compact(self, guild_id: str, policy: RetentionPolicy, older_than: datetime) -> int:
+        """Replace old low-importance interactions with digests. Returns the rows removed."""
+        removed = 0
+        for _ in range(self.config.max_digests_per_guild):
+            rows = await self.memory_store.get_compactable(
+                guild_id, older_than, policy.compact_max_importance, self.config.compact_batch_size
+            )
+            if not rows:
+                break
+            
+            # One digest never spans episodes
+            episode_number = rows[0][1].episode_number
+            rows = [(memory_id, memory) for memory_id, memory in rows if memory.episode_number == episode_number]
+            memories = [memory for _, memory in rows]
+            
+            # Raises on failure, leaving the rows for the next pass
+            text = await self.ai_service.condense_summary(
+                guild_id, DIGEST_MEMORY_TYPE, [memory.content for memory in memories]
+            )
+            await self.memory_store.save_memory(self._digest_memory(guild_id, episode_number, text, memories))
+            removed += await self.memory_store.delete_memories(guild_id, [memory_id for memory_id, _ in rows])
+            self._stats["digests_written"] += 1
+        
+        return removed
+    
+    @staticmethod
+    def _digest_memory(guild_id: str, episode_number: int, text: str, memories: List[Memory]) -> Memory:
+        """Build a digest memory dated at the last moment it covers"""
+        return Memory(
+            guild_id=guild_id,
+            episode_number=episode_number,
+            content=text,
+            memory_type=DIGEST_MEMORY_TYPE,
+            importance=3,
+            metadata={
+                "start": memories[0].timestamp.isoformat(),
+                "end": memories[-1].timestamp.isoformat(),
+                "count": len(memories),
+                "characters": sorted({memory.character_name for memory in memories if memory.character_name}),
+            },
+            timestamp=memories[-1].timestamp
+        )
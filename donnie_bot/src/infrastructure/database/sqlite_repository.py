@@ -1,40 +1,51 @@
 """
 SQLite repository implementations
 """
-import aiosqlite
+import asyncio
+import hashlib
 import json
-from typing import List, Optional, Dict, Any
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
 from pathlib import Path
 
-from ...domain.entities import Character, Episode, Guild, Memory
+from ...domain.entities import Character, Episode, Guild, Memory, SessionInteraction
 from ...domain.interfaces.repositories import (
     CharacterRepositoryInterface,
     EpisodeRepositoryInterface, 
     GuildRepositoryInterface,
-    MemoryRepositoryInterface
+    MemoryRepositoryInterface,
+    SummaryJobRepositoryInterface
 )
+from ..search import Embedder, VectorIndex, compile_fts_query, pack_vector
+from .connection_pool import SQLiteConnectionPool
 
 
 class SQLiteBaseRepository:
     """Base SQLite repository with common functionality"""
     
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool: Optional[SQLiteConnectionPool] = None):
         self.db_path = db_path
         self._ensure_db_directory()
+        self.pool = pool or SQLiteConnectionPool(db_path)
     
     def _ensure_db_directory(self):
         """Ensure database directory exists"""
         db_dir = Path(self.db_path).parent
         db_dir.mkdir(parents=True, exist_ok=True)
     
-    async def get_connection(self) -> aiosqlite.Connection:
-        """Get database connection"""
-        return await aiosqlite.connect(self.db_path)
+    def read_connection(self):
+        """Borrow a pooled reader connection"""
+        return self.pool.read()
+    
+    def write_connection(self):
+        """Borrow the pooled writer connection"""
+        return self.pool.write()
     
     async def execute_schema(self, schema_sql: str):
         """Execute schema SQL"""
-        async with await self.get_connection() as db:
+        async with self.write_connection() as db:
             await db.executescript(schema_sql)
             await db.commit()
 
@@ -78,7 +89,7 @@ class SQLiteCharacterRepository(SQLiteBaseRepository, CharacterRepositoryInterfa
     
     async def get_character(self, user_id: str, guild_id: str) -> Optional[Character]:
         """Get character by user and guild ID"""
-        async with await self.get_connection() as db:
+        async with self.read_connection() as db:
             async with db.execute(
                 "SELECT * FROM characters WHERE discord_user_id = ? AND guild_id = ?",
                 (user_id, guild_id)
@@ -91,55 +102,43 @@ class SQLiteCharacterRepository(SQLiteBaseRepository, CharacterRepositoryInterfa
                 return self._row_to_character(row)
     
     async def save_character(self, character: Character) -> None:
-        """Save or update a character"""
+        """Save or update a character in a single UPSERT"""
         character.last_updated = datetime.now().isoformat()
         
-        async with await self.get_connection() as db:
-            # Check if character exists
-            existing = await self.get_character(character.discord_user_id, character.guild_id)
-            
-            if existing:
-                # Update existing
-                await db.execute("""
-                    UPDATE characters SET
-                        name = ?, player_name = ?, race = ?, character_class = ?,
-                        level = ?, background = ?, ability_scores = ?,
-                        current_hp = ?, max_hp = ?, equipment = ?, spells = ?,
-                        affiliations = ?, personality_traits = ?, last_updated = ?
-                    WHERE discord_user_id = ? AND guild_id = ?
-                """, (
-                    character.name, character.player_name, character.race.value,
-                    character.character_class.value, character.level, character.background,
-                    json.dumps(character.ability_scores.__dict__), character.current_hp,
-                    character.max_hp, json.dumps(character.equipment),
-                    json.dumps(character.spells), json.dumps(character.affiliations),
-                    json.dumps(character.personality_traits), character.last_updated,
-                    character.discord_user_id, character.guild_id
-                ))
-            else:
-                # Insert new
-                await db.execute("""
-                    INSERT INTO characters (
-                        discord_user_id, guild_id, name, player_name, race, character_class,
-                        level, background, ability_scores, current_hp, max_hp,
-                        equipment, spells, affiliations, personality_traits,
-                        created_at, last_updated
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    character.discord_user_id, character.guild_id, character.name,
-                    character.player_name, character.race.value, character.character_class.value,
-                    character.level, character.background, json.dumps(character.ability_scores.__dict__),
-                    character.current_hp, character.max_hp, json.dumps(character.equipment),
-                    json.dumps(character.spells), json.dumps(character.affiliations),
-                    json.dumps(character.personality_traits), character.created_at,
-                    character.last_updated
-                ))
+        async with self.write_connection() as db:
+            # created_at is only written on first insert
+            await db.execute("""
+                INSERT INTO characters (
+                    discord_user_id, guild_id, name, player_name, race, character_class,
+                    level, background, ability_scores, current_hp, max_hp,
+                    equipment, spells, affiliations, personality_traits,
+                    created_at, last_updated
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(discord_user_id, guild_id) DO UPDATE SET
+                    name = excluded.name, player_name = excluded.player_name,
+                    race = excluded.race, character_class = excluded.character_class,
+                    level = excluded.level, background = excluded.background,
+                    ability_scores = excluded.ability_scores,
+                    current_hp = excluded.current_hp, max_hp = excluded.max_hp,
+                    equipment = excluded.equipment, spells = excluded.spells,
+                    affiliations = excluded.affiliations,
+                    personality_traits = excluded.personality_traits,
+                    last_updated = excluded.last_updated
+            """, (
+                character.discord_user_id, character.guild_id, character.name,
+                character.player_name, character.race.value, character.character_class.value,
+                character.level, character.background, json.dumps(character.ability_scores.__dict__),
+                character.current_hp, character.max_hp, json.dumps(character.equipment),
+                json.dumps(character.spells), json.dumps(character.affiliations),
+                json.dumps(character.personality_traits), character.created_at,
+                character.last_updated
+            ))
             
             await db.commit()
     
     async def delete_character(self, user_id: str, guild_id: str) -> bool:
         """Delete a character"""
-        async with await self.get_connection() as db:
+        async with self.write_connection() as db:
             cursor = await db.execute(
                 "DELETE FROM characters WHERE discord_user_id = ? AND guild_id = ?",
                 (user_id, guild_id)
@@ -149,7 +148,7 @@ class SQLiteCharacterRepository(SQLiteBaseRepository, CharacterRepositoryInterfa
     
     async def get_guild_characters(self, guild_id: str) -> List[Character]:
         """Get all characters in a guild"""
-        async with await self.get_connection() as db:
+        async with self.read_connection() as db:
             async with db.execute(
                 "SELECT * FROM characters WHERE guild_id = ? ORDER BY name",
                 (guild_id,)
@@ -190,6 +189,7 @@ class SQLiteCharacterRepository(SQLiteBaseRepository, CharacterRepositoryInterfa
             spells=json.loads(data['spells']),
             affiliations=json.loads(data['affiliations']),
             personality_traits=json.loads(data['personality_traits']),
+            guild_id=data['guild_id'],
             created_at=data['created_at'],
             last_updated=data['last_updated']
         )
@@ -198,6 +198,17 @@ class SQLiteCharacterRepository(SQLiteBaseRepository, CharacterRepositoryInterfa
 class SQLiteEpisodeRepository(SQLiteBaseRepository, EpisodeRepositoryInterface):
     """SQLite implementation of episode repository"""
     
+    # Number of most recent interactions loaded with an episode
+    INTERACTION_PAGE_SIZE = 20
+    
+    # Episode columns plus whole-episode interaction counters
+    EPISODE_SELECT = """
+        SELECT e.*,
+            (SELECT COUNT(*) FROM episode_interactions i WHERE i.episode_id = e.id),
+            (SELECT json_group_array(DISTINCT i.character_name) FROM episode_interactions i WHERE i.episode_id = e.id)
+        FROM episodes e
+    """
+    
     async def initialize(self):
         """Initialize episode tables"""
         schema = """
@@ -212,7 +223,7 @@ class SQLiteEpisodeRepository(SQLiteBaseRepository, EpisodeRepositoryInterface):
             opening_scene TEXT DEFAULT '',
             closing_scene TEXT DEFAULT '',
             summary TEXT DEFAULT '',
-            interactions TEXT DEFAULT '[]',  -- JSON array
+            interactions TEXT DEFAULT '[]',  -- Legacy JSON array, see episode_interactions
             character_snapshots TEXT DEFAULT '{}',  -- JSON object
             created_at TEXT,
             updated_at TEXT,
@@ -224,119 +235,268 @@ class SQLiteEpisodeRepository(SQLiteBaseRepository, EpisodeRepositoryInterface):
         
         CREATE INDEX IF NOT EXISTS idx_episodes_status 
         ON episodes(guild_id, status);
+        
+        -- Append-only interaction log, one row per player/DM turn
+        CREATE TABLE IF NOT EXISTS episode_interactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            episode_id INTEGER NOT NULL REFERENCES episodes(id) ON DELETE CASCADE,
+            seq INTEGER NOT NULL,
+            character_name TEXT NOT NULL,
+            player_action TEXT NOT NULL,
+            dm_response TEXT NOT NULL,
+            mode TEXT DEFAULT 'standard',
+            timestamp TEXT NOT NULL,
+            UNIQUE(episode_id, seq)
+        );
+        
+        -- Move interactions from legacy JSON blobs (idempotent)
+        INSERT OR IGNORE INTO episode_interactions (
+            episode_id, seq, character_name, player_action, dm_response, mode, timestamp
+        )
+        SELECT
+            e.id,
+            CAST(j.key AS INTEGER) + 1,
+            COALESCE(json_extract(j.value, '$.character_name'), ''),
+            COALESCE(json_extract(j.value, '$.player_action'), ''),
+            COALESCE(json_extract(j.value, '$.dm_response'), ''),
+            COALESCE(json_extract(j.value, '$.mode'), 'standard'),
+            COALESCE(json_extract(j.value, '$.timestamp'), e.updated_at, '')
+        FROM episodes e, json_each(e.interactions) j
+        WHERE e.interactions IS NOT NULL AND e.interactions NOT IN ('', '[]');
+        
+        UPDATE episodes SET interactions = '[]'
+        WHERE interactions IS NOT NULL AND interactions NOT IN ('', '[]');
         """
         
         await self.execute_schema(schema)
     
     async def get_current_episode(self, guild_id: str) -> Optional[Episode]:
         """Get the currently active or most recent episode"""
-        async with await self.get_connection() as db:
+        async with self.read_connection() as db:
             # First try to get active episode
             async with db.execute(
-                "SELECT * FROM episodes WHERE guild_id = ? AND status = 'active' ORDER BY episode_number DESC LIMIT 1",
+                f"{self.EPISODE_SELECT} WHERE e.guild_id = ? AND e.status = 'active' ORDER BY e.episode_number DESC LIMIT 1",
                 (guild_id,)
             ) as cursor:
                 row = await cursor.fetchone()
-                
-                if row:
-                    return self._row_to_episode(row)
             
             # If no active episode, get the most recent one
-            async with db.execute(
-                "SELECT * FROM episodes WHERE guild_id = ? ORDER BY episode_number DESC LIMIT 1",
-                (guild_id,)
-            ) as cursor:
-                row = await cursor.fetchone()
-                
-                if row:
-                    return self._row_to_episode(row)
-                
+            if not row:
+                async with db.execute(
+                    f"{self.EPISODE_SELECT} WHERE e.guild_id = ? ORDER BY e.episode_number DESC LIMIT 1",
+                    (guild_id,)
+                ) as cursor:
+                    row = await cursor.fetchone()
+            
+            if not row:
                 return None
+            
+            episode = self._row_to_episode(row)
+            episode.interactions = await self._fetch_interactions(db, row[0], None, self.INTERACTION_PAGE_SIZE)
+            return episode
     
     async def save_episode(self, episode: Episode) -> None:
-        """Save or update an episode"""
+        """Save or update an episode in a single UPSERT
+        
+        Interactions are not written here; they are appended one at a time
+        through append_interaction().
+        """
         episode.updated_at = datetime.now()
         
-        async with await self.get_connection() as db:
-            # Check if episode exists
+        async with self.write_connection() as db:
+            # created_at is only written on first insert
+            await db.execute("""
+                INSERT INTO episodes (
+                    guild_id, episode_number, name, status, start_time, end_time,
+                    opening_scene, closing_scene, summary,
+                    character_snapshots, created_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(guild_id, episode_number) DO UPDATE SET
+                    name = excluded.name, status = excluded.status,
+                    start_time = excluded.start_time, end_time = excluded.end_time,
+                    opening_scene = excluded.opening_scene, closing_scene = excluded.closing_scene,
+                    -- A summary written by the batch summarizer survives saves of stale copies
+                    summary = CASE WHEN excluded.summary != '' THEN excluded.summary ELSE episodes.summary END,
+                    character_snapshots = excluded.character_snapshots,
+                    updated_at = excluded.updated_at
+            """, (
+                episode.guild_id, episode.episode_number, episode.name, episode.status.value,
+                episode.start_time.isoformat() if episode.start_time else None,
+                episode.end_time.isoformat() if episode.end_time else None,
+                episode.opening_scene, episode.closing_scene, episode.summary,
+                json.dumps(episode.character_snapshots),
+                episode.created_at.isoformat() if episode.created_at else None,
+                episode.updated_at.isoformat()
+            ))
+            
+            await db.commit()
+    
+    async def append_interaction(self, episode: Episode, interaction: SessionInteraction) -> None:
+        """Append one interaction with a single INSERT"""
+        async with self.write_connection() as db:
+            cursor = await db.execute("""
+                INSERT INTO episode_interactions (
+                    episode_id, seq, character_name, player_action, dm_response, mode, timestamp
+                )
+                SELECT
+                    e.id,
+                    COALESCE((SELECT MAX(seq) FROM episode_interactions WHERE episode_id = e.id), 0) + 1,
+                    ?, ?, ?, ?, ?
+                FROM episodes e
+                WHERE e.guild_id = ? AND e.episode_number = ?
+            """, (
+                interaction.character_name, interaction.player_action, interaction.dm_response,
+                interaction.mode, interaction.timestamp,
+                episode.guild_id, episode.episode_number
+            ))
+            
+            if cursor.rowcount == 0:
+                raise ValueError(f"Episode {episode.episode_number} not found in guild {episode.guild_id}")
+            
+            async with db.execute(
+                "SELECT seq FROM episode_interactions WHERE id = ?",
+                (cursor.lastrowid,)
+            ) as seq_cursor:
+                interaction.seq = (await seq_cursor.fetchone())[0]
+            
+            await db.commit()
+    
+    async def get_interactions(self,
+                               guild_id: str,
+                               episode_number: int,
+                               before_seq: Optional[int] = None,
+                               limit: int = 20) -> List[SessionInteraction]:
+        """Get a page of interactions in chronological order"""
+        async with self.read_connection() as db:
             async with db.execute(
                 "SELECT id FROM episodes WHERE guild_id = ? AND episode_number = ?",
-                (episode.guild_id, episode.episode_number)
+                (guild_id, episode_number)
             ) as cursor:
-                existing = await cursor.fetchone()
+                row = await cursor.fetchone()
             
-            if existing:
-                # Update existing
-                await db.execute("""
-                    UPDATE episodes SET
-                        name = ?, status = ?, start_time = ?, end_time = ?,
-                        opening_scene = ?, closing_scene = ?, summary = ?,
-                        interactions = ?, character_snapshots = ?, updated_at = ?
-                    WHERE guild_id = ? AND episode_number = ?
-                """, (
-                    episode.name, episode.status.value,
-                    episode.start_time.isoformat() if episode.start_time else None,
-                    episode.end_time.isoformat() if episode.end_time else None,
-                    episode.opening_scene, episode.closing_scene, episode.summary,
-                    json.dumps([interaction.to_dict() for interaction in episode.interactions]),
-                    json.dumps(episode.character_snapshots),
-                    episode.updated_at.isoformat(),
-                    episode.guild_id, episode.episode_number
-                ))
-            else:
-                # Insert new
-                await db.execute("""
-                    INSERT INTO episodes (
-                        guild_id, episode_number, name, status, start_time, end_time,
-                        opening_scene, closing_scene, summary, interactions,
-                        character_snapshots, created_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    episode.guild_id, episode.episode_number, episode.name, episode.status.value,
-                    episode.start_time.isoformat() if episode.start_time else None,
-                    episode.end_time.isoformat() if episode.end_time else None,
-                    episode.opening_scene, episode.closing_scene, episode.summary,
-                    json.dumps([interaction.to_dict() for interaction in episode.interactions]),
-                    json.dumps(episode.character_snapshots),
-                    episode.created_at.isoformat() if episode.created_at else None,
-                    episode.updated_at.isoformat()
-                ))
+            if not row:
+                return []
             
-            await db.commit()
+            return await self._fetch_interactions(db, row[0], before_seq, limit)
     
     async def get_episode_history(self, guild_id: str, limit: int = 10) -> List[Episode]:
-        """Get episode history for a guild"""
-        async with await self.get_connection() as db:
+        """Get episode history for a guild
+        
+        Only interaction counters are loaded; use get_interactions() to page
+        through an episode's log.
+        """
+        async with self.read_connection() as db:
             async with db.execute(
-                "SELECT * FROM episodes WHERE guild_id = ? ORDER BY episode_number DESC LIMIT ?",
+                f"{self.EPISODE_SELECT} WHERE e.guild_id = ? ORDER BY e.episode_number DESC LIMIT ?",
                 (guild_id, limit)
             ) as cursor:
                 rows = await cursor.fetchall()
                 return [self._row_to_episode(row) for row in rows]
     
+    async def get_episode(self, guild_id: str, episode_number: int) -> Optional[Episode]:
+        """Get one episode by number (interaction counters only)"""
+        async with self.read_connection() as db:
+            async with db.execute(
+                f"{self.EPISODE_SELECT} WHERE e.guild_id = ? AND e.episode_number = ?",
+                (guild_id, episode_number)
+            ) as cursor:
+                row = await cursor.fetchone()
+                
+                if not row:
+                    return None
+                
+                return self._row_to_episode(row)
+    
+    async def update_summary(self, guild_id: str, episode_number: int, summary: str) -> None:
+        """Store an episode's summary without rewriting the rest of the row"""
+        async with self.write_connection() as db:
+            await db.execute(
+                "UPDATE episodes SET summary = ?, updated_at = ? WHERE guild_id = ? AND episode_number = ?",
+                (summary, datetime.now().isoformat(), guild_id, episode_number)
+            )
+            await db.commit()
+    
+    async def prune_interaction_logs(self, guild_id: str, ended_before: datetime, chunk_size: int = 500) -> int:
+        """Delete the raw logs of summarized episodes that ended before a date, one chunk per transaction"""
+        deleted = 0
+        while True:
+            async with self.write_connection() as db:
+                cursor = await db.execute("""
+                    DELETE FROM episode_interactions WHERE id IN (
+                        SELECT i.id FROM episode_interactions i
+                        JOIN episodes e ON e.id = i.episode_id
+                        WHERE e.guild_id = ? AND e.status = 'completed'
+                            AND e.end_time < ? AND COALESCE(e.summary, '') != ''
+                        LIMIT ?
+                    )
+                """, (guild_id, ended_before.isoformat(), chunk_size))
+                await db.commit()
+                count = cursor.rowcount
+            
+            deleted += count
+            if count < chunk_size:
+                return deleted
+            
+            # Let queued writers in between chunks
+            await asyncio.sleep(0)
+    
     async def end_episode(self, episode_id: str) -> None:
         """Mark an episode as ended - this is a convenience method"""
         # Note: episode_id would need to be tracked differently for this to work
         # For now, we'll implement it through the save_episode method
         pass
     
+    async def _fetch_interactions(self,
+                                  db,
+                                  episode_row_id: int,
+                                  before_seq: Optional[int],
+                                  limit: int) -> List[SessionInteraction]:
+        """Fetch the newest `limit` interactions before before_seq, oldest first"""
+        query = """
+            SELECT character_name, player_action, dm_response, timestamp, mode, seq
+            FROM episode_interactions
+            WHERE episode_id = ?
+        """
+        params: List[Any] = [episode_row_id]
+        
+        if before_seq is not None:
+            query += " AND seq < ?"
+            params.append(before_seq)
+        
+        query += " ORDER BY seq DESC LIMIT ?"
+        params.append(limit)
+        
+        async with db.execute(query, params) as cursor:
+            rows = await cursor.fetchall()
+        
+        return [
+            SessionInteraction(
+                character_name=row[0],
+                player_action=row[1],
+                dm_response=row[2],
+                timestamp=row[3],
+                mode=row[4],
+                seq=row[5]
+            )
+            for row in reversed(rows)
+        ]
+    
     def _row_to_episode(self, row) -> Episode:
         """Convert database row to Episode entity"""
-        from ...domain.entities.episode import EpisodeStatus, SessionInteraction
+        from ...domain.entities.episode import EpisodeStatus
         
         columns = [
             'id', 'guild_id', 'episode_number', 'name', 'status', 'start_time',
             'end_time', 'opening_scene', 'closing_scene', 'summary', 'interactions',
-            'character_snapshots', 'created_at', 'updated_at'
+            'character_snapshots', 'created_at', 'updated_at',
+            'interaction_count', 'participant_names'
         ]
         
         data = dict(zip(columns, row))
         
         # Parse JSON fields
-        interactions_data = json.loads(data['interactions'])
-        interactions = [SessionInteraction.from_dict(interaction_data) for interaction_data in interactions_data]
-        
         character_snapshots = json.loads(data['character_snapshots'])
+        participant_names = json.loads(data['participant_names'] or '[]')
         
         return Episode(
             guild_id=data['guild_id'],
@@ -348,8 +508,9 @@ class SQLiteEpisodeRepository(SQLiteBaseRepository, EpisodeRepositoryInterface):
             opening_scene=data['opening_scene'],
             closing_scene=data['closing_scene'],
             summary=data['summary'],
-            interactions=interactions,
             character_snapshots=character_snapshots,
+            interaction_count=data['interaction_count'] or 0,
+            participant_names=participant_names,
             created_at=datetime.fromisoformat(data['created_at']) if data['created_at'] else None,
             updated_at=datetime.fromisoformat(data['updated_at']) if data['updated_at'] else None
         )
@@ -380,7 +541,7 @@ class SQLiteGuildRepository(SQLiteBaseRepository, GuildRepositoryInterface):
     
     async def get_guild_settings(self, guild_id: str) -> Optional[Guild]:
         """Get guild settings"""
-        async with await self.get_connection() as db:
+        async with self.read_connection() as db:
             async with db.execute(
                 "SELECT * FROM guilds WHERE guild_id = ?",
                 (guild_id,)
@@ -393,38 +554,28 @@ class SQLiteGuildRepository(SQLiteBaseRepository, GuildRepositoryInterface):
                 return self._row_to_guild(row)
     
     async def save_guild_settings(self, guild: Guild) -> None:
-        """Save or update guild settings"""
+        """Save or update guild settings in a single UPSERT"""
         guild.updated_at = datetime.now()
         
-        async with await self.get_connection() as db:
-            # Check if guild exists
-            existing = await self.get_guild_settings(guild.guild_id)
-            
-            if existing:
-                # Update existing
-                await db.execute("""
-                    UPDATE guilds SET
-                        name = ?, current_episode_number = ?, current_scene = ?,
-                        voice_settings = ?, updated_at = ?
-                    WHERE guild_id = ?
-                """, (
-                    guild.name, guild.current_episode_number, guild.current_scene,
-                    json.dumps(guild.voice_settings.to_dict()),
-                    guild.updated_at.isoformat(), guild.guild_id
-                ))
-            else:
-                # Insert new
-                await db.execute("""
-                    INSERT INTO guilds (
-                        guild_id, name, current_episode_number, current_scene,
-                        voice_settings, created_at, updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    guild.guild_id, guild.name, guild.current_episode_number,
-                    guild.current_scene, json.dumps(guild.voice_settings.to_dict()),
-                    guild.created_at.isoformat() if guild.created_at else None,
-                    guild.updated_at.isoformat()
-                ))
+        async with self.write_connection() as db:
+            # created_at is only written on first insert
+            await db.execute("""
+                INSERT INTO guilds (
+                    guild_id, name, current_episode_number, current_scene,
+                    voice_settings, created_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(guild_id) DO UPDATE SET
+                    name = excluded.name,
+                    current_episode_number = excluded.current_episode_number,
+                    current_scene = excluded.current_scene,
+                    voice_settings = excluded.voice_settings,
+                    updated_at = excluded.updated_at
+            """, (
+                guild.guild_id, guild.name, guild.current_episode_number,
+                guild.current_scene, json.dumps(guild.voice_settings.to_dict()),
+                guild.created_at.isoformat() if guild.created_at else None,
+                guild.updated_at.isoformat()
+            ))
             
             await db.commit()
     
@@ -455,7 +606,41 @@ class SQLiteGuildRepository(SQLiteBaseRepository, GuildRepositoryInterface):
 
 
 class SQLiteMemoryRepository(SQLiteBaseRepository, MemoryRepositoryInterface):
-    """SQLite implementation of memory repository"""
+    """SQLite implementation of memory repository
+    
+    Full-text search is partitioned by guild: each guild gets its own
+    contentless FTS5 table (listed in memory_fts_partitions), created and
+    backfilled on first use and maintained alongside memories, so a search
+    only reads that guild's postings. User text is compiled into a safe
+    query by compile_fts_query and ranked with column-weighted BM25.
+    
+    With an embedder, every memory also gets a float32 vector in
+    memory_embeddings and recall_memories ranks by BM25 and cosine
+    similarity together. Each guild's vectors are loaded into a VectorIndex
+    on its first recall (embedding any memories that lack a vector) and
+    kept current by save_memory.
+    """
+    
+    # Cosine similarity below this is noise (hash collisions), not a match
+    MIN_SIMILARITY = 0.1
+    
+    # BM25 weights of the FTS columns (content, character_name)
+    FTS_COLUMN_WEIGHTS = (1.0, 2.0)
+    
+    # Memories embedded (off the event loop) and written per backfill transaction
+    EMBED_BACKFILL_CHUNK = 500
+    
+    def __init__(self,
+                 db_path: str,
+                 pool: Optional[SQLiteConnectionPool] = None,
+                 embedder: Optional[Embedder] = None,
+                 keyword_weight: float = 0.4):
+        super().__init__(db_path, pool)
+        self.embedder = embedder
+        self.keyword_weight = keyword_weight  # Share of BM25 in the hybrid score; the rest is cosine
+        self._indexes: Dict[str, VectorIndex] = {}
+        self._index_locks: Dict[str, asyncio.Lock] = {}
+        self._fts_tables: Dict[str, str] = {}
     
     async def initialize(self):
         """Initialize memory table"""
@@ -484,34 +669,49 @@ class SQLiteMemoryRepository(SQLiteBaseRepository, MemoryRepositoryInterface):
         CREATE INDEX IF NOT EXISTS idx_memories_timestamp 
         ON memories(guild_id, timestamp DESC);
         
-        -- Full-text search index for content
-        CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
-            content, 
-            content='memories',
-            content_rowid='id'
+        CREATE INDEX IF NOT EXISTS idx_memories_type 
+        ON memories(guild_id, memory_type, timestamp DESC);
+        
+        -- Full-text search is partitioned per guild (see _fts_partition);
+        -- the old all-guild index is rebuilt into partitions on demand
+        DROP TRIGGER IF EXISTS memories_fts_insert;
+        DROP TRIGGER IF EXISTS memories_fts_delete;
+        DROP TRIGGER IF EXISTS memories_fts_update;
+        DROP TABLE IF EXISTS memories_fts;
+        
+        CREATE TABLE IF NOT EXISTS memory_fts_partitions (
+            guild_id TEXT PRIMARY KEY,
+            table_name TEXT NOT NULL UNIQUE,
+            created_at TEXT NOT NULL
         );
         
-        -- Trigger to keep FTS in sync
-        CREATE TRIGGER IF NOT EXISTS memories_fts_insert AFTER INSERT ON memories BEGIN
-            INSERT INTO memories_fts(rowid, content) VALUES (new.id, new.content);
-        END;
+        -- Embedding vectors for semantic recall (little-endian float32)
+        CREATE TABLE IF NOT EXISTS memory_embeddings (
+            memory_id INTEGER PRIMARY KEY,
+            guild_id TEXT NOT NULL,
+            model TEXT NOT NULL,
+            vector BLOB NOT NULL
+        );
         
-        CREATE TRIGGER IF NOT EXISTS memories_fts_delete AFTER DELETE ON memories BEGIN
-            INSERT INTO memories_fts(memories_fts, rowid, content) VALUES ('delete', old.id, old.content);
-        END;
+        CREATE INDEX IF NOT EXISTS idx_memory_embeddings_guild
+        ON memory_embeddings(guild_id, model);
         
-        CREATE TRIGGER IF NOT EXISTS memories_fts_update AFTER UPDATE ON memories BEGIN
-            INSERT INTO memories_fts(memories_fts, rowid, content) VALUES ('delete', old.id, old.content);
-            INSERT INTO memories_fts(rowid, content) VALUES (new.id, new.content);
+        CREATE TRIGGER IF NOT EXISTS memory_embeddings_delete AFTER DELETE ON memories BEGIN
+            DELETE FROM memory_embeddings WHERE memory_id = old.id;
         END;
         """
         
         await self.execute_schema(schema)
     
     async def save_memory(self, memory: Memory) -> None:
-        """Save a memory entry"""
-        async with await self.get_connection() as db:
-            await db.execute("""
+        """Save a memory entry (and its embedding, in the same transaction)"""
+        vector = pack_vector(self.embedder.embed(memory.content)) if self.embedder else None
+        
+        async with self.write_connection() as db:
+            # Create (and backfill) the partition before the new row exists
+            fts_table = await self._fts_partition(db, memory.guild_id)
+            
+            cursor = await db.execute("""
                 INSERT INTO memories (
                     guild_id, episode_number, character_name, content,
                     memory_type, importance, metadata, timestamp
@@ -521,11 +721,31 @@ class SQLiteMemoryRepository(SQLiteBaseRepository, MemoryRepositoryInterface):
                 memory.content, memory.memory_type, memory.importance,
                 json.dumps(memory.metadata), memory.timestamp.isoformat()
             ))
+            memory_id = cursor.lastrowid
+            
+            await db.execute(
+                f"INSERT INTO {fts_table} (rowid, content, character_name) VALUES (?, ?, ?)",
+                (memory_id, memory.content, memory.character_name or "")
+            )
+            
+            if vector is not None:
+                await db.execute(
+                    "INSERT OR REPLACE INTO memory_embeddings (memory_id, guild_id, model, vector) VALUES (?, ?, ?, ?)",
+                    (memory_id, memory.guild_id, self.embedder.name, vector)
+                )
+            
             await db.commit()
+        
+        self._fts_tables[memory.guild_id] = fts_table
+        
+        # Keep a loaded index current; unloaded guilds pick the row up when loaded
+        index = self._indexes.get(memory.guild_id)
+        if vector is not None and index is not None:
+            index.add(memory_id, vector)
     
     async def get_recent_memories(self, guild_id: str, limit: int = 50) -> List[Memory]:
         """Get recent memories for context"""
-        async with await self.get_connection() as db:
+        async with self.read_connection() as db:
             async with db.execute("""
                 SELECT * FROM memories 
                 WHERE guild_id = ? 
@@ -536,27 +756,394 @@ class SQLiteMemoryRepository(SQLiteBaseRepository, MemoryRepositoryInterface):
                 return [self._row_to_memory(row) for row in rows]
     
     async def search_memories(self, guild_id: str, query: str, limit: int = 10) -> List[Memory]:
-        """Search memories by content using FTS"""
-        async with await self.get_connection() as db:
-            async with db.execute("""
-                SELECT m.* FROM memories m
-                JOIN memories_fts fts ON m.id = fts.rowid
-                WHERE m.guild_id = ? AND memories_fts MATCH ?
-                ORDER BY rank
+        """Search memories containing every term of free text, best match first"""
+        match = compile_fts_query(query, match_all=True)
+        if not match:
+            return []
+        
+        fts_table = await self._search_partition(guild_id)
+        return await self._fetch_memories(f"""
+            SELECT m.* FROM {fts_table} f
+            JOIN memories m ON m.id = f.rowid
+            WHERE {fts_table} MATCH ?
+            ORDER BY {self._bm25(fts_table)}
+            LIMIT ?
+        """, (match, limit))
+    
+    async def recall_memories(self, guild_id: str, text: str, limit: int = 10) -> List[Memory]:
+        """Find memories related to free text, ranking BM25 and cosine similarity together"""
+        candidates = limit * 4
+        keyword_scores = await self._keyword_scores(guild_id, text, candidates)
+        
+        semantic_scores: Dict[int, float] = {}
+        if self.embedder:
+            index = await self._get_index(guild_id)
+            semantic_scores = {
+                memory_id: score
+                for memory_id, score in index.search(self.embedder.embed(text), candidates)
+                if score >= self.MIN_SIMILARITY
+            }
+        
+        keyword_weight = self.keyword_weight if semantic_scores else 1.0
+        combined = {
+            memory_id: keyword_weight * keyword_scores.get(memory_id, 0.0)
+            + (1.0 - keyword_weight) * semantic_scores.get(memory_id, 0.0)
+            for memory_id in keyword_scores.keys() | semantic_scores.keys()
+        }
+        ranked = sorted(combined, key=combined.get, reverse=True)[:limit]
+        if not ranked:
+            return []
+        
+        placeholders = ", ".join("?" for _ in ranked)
+        async with self.read_connection() as db:
+            async with db.execute(f"SELECT * FROM memories WHERE id IN ({placeholders})", ranked) as cursor:
+                rows = {row[0]: row for row in await cursor.fetchall()}
+        
+        return [self._row_to_memory(rows[memory_id]) for memory_id in ranked if memory_id in rows]
+    
+    async def _keyword_scores(self, guild_id: str, text: str, limit: int) -> Dict[int, float]:
+        """BM25 scores of keyword matches, scaled so the best match is 1.0"""
+        match = compile_fts_query(text)
+        if not match:
+            return {}
+        
+        fts_table = await self._search_partition(guild_id)
+        async with self.read_connection() as db:
+            async with db.execute(f"""
+                SELECT rowid, {self._bm25(fts_table)} AS score FROM {fts_table}
+                WHERE {fts_table} MATCH ?
+                ORDER BY score
+                LIMIT ?
+            """, (match, limit)) as cursor:
+                rows = await cursor.fetchall()
+        
+        # FTS5 bm25() is negative; more negative is a better match
+        best = max((-score for _, score in rows), default=0.0)
+        return {memory_id: -score / best for memory_id, score in rows} if best > 0 else {}
+    
+    async def _search_partition(self, guild_id: str) -> str:
+        """Name of a guild's FTS table, building it first if the guild has none yet"""
+        fts_table = self._fts_tables.get(guild_id)
+        if fts_table:
+            return fts_table
+        
+        async with self.read_connection() as db:
+            async with db.execute(
+                "SELECT table_name FROM memory_fts_partitions WHERE guild_id = ?", (guild_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        
+        if row:
+            fts_table = row[0]
+        else:
+            async with self.write_connection() as db:
+                fts_table = await self._fts_partition(db, guild_id)
+                await db.commit()
+        
+        self._fts_tables[guild_id] = fts_table
+        return fts_table
+    
+    async def _fts_partition(self, db, guild_id: str) -> str:
+        """Name of a guild's FTS table, creating and backfilling it in the caller's write transaction"""
+        fts_table = self._fts_tables.get(guild_id)
+        if fts_table:
+            return fts_table
+        
+        async with db.execute(
+            "SELECT table_name FROM memory_fts_partitions WHERE guild_id = ?", (guild_id,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        if row:
+            return row[0]
+        
+        # Guild ids are Discord snowflakes, but never trust them as identifiers
+        fts_table = "memories_fts_" + hashlib.sha1(guild_id.encode()).hexdigest()[:16]
+        await db.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+                content,
+                character_name,
+                content='',
+                tokenize='unicode61 remove_diacritics 2',
+                prefix='2 3'
+            )
+        """)
+        await db.execute(
+            f"INSERT INTO {fts_table} (rowid, content, character_name) "
+            "SELECT id, content, COALESCE(character_name, '') FROM memories WHERE guild_id = ?",
+            (guild_id,)
+        )
+        await db.execute(
+            "INSERT INTO memory_fts_partitions (guild_id, table_name, created_at) VALUES (?, ?, ?)",
+            (guild_id, fts_table, datetime.now().isoformat())
+        )
+        return fts_table
+    
+    def _bm25(self, fts_table: str) -> str:
+        """Column-weighted BM25 expression (lower is better)"""
+        return f"bm25({fts_table}, {', '.join(str(weight) for weight in self.FTS_COLUMN_WEIGHTS)})"
+    
+    async def _get_index(self, guild_id: str) -> VectorIndex:
+        """Load a guild's vector index on first use, embedding memories that lack vectors"""
+        index = self._indexes.get(guild_id)
+        if index is not None:
+            return index
+        
+        lock = self._index_locks.setdefault(guild_id, asyncio.Lock())
+        async with lock:
+            if guild_id in self._indexes:
+                return self._indexes[guild_id]
+            
+            async with self.read_connection() as db:
+                async with db.execute("""
+                    SELECT m.id, m.content FROM memories m
+                    LEFT JOIN memory_embeddings e ON e.memory_id = m.id AND e.model = ?
+                    WHERE m.guild_id = ? AND e.memory_id IS NULL
+                """, (self.embedder.name, guild_id)) as cursor:
+                    missing = await cursor.fetchall()
+            
+            for start in range(0, len(missing), self.EMBED_BACKFILL_CHUNK):
+                rows = await asyncio.to_thread(
+                    self._embed_rows, guild_id, missing[start:start + self.EMBED_BACKFILL_CHUNK]
+                )
+                async with self.write_connection() as db:
+                    await db.executemany(
+                        "INSERT OR REPLACE INTO memory_embeddings (memory_id, guild_id, model, vector) VALUES (?, ?, ?, ?)",
+                        rows
+                    )
+                    await db.commit()
+            
+            # Register before loading so saves made meanwhile are not lost (add() dedupes)
+            index = VectorIndex(self.embedder.dim)
+            self._indexes[guild_id] = index
+            
+            async with self.read_connection() as db:
+                async with db.execute(
+                    "SELECT memory_id, vector FROM memory_embeddings WHERE guild_id = ? AND model = ? ORDER BY memory_id",
+                    (guild_id, self.embedder.name)
+                ) as cursor:
+                    for memory_id, vector in await cursor.fetchall():
+                        index.add(memory_id, vector)
+            
+            return index
+    
+    def _embed_rows(self, guild_id: str, memories: List[Tuple[int, str]]) -> List[Tuple[int, str, str, bytes]]:
+        """Embedding rows for (id, content) pairs; CPU-bound, so run in a worker thread"""
+        return [
+            (memory_id, guild_id, self.embedder.name, pack_vector(self.embedder.embed(content)))
+            for memory_id, content in memories
+        ]
+    
+    async def get_by_episode(self,
+                             guild_id: str,
+                             episode_number: int,
+                             limit: Optional[int] = None) -> List[Memory]:
+        """Get memories from one episode in chronological order
+        
+        With a limit, the most recent `limit` memories are returned.
+        """
+        if limit is None:
+            return await self._fetch_memories("""
+                SELECT * FROM memories
+                WHERE guild_id = ? AND episode_number = ?
+                ORDER BY timestamp ASC
+            """, (guild_id, episode_number))
+        
+        return await self._fetch_memories("""
+            SELECT * FROM (
+                SELECT * FROM memories
+                WHERE guild_id = ? AND episode_number = ?
+                ORDER BY timestamp DESC
+                LIMIT ?
+            ) ORDER BY timestamp ASC
+        """, (guild_id, episode_number, limit))
+    
+    async def get_by_character(self, guild_id: str, character_name: str, limit: int = 50) -> List[Memory]:
+        """Get memories by or mentioning a character, newest first
+        
+        Combines the idx_memories_character lookup with an FTS phrase match
+        for mentions in other memories' content.
+        """
+        phrase = compile_fts_query('"' + character_name.replace('"', ' ') + '"')
+        if not phrase:
+            return await self._fetch_memories("""
+                SELECT * FROM memories
+                WHERE guild_id = ? AND character_name = ?
+                ORDER BY timestamp DESC
                 LIMIT ?
-            """, (guild_id, query, limit)) as cursor:
+            """, (guild_id, character_name, limit))
+        
+        fts_table = await self._search_partition(guild_id)
+        return await self._fetch_memories(f"""
+            SELECT * FROM memories WHERE id IN (
+                SELECT id FROM memories
+                WHERE guild_id = ? AND character_name = ?
+                UNION
+                SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH ?
+            )
+            ORDER BY timestamp DESC
+            LIMIT ?
+        """, (guild_id, character_name, phrase, limit))
+    
+    async def get_since(self, guild_id: str, since: datetime, limit: Optional[int] = None) -> List[Memory]:
+        """Get memories at or after a timestamp in chronological order (the newest `limit` when capped)"""
+        if limit is None:
+            return await self._fetch_memories("""
+                SELECT * FROM memories
+                WHERE guild_id = ? AND timestamp >= ?
+                ORDER BY timestamp ASC
+            """, (guild_id, since.isoformat()))
+        
+        # Take the newest rows, then restore chronological order
+        return await self._fetch_memories("""
+            SELECT * FROM (
+                SELECT * FROM memories
+                WHERE guild_id = ? AND timestamp >= ?
+                ORDER BY timestamp DESC
+                LIMIT ?
+            )
+            ORDER BY timestamp ASC
+        """, (guild_id, since.isoformat(), limit))
+    
+    async def get_by_type(self, guild_id: str, memory_type: str, limit: int = 50) -> List[Memory]:
+        """Get memories of one type, newest first"""
+        return await self._fetch_memories("""
+            SELECT * FROM memories
+            WHERE guild_id = ? AND memory_type = ?
+            ORDER BY timestamp DESC
+            LIMIT ?
+        """, (guild_id, memory_type, limit))
+    
+    async def get_summaries(self,
+                            guild_id: str,
+                            level: str,
+                            episode_number: Optional[int] = None,
+                            limit: int = 50) -> List[Memory]:
+        """Get rolling summaries of one level, newest first"""
+        query = """
+            SELECT * FROM memories
+            WHERE guild_id = ? AND memory_type = 'summary'
+              AND json_extract(metadata, '$.level') = ?
+        """
+        params: List[Any] = [guild_id, level]
+        
+        if episode_number is not None:
+            query += " AND episode_number = ?"
+            params.append(episode_number)
+        
+        query += " ORDER BY timestamp DESC LIMIT ?"
+        params.append(limit)
+        
+        return await self._fetch_memories(query, params)
+    
+    async def _fetch_memories(self, query: str, params) -> List[Memory]:
+        """Run a memories query and map the rows"""
+        async with self.read_connection() as db:
+            async with db.execute(query, params) as cursor:
                 rows = await cursor.fetchall()
                 return [self._row_to_memory(row) for row in rows]
     
     async def clear_old_memories(self, guild_id: str, older_than: datetime) -> int:
         """Clear memories older than specified date"""
-        async with await self.get_connection() as db:
-            cursor = await db.execute("""
-                DELETE FROM memories 
-                WHERE guild_id = ? AND timestamp < ?
-            """, (guild_id, older_than.isoformat()))
+        return await self.delete_expired(guild_id, older_than)
+    
+    async def get_guild_ids(self) -> List[str]:
+        """Guilds that have stored memories"""
+        async with self.read_connection() as db:
+            async with db.execute("SELECT DISTINCT guild_id FROM memories") as cursor:
+                return [row[0] for row in await cursor.fetchall()]
+    
+    async def get_compactable(self,
+                              guild_id: str,
+                              older_than: datetime,
+                              max_importance: int,
+                              limit: int = 50) -> List[Tuple[int, Memory]]:
+        """Oldest low-importance interaction memories before a date, with their row ids"""
+        async with self.read_connection() as db:
+            async with db.execute("""
+                SELECT * FROM memories
+                WHERE guild_id = ? AND memory_type = 'interaction' AND importance <= ? AND timestamp < ?
+                ORDER BY timestamp
+                LIMIT ?
+            """, (guild_id, max_importance, older_than.isoformat(), limit)) as cursor:
+                rows = await cursor.fetchall()
+                return [(row[0], self._row_to_memory(row)) for row in rows]
+    
+    async def delete_expired(self,
+                             guild_id: str,
+                             older_than: datetime,
+                             keep_types: Sequence[str] = (),
+                             keep_compactable: Optional[int] = None,
+                             chunk_size: int = 500) -> int:
+        """Delete memories older than a date, one chunk per transaction
+        
+        Memories of keep_types are kept, as are interactions of importance up
+        to keep_compactable (waiting to be digested, see get_compactable).
+        """
+        exclude = ""
+        params: List[Any] = []
+        if keep_types:
+            exclude += f" AND memory_type NOT IN ({', '.join('?' * len(keep_types))})"
+            params.extend(keep_types)
+        if keep_compactable is not None:
+            exclude += " AND NOT (memory_type = 'interaction' AND importance <= ?)"
+            params.append(keep_compactable)
+        
+        deleted = 0
+        while True:
+            async with self.read_connection() as db:
+                async with db.execute(f"""
+                    SELECT id FROM memories
+                    WHERE guild_id = ? AND timestamp < ?{exclude}
+                    LIMIT ?
+                """, (guild_id, older_than.isoformat(), *params, chunk_size)) as cursor:
+                    memory_ids = [row[0] for row in await cursor.fetchall()]
+            
+            if not memory_ids:
+                return deleted
+            
+            deleted += await self.delete_memories(guild_id, memory_ids)
+            if len(memory_ids) < chunk_size:
+                return deleted
+            
+            # Let queued writers in between chunks
+            await asyncio.sleep(0)
+    
+    async def delete_memories(self, guild_id: str, memory_ids: Sequence[int]) -> int:
+        """Delete memories by row id in one transaction"""
+        if not memory_ids:
+            return 0
+        
+        placeholders = ", ".join("?" * len(memory_ids))
+        async with self.write_connection() as db:
+            # Contentless FTS rows are removed by replaying their original values
+            fts_table = await self._fts_partition(db, guild_id)
+            await db.execute(f"""
+                INSERT INTO {fts_table} ({fts_table}, rowid, content, character_name)
+                SELECT 'delete', id, content, COALESCE(character_name, '') FROM memories
+                WHERE guild_id = ? AND id IN ({placeholders})
+            """, (guild_id, *memory_ids))
+            
+            cursor = await db.execute(
+                f"DELETE FROM memories WHERE guild_id = ? AND id IN ({placeholders})",
+                (guild_id, *memory_ids)
+            )
             await db.commit()
-            return cursor.rowcount
+            deleted = cursor.rowcount
+        
+        self._fts_tables[guild_id] = fts_table
+        
+        # Reload the guild's vectors on next recall
+        self._indexes.pop(guild_id, None)
+        return deleted
+    
+    async def optimize_search_index(self, guild_id: str) -> None:
+        """Merge a guild's FTS segments into one, dropping the tombstones deletes leave behind"""
+        async with self.write_connection() as db:
+            fts_table = await self._fts_partition(db, guild_id)
+            await db.execute(f"INSERT INTO {fts_table} ({fts_table}) VALUES ('optimize')")
+            await db.commit()
+        
+        self._fts_tables[guild_id] = fts_table
     
     def _row_to_memory(self, row) -> Memory:
         """Convert database row to Memory entity"""
@@ -582,33 +1169,290 @@ class SQLiteMemoryRepository(SQLiteBaseRepository, MemoryRepositoryInterface):
         )
 
 
+class SQLiteAIResponseCacheRepository(SQLiteBaseRepository):
+    """SQLite store for cached AI responses (JSON payloads with an expiry)"""
+    
+    async def initialize(self):
+        """Initialize AI response cache table"""
+        schema = """
+        CREATE TABLE IF NOT EXISTS ai_response_cache (
+            cache_key TEXT PRIMARY KEY,
+            call_type TEXT NOT NULL,
+            model TEXT NOT NULL,
+            payload TEXT NOT NULL,  -- JSON
+            created_at TEXT NOT NULL,
+            expires_at REAL NOT NULL  -- Unix timestamp
+        );
+        
+        CREATE INDEX IF NOT EXISTS idx_ai_response_cache_expires
+        ON ai_response_cache(expires_at);
+        
+        CREATE INDEX IF NOT EXISTS idx_ai_response_cache_type
+        ON ai_response_cache(call_type);
+        """
+        
+        await self.execute_schema(schema)
+    
+    async def get(self, cache_key: str) -> Optional[Any]:
+        """Get an unexpired payload by key"""
+        async with self.read_connection() as db:
+            async with db.execute(
+                "SELECT payload FROM ai_response_cache WHERE cache_key = ? AND expires_at > ?",
+                (cache_key, time.time())
+            ) as cursor:
+                row = await cursor.fetchone()
+                
+                if not row:
+                    return None
+                
+                return json.loads(row[0])
+    
+    async def set(self, cache_key: str, call_type: str, model: str, payload: Any, ttl: int) -> None:
+        """Store a payload for `ttl` seconds"""
+        async with self.write_connection() as db:
+            await db.execute("""
+                INSERT INTO ai_response_cache (cache_key, call_type, model, payload, created_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    payload = excluded.payload,
+                    created_at = excluded.created_at,
+                    expires_at = excluded.expires_at
+            """, (
+                cache_key, call_type, model, json.dumps(payload),
+                datetime.now().isoformat(), time.time() + ttl
+            ))
+            await db.commit()
+    
+    async def delete_by_type(self, call_type: Optional[str] = None) -> int:
+        """Delete cached payloads of one call type (or all of them)"""
+        async with self.write_connection() as db:
+            if call_type is None:
+                cursor = await db.execute("DELETE FROM ai_response_cache")
+            else:
+                cursor = await db.execute("DELETE FROM ai_response_cache WHERE call_type = ?", (call_type,))
+            await db.commit()
+            return cursor.rowcount
+    
+    async def purge_expired(self) -> int:
+        """Delete expired payloads"""
+        async with self.write_connection() as db:
+            cursor = await db.execute("DELETE FROM ai_response_cache WHERE expires_at <= ?", (time.time(),))
+            await db.commit()
+            return cursor.rowcount
+
+
+@dataclass
+class SummaryJob:
+    """A queued or submitted episode summary job"""
+    id: int
+    guild_id: str
+    episode_number: int
+    status: str
+    batch_id: Optional[str] = None
+    attempts: int = 0
+    error: Optional[str] = None
+
+
+class SQLiteSummaryJobRepository(SQLiteBaseRepository, SummaryJobRepositoryInterface):
+    """SQLite job table for offline (batched) episode summaries
+    
+    Jobs move pending -> submitted (with a batch id) -> done, or back to
+    pending on failure until they run out of attempts and become failed.
+    """
+    
+    async def initialize(self):
+        """Initialize summary job table"""
+        schema = """
+        CREATE TABLE IF NOT EXISTS summary_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id TEXT NOT NULL,
+            episode_number INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',  -- pending/submitted/done/failed
+            batch_id TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+        
+        -- At most one open job per episode
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_summary_jobs_open
+        ON summary_jobs(guild_id, episode_number) WHERE status IN ('pending', 'submitted');
+        
+        CREATE INDEX IF NOT EXISTS idx_summary_jobs_status
+        ON summary_jobs(status, id);
+        
+        CREATE INDEX IF NOT EXISTS idx_summary_jobs_batch
+        ON summary_jobs(batch_id);
+        """
+        
+        await self.execute_schema(schema)
+    
+    async def enqueue_summary(self, guild_id: str, episode_number: int) -> bool:
+        """Queue a summary job unless one is already open for the episode"""
+        now = datetime.now().isoformat()
+        async with self.write_connection() as db:
+            cursor = await db.execute("""
+                INSERT OR IGNORE INTO summary_jobs (guild_id, episode_number, status, created_at, updated_at)
+                VALUES (?, ?, 'pending', ?, ?)
+            """, (guild_id, episode_number, now, now))
+            await db.commit()
+            return cursor.rowcount > 0
+    
+    async def get_summary_status(self, guild_id: str, episode_number: int) -> Optional[str]:
+        """Get the status of an episode's latest summary job"""
+        async with self.read_connection() as db:
+            async with db.execute(
+                "SELECT status FROM summary_jobs WHERE guild_id = ? AND episode_number = ? ORDER BY id DESC LIMIT 1",
+                (guild_id, episode_number)
+            ) as cursor:
+                row = await cursor.fetchone()
+                return row[0] if row else None
+    
+    async def get_pending(self, limit: int) -> List[SummaryJob]:
+        """Get the oldest pending jobs"""
+        return await self._fetch_jobs(
+            "SELECT * FROM summary_jobs WHERE status = 'pending' ORDER BY id LIMIT ?",
+            (limit,)
+        )
+    
+    async def get_batch_jobs(self, batch_id: str) -> List[SummaryJob]:
+        """Get the jobs submitted in one batch"""
+        return await self._fetch_jobs(
+            "SELECT * FROM summary_jobs WHERE batch_id = ? AND status = 'submitted'",
+            (batch_id,)
+        )
+    
+    async def get_submitted_batch_ids(self) -> List[str]:
+        """Get the ids of batches that still have jobs in flight"""
+        async with self.read_connection() as db:
+            async with db.execute(
+                "SELECT DISTINCT batch_id FROM summary_jobs WHERE status = 'submitted'"
+            ) as cursor:
+                rows = await cursor.fetchall()
+                return [row[0] for row in rows]
+    
+    async def mark_submitted(self, job_ids: List[int], batch_id: str) -> None:
+        """Record that jobs were submitted in a batch"""
+        now = datetime.now().isoformat()
+        async with self.write_connection() as db:
+            await db.executemany(
+                "UPDATE summary_jobs SET status = 'submitted', batch_id = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                [(batch_id, now, job_id) for job_id in job_ids]
+            )
+            await db.commit()
+    
+    async def mark_done(self, job_id: int) -> None:
+        """Mark a job as done"""
+        async with self.write_connection() as db:
+            await db.execute(
+                "UPDATE summary_jobs SET status = 'done', error = NULL, updated_at = ? WHERE id = ?",
+                (datetime.now().isoformat(), job_id)
+            )
+            await db.commit()
+    
+    async def mark_failed(self, job_id: int, error: str, max_attempts: int) -> None:
+        """Return a job to the queue, or fail it for good once out of attempts"""
+        async with self.write_connection() as db:
+            await db.execute("""
+                UPDATE summary_jobs
+                SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                    batch_id = NULL, error = ?, updated_at = ?
+                WHERE id = ?
+            """, (max_attempts, error, datetime.now().isoformat(), job_id))
+            await db.commit()
+    
+    async def _fetch_jobs(self, query: str, params) -> List[SummaryJob]:
+        """Run a job query and convert the rows"""
+        async with self.read_connection() as db:
+            async with db.execute(query, params) as cursor:
+                rows = await cursor.fetchall()
+                return [self._row_to_job(row) for row in rows]
+    
+    def _row_to_job(self, row) -> SummaryJob:
+        """Convert database row to SummaryJob"""
+        columns = [
+            'id', 'guild_id', 'episode_number', 'status', 'batch_id',
+            'attempts', 'error', 'created_at', 'updated_at'
+        ]
+        
+        data = dict(zip(columns, row))
+        
+        return SummaryJob(
+            id=data['id'],
+            guild_id=data['guild_id'],
+            episode_number=data['episode_number'],
+            status=data['status'],
+            batch_id=data['batch_id'],
+            attempts=data['attempts'],
+            error=data['error']
+        )
+
+
 # Repository factory for dependency injection
 class SQLiteRepositoryFactory:
-    """Factory for creating SQLite repositories"""
+    """Factory for creating SQLite repositories
+    
+    Owns the shared connection pool used by every repository it creates.
+    """
     
-    def __init__(self, db_path: str):
+    def __init__(self,
+                 db_path: str,
+                 pool_size: int = 4,
+                 acquire_timeout: float = 10.0,
+                 pragmas: Optional[Dict[str, Any]] = None,
+                 checkpoint_interval: float = 0):
         self.db_path = db_path
+        self.pool = SQLiteConnectionPool(
+            db_path,
+            pool_size=pool_size,
+            acquire_timeout=acquire_timeout,
+            pragmas=pragmas,
+            checkpoint_interval=checkpoint_interval
+        )
     
     async def create_character_repository(self) -> SQLiteCharacterRepository:
         """Create and initialize character repository"""
-        repo = SQLiteCharacterRepository(self.db_path)
+        repo = SQLiteCharacterRepository(self.db_path, self.pool)
         await repo.initialize()
         return repo
     
     async def create_episode_repository(self) -> SQLiteEpisodeRepository:
         """Create and initialize episode repository"""
-        repo = SQLiteEpisodeRepository(self.db_path)
+        repo = SQLiteEpisodeRepository(self.db_path, self.pool)
         await repo.initialize()
         return repo
     
     async def create_guild_repository(self) -> SQLiteGuildRepository:
         """Create and initialize guild repository"""
-        repo = SQLiteGuildRepository(self.db_path)
+        repo = SQLiteGuildRepository(self.db_path, self.pool)
         await repo.initialize()
         return repo
     
-    async def create_memory_repository(self) -> SQLiteMemoryRepository:
-        """Create and initialize memory repository"""
-        repo = SQLiteMemoryRepository(self.db_path)
+    async def create_memory_repository(self,
+                                       embedder: Optional[Embedder] = None,
+                                       keyword_weight: float = 0.4) -> SQLiteMemoryRepository:
+        """Create and initialize memory repository (semantic recall when given an embedder)"""
+        repo = SQLiteMemoryRepository(self.db_path, self.pool, embedder, keyword_weight)
         await repo.initialize()
-        return repo
\ No newline at end of file
+        return repo
+    
+    async def create_summary_job_repository(self) -> SQLiteSummaryJobRepository:
+        """Create and initialize summary job repository"""
+        repo = SQLiteSummaryJobRepository(self.db_path, self.pool)
+        await repo.initialize()
+        return repo
+    
+    async def create_ai_response_cache_repository(self) -> SQLiteAIResponseCacheRepository:
+        """Create and initialize AI response cache repository"""
+        repo = SQLiteAIResponseCacheRepository(self.db_path, self.pool)
+        await repo.initialize()
+        return repo
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool wait/usage statistics"""
+        return self.pool.get_stats()
+    
+    async def close(self) -> None:
+        """Close the shared connection pool"""
+        await self.pool.close()
\ No newline at end of file
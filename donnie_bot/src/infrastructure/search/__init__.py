@@ -0,0 +1,17 @@
+"""
+Memory search infrastructure (keyword queries, embeddings, vector index)
+"""
+from .text import tokenize
+from .fts_query import compile_fts_query
+from .embedder import Embedder, HashingEmbedder
+from .vector_index import VectorIndex, pack_vector, unpack_vector
+
+__all__ = [
+    "tokenize",
+    "compile_fts_query",
+    "Embedder",
+    "HashingEmbedder",
+    "VectorIndex",
+    "pack_vector",
+    "unpack_vector"
+]
@@ -0,0 +1,95 @@
+"""
+Local text embedders for semantic memory recall
+"""
+import hashlib
+import math
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Dict, List
+
+from .text import STOPWORDS, tokenize
+
+# Words that mean the same thing in a campaign share a concept feature,
+# so "wyrm attack near the granary" lands close to "dragon fight at the mill"
+CONCEPT_GROUPS = {
+    "dragon": ["dragon", "dragons", "wyrm", "wyrms", "drake", "drakes", "wyvern", "wyverns"],
+    "undead": ["undead", "zombie", "zombies", "skeleton", "skeletons", "ghoul", "ghouls",
+               "lich", "wraith", "wraiths", "vampire", "vampires", "ghost", "ghosts", "specter"],
+    "goblinoid": ["goblin", "goblins", "hobgoblin", "hobgoblins", "bugbear", "bugbears", "kobold", "kobolds"],
+    "farm": ["mill", "windmill", "granary", "barn", "silo", "farm", "farmstead"],
+    "tavern": ["tavern", "inn", "alehouse", "pub", "taproom"],
+    "fight": ["fight", "fought", "fighting", "battle", "battled", "attack", "attacked", "attacks",
+              "combat", "ambush", "ambushed", "clash", "skirmish"],
+    "death": ["dead", "died", "death", "killed", "slain", "slew", "perished"],
+    "treasure": ["treasure", "gold", "coins", "loot", "hoard", "gems", "riches"],
+    "magic": ["magic", "magical", "spell", "spells", "arcane", "enchantment", "ritual", "sorcery"],
+    "temple": ["temple", "shrine", "church", "chapel", "cathedral", "sanctuary"],
+    "forest": ["forest", "woods", "woodland", "grove", "thicket"],
+    "castle": ["castle", "keep", "fortress", "citadel", "stronghold"],
+    "cave": ["cave", "caves", "cavern", "caverns", "grotto", "tunnel", "tunnels"],
+    "road": ["road", "path", "trail", "highway", "crossroads"],
+    "king": ["king", "queen", "monarch", "throne", "crown", "royal"],
+}
+
+CONCEPTS: Dict[str, str] = {word: concept for concept, words in CONCEPT_GROUPS.items() for word in words}
+
+
+class Embedder(ABC):
+    """Turns text into fixed-size unit vectors
+    
+    `name` identifies the model and its settings; stored vectors made by a
+    different name are recomputed.
+    """
+    
+    name: str
+    dim: int
+    
+    @abstractmethod
+    def embed(self, text: str) -> List[float]:
+        """Embed text as a unit-length vector (all zeros for empty text)"""
+        pass
+
+
+class HashingEmbedder(Embedder):
+    """Offline embedder: signed feature hashing of words, character trigrams and concepts
+    
+    Needs no model download. Catches shared words, inflections and typos
+    through trigrams, and common campaign synonyms through CONCEPTS.
+    """
+    
+    WORD_WEIGHT = 1.0
+    TRIGRAM_WEIGHT = 0.3
+    CONCEPT_WEIGHT = 1.5
+    
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+        self.name = f"hashing-v1-{dim}"
+    
+    def embed(self, text: str) -> List[float]:
+        """Embed text as a unit-length vector"""
+        vector = [0.0] * self.dim
+        for feature, weight in self._features(text).items():
+            digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+            sign = 1.0 if digest >> 63 else -1.0
+            vector[digest % self.dim] += sign * weight
+        
+        norm = math.sqrt(sum(value * value for value in vector))
+        return [value / norm for value in vector] if norm else vector
+    
+    def _features(self, text: str) -> Counter:
+        """Weighted features of a text (sublinear in repeated words)"""
+        words = Counter(word for word in tokenize(text) if len(word) > 1 and word not in STOPWORDS)
+        
+        features: Counter = Counter()
+        for word, count in words.items():
+            weight = 1.0 + math.log(count)
+            features[f"w:{word}"] += self.WORD_WEIGHT * weight
+            
+            padded = f"<{word}>"
+            for i in range(len(padded) - 2):
+                features[f"t:{padded[i:i + 3]}"] += self.TRIGRAM_WEIGHT * weight
+            
+            if word in CONCEPTS:
+                features[f"c:{CONCEPTS[word]}"] += self.CONCEPT_WEIGHT * weight
+        
+        return features
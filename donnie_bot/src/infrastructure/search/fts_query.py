@@ -0,0 +1,46 @@
+"""
+Compiles free user text into safe FTS5 queries
+"""
+import re
+from typing import List
+
+from .text import STOPWORDS, tokenize
+
+# A quoted phrase (closing quote optional) or a run of non-space characters
+CHUNK_PATTERN = re.compile(r'"([^"]*)"?|(\S+)')
+
+
+def compile_fts_query(text: str, match_all: bool = False, max_terms: int = 16) -> str:
+    """Compile user text into an FTS5 query ("" when nothing is searchable)
+    
+    - `"dragon's lair"` becomes a phrase search
+    - `gob*` becomes a prefix search (at least two characters before the star)
+    - hyphenated or punctuated words (`half-elf`) become phrases, the way
+      the unicode61 tokenizer splits them
+    - FTS5 operators (AND, OR, NOT, NEAR), column filters and stray quotes
+      are treated as ordinary text
+    
+    Every term is emitted as a quoted string, so no input can change the
+    query structure. Terms are OR'ed, letting BM25 rank memories that match
+    more of them first, unless `match_all` requires every term.
+    """
+    terms: List[str] = []
+    for phrase, bare in CHUNK_PATTERN.findall(text):
+        words = tokenize(phrase if phrase else bare)
+        if not words:
+            continue
+        
+        # Lone common words only add noise; phrases keep them for exactness
+        if not phrase and len(words) == 1 and words[0] in STOPWORDS:
+            continue
+        
+        term = '"' + " ".join(words) + '"'
+        if bare.endswith("*") and len(words[-1]) >= 2:
+            term += "*"
+        
+        if term not in terms:
+            terms.append(term)
+        if len(terms) == max_terms:
+            break
+    
+    return (" " if match_all else " OR ").join(terms)
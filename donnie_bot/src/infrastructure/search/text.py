@@ -0,0 +1,23 @@
+"""
+Text helpers shared by keyword and semantic memory search
+"""
+import re
+from typing import List
+
+# Words too common to say anything about which memories a text relates to
+STOPWORDS = frozenset({
+    "the", "and", "for", "with", "that", "this", "from", "into", "onto", "then",
+    "them", "they", "their", "there", "have", "has", "was", "were", "are", "but",
+    "not", "you", "your", "our", "his", "her", "its", "who", "what", "when",
+    "where", "how", "can", "will", "would", "could", "should", "try", "tries",
+    "at", "in", "on", "of", "to", "we", "us", "it", "is", "be", "by", "as", "or",
+    "a", "an", "i", "my", "me", "he", "she", "him", "up", "so", "if", "do", "no", "all",
+})
+
+# Letters and digits in any script; matches how FTS5's unicode61 tokenizer splits words
+WORD_PATTERN = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words of a text, in order"""
+    return WORD_PATTERN.findall(text.lower())
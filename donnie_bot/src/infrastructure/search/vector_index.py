@@ -0,0 +1,95 @@
+"""
+In-memory cosine similarity index over stored memory vectors
+"""
+import heapq
+import struct
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # numpy is optional; searches fall back to pure Python
+
+
+def pack_vector(vector: Sequence[float]) -> bytes:
+    """Encode a vector as a little-endian float32 BLOB"""
+    return struct.pack(f"<{len(vector)}f", *vector)
+
+
+def unpack_vector(blob: bytes) -> Tuple[float, ...]:
+    """Decode a float32 BLOB"""
+    return struct.unpack(f"<{len(blob) // 4}f", blob)
+
+
+class VectorIndex:
+    """Brute-force cosine index over one guild's unit vectors
+    
+    Vectors arrive as float32 BLOBs. With numpy they are viewed in place as
+    one matrix (np.frombuffer, no per-row copies) and scored with a single
+    matrix-vector product; rows added since the last search are appended
+    in one step. Without numpy the same search runs in pure Python.
+    """
+    
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._ids: List[int] = []
+        self._positions: Dict[int, int] = {}
+        self._blobs: List[bytes] = []
+        self._matrix = None
+        self._matrix_rows = 0
+        self._rows: List[Tuple[float, ...]] = []  # Pure-Python fallback
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def add(self, memory_id: int, blob: bytes) -> None:
+        """Add (or replace) one memory's vector"""
+        if len(blob) != self.dim * 4:
+            return  # Made by a different embedder
+        
+        position = self._positions.get(memory_id)
+        if position is None:
+            self._positions[memory_id] = len(self._ids)
+            self._ids.append(memory_id)
+            self._blobs.append(blob)
+        else:
+            self._blobs[position] = blob
+            self._matrix = None  # Rebuild; replacements are rare
+            self._rows = []
+    
+    def search(self, vector: Sequence[float], limit: int) -> List[Tuple[int, float]]:
+        """Memory ids with the highest cosine similarity, best first"""
+        if not self._ids or limit <= 0:
+            return []
+        
+        if np is not None:
+            scores = self._matrix_view() @ np.asarray(vector, dtype=np.float32)
+            count = min(limit, len(scores))
+            top = np.argpartition(-scores, count - 1)[:count]
+            ranked = sorted(((float(scores[i]), int(i)) for i in top), reverse=True)
+        else:
+            ranked = heapq.nlargest(
+                limit,
+                ((sum(a * b for a, b in zip(row, vector)), i) for i, row in enumerate(self._row_view()))
+            )
+        
+        return [(self._ids[i], score) for score, i in ranked]
+    
+    def _matrix_view(self):
+        """All vectors as one float32 matrix, extended with rows added since the last call"""
+        if self._matrix is None:
+            self._matrix, self._matrix_rows = self._as_matrix(self._blobs), len(self._blobs)
+        elif self._matrix_rows < len(self._blobs):
+            self._matrix = np.vstack([self._matrix, self._as_matrix(self._blobs[self._matrix_rows:])])
+            self._matrix_rows = len(self._blobs)
+        return self._matrix
+    
+    def _as_matrix(self, blobs: List[bytes]):
+        """View concatenated BLOBs as an (n, dim) matrix"""
+        return np.frombuffer(b"".join(blobs), dtype="<f4").reshape(len(blobs), self.dim)
+    
+    def _row_view(self) -> List[Tuple[float, ...]]:
+        """Decoded rows for the pure-Python search"""
+        if len(self._rows) < len(self._blobs):
+            self._rows.extend(unpack_vector(blob) for blob in self._blobs[len(self._rows):])
+        return self._rows
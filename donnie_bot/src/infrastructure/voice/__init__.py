@@ -2,7 +2,9 @@
 Voice service infrastructure
 """
 from .discord_voice import DiscordVoiceService
+from .audio_cache import TTSAudioCache
 
 __all__ = [
-    "DiscordVoiceService"
+    "DiscordVoiceService",
+    "TTSAudioCache"
 ]
\ No newline at end of file
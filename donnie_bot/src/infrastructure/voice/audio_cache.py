@@ -0,0 +1,192 @@
+"""
+Content-addressed on-disk cache of synthesized speech
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ...domain.interfaces.voice_service import AudioData, VoiceConfig
+
+logger = logging.getLogger(__name__)
+
+
+class TTSAudioCache:
+    """Synthesized audio stored under a hash of everything that shapes it
+    
+    Each clip lives in `<sha256>.<format>`, written atomically (temp file +
+    rename) so a crash never leaves a truncated clip behind. A JSON index
+    records every clip's size and last access; the least recently used
+    clips are evicted from that index once the size cap is exceeded, so no
+    file is stat'ed after startup.
+    """
+    
+    INDEX_FILE = "index.json"
+    
+    def __init__(self, directory: Path, max_size_mb: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_size_mb * 1024 * 1024
+        
+        # Least recently used first
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._size = 0
+        self._dirty = False
+        self._flush_lock = asyncio.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+    
+    @staticmethod
+    def make_key(text: str, config: VoiceConfig, engine: str) -> str:
+        """Cache key for a clip: the engine, the text and the voice parameters"""
+        payload = json.dumps([engine, text, config.voice_id, config.speed, config.pitch, config.language])
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+    
+    async def load(self) -> None:
+        """Read the index and reconcile it with the directory (the only full scan)"""
+        await asyncio.to_thread(self._load_index)
+        logger.info(f"🔊 TTS cache loaded: {len(self._entries)} clips, {self._size / (1024 * 1024):.1f} MB")
+    
+    async def get(self, key: str) -> Optional[AudioData]:
+        """Cached audio for a key, if present"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        
+        try:
+            data = await asyncio.to_thread(self._path(key, entry["format"]).read_bytes)
+        except OSError:
+            # Removed behind our back; forget it and synthesize again
+            self._forget(key)
+            self._stats["misses"] += 1
+            return None
+        
+        entry["last_access"] = time.time()
+        self._entries.move_to_end(key)
+        self._dirty = True
+        self._stats["hits"] += 1
+        
+        return AudioData(
+            data=data,
+            format=entry["format"],
+            duration_seconds=entry.get("duration_seconds"),
+            metadata={**entry.get("metadata", {}), "cached": True}
+        )
+    
+    async def put(self, key: str, audio: AudioData) -> None:
+        """Store a clip, then evict down to the size cap"""
+        size = len(audio.data)
+        if size > self.max_bytes:
+            return
+        
+        await asyncio.to_thread(self._write_atomic, self._path(key, audio.format), audio.data)
+        
+        self._forget(key)
+        self._entries[key] = {
+            "format": audio.format,
+            "size": size,
+            "last_access": time.time(),
+            "duration_seconds": audio.duration_seconds,
+            "metadata": audio.metadata,
+        }
+        self._size += size
+        self._dirty = True
+        self._stats["stores"] += 1
+        
+        await self.enforce_limit()
+    
+    async def enforce_limit(self) -> int:
+        """Evict least recently used clips until under the size cap. Returns the number evicted."""
+        evicted: List[Path] = []
+        while self._size > self.max_bytes and self._entries:
+            key, entry = self._entries.popitem(last=False)
+            self._size -= entry["size"]
+            evicted.append(self._path(key, entry["format"]))
+        
+        if evicted:
+            self._dirty = True
+            self._stats["evictions"] += len(evicted)
+            await asyncio.to_thread(self._unlink_all, evicted)
+        
+        await self.flush()
+        return len(evicted)
+    
+    async def flush(self) -> None:
+        """Persist the index if it changed"""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+            
+            self._dirty = False
+            snapshot = json.dumps(self._entries).encode()
+            await asyncio.to_thread(self._write_atomic, self.directory / self.INDEX_FILE, snapshot)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counts and cache size"""
+        return {**self._stats, "clips": len(self._entries), "size_mb": round(self._size / (1024 * 1024), 2)}
+    
+    def _forget(self, key: str) -> None:
+        """Drop a key from the index"""
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._size -= entry["size"]
+            self._dirty = True
+    
+    def _path(self, key: str, audio_format: str) -> Path:
+        """File holding a clip"""
+        return self.directory / f"{key}.{audio_format}"
+    
+    def _load_index(self) -> None:
+        """Load index.json, dropping entries without files and adopting unindexed clips"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        
+        try:
+            entries = json.loads((self.directory / self.INDEX_FILE).read_text())
+        except (OSError, ValueError):
+            entries = {}
+        
+        on_disk = {}
+        for path in self.directory.iterdir():
+            if path.suffix == ".tmp":
+                path.unlink(missing_ok=True)  # Interrupted write
+            elif path.name != self.INDEX_FILE and path.is_file():
+                on_disk[path.name] = path
+        
+        for key, entry in entries.items():
+            if on_disk.pop(f"{key}.{entry['format']}", None):
+                self._entries[key] = entry
+        
+        # Clips written after the last index flush (e.g. before a crash)
+        for name, path in on_disk.items():
+            key, _, audio_format = name.partition(".")
+            stat = path.stat()
+            self._entries[key] = {"format": audio_format, "size": stat.st_size, "last_access": stat.st_mtime}
+        
+        self._entries = OrderedDict(sorted(self._entries.items(), key=lambda item: item[1]["last_access"]))
+        self._size = sum(entry["size"] for entry in self._entries.values())
+        self._dirty = bool(on_disk) or len(self._entries) != len(entries)
+    
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        """Write a file so readers see either the old or the new content, never a partial one"""
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+    
+    @staticmethod
+    def _unlink_all(paths: List[Path]) -> None:
+        """Delete evicted clips"""
+        for path in paths:
+            path.unlink(missing_ok=True)
@@ -3,57 +3,136 @@ Discord voice service implementation
 """
 import discord
 import asyncio
-import tempfile
-import os
-from typing import Dict, List, Optional
+import io
+import itertools
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Dict, List, Optional, Set
 from pathlib import Path
 
 from ...domain.interfaces.voice_service import VoiceServiceInterface, VoiceConfig, AudioData
 from ..config.settings import VoiceConfig as InfraVoiceConfig
+from .audio_cache import TTSAudioCache
+
+logger = logging.getLogger(__name__)
+
+# Name of the synthesis backend; part of the TTS cache key
+TTS_ENGINE = "placeholder_tts"
+
+# FFmpeg demuxer for each AudioData.format (input is piped, so it cannot be probed by extension)
+FFMPEG_INPUT_FORMATS = {
+    "mp3": "mp3",
+    "wav": "wav",
+    "ogg": "ogg",
+    "opus": "ogg",  # Ogg Opus; passed through without re-encoding
+}
+
+# Minimal MP3 frame header + silence until a real TTS engine is plugged in
+PLACEHOLDER_MP3 = b'\xFF\xFB\x90\x00' + b'\x00' * 1000
+
+# Queue ranks (lower plays first)
+PRIORITY_RANK = 0  # DM narration
+NORMAL_RANK = 1
+
+
+@dataclass
+class PlaybackItem:
+    """A clip waiting in (or playing from) a guild's audio queue"""
+    audio: AudioData
+    done: asyncio.Future  # Resolves True when played to the end, False if skipped, dropped or failed
+    cancelled: bool = False
+    skipped: bool = False
 
 
 class DiscordVoiceService(VoiceServiceInterface):
-    """Discord voice service implementation"""
+    """Discord voice service implementation
+    
+    Each connected guild has a playback worker consuming its audio queue:
+    it starts a clip with voice_client.play(after=...) and waits on an
+    asyncio.Event the `after` callback sets, so nothing polls is_playing().
+    Priority clips (DM narration) are queued ahead of everything else;
+    the current clip can be skipped and the queue cleared.
+    """
     
     def __init__(self, config: InfraVoiceConfig):
         self.config = config
         self.voice_clients: Dict[str, discord.VoiceClient] = {}
-        self.audio_queue: Dict[str, asyncio.Queue] = {}
+        self.audio_queue: Dict[str, asyncio.PriorityQueue] = {}
+        self._playback_workers: Dict[str, asyncio.Task] = {}
+        self._now_playing: Dict[str, PlaybackItem] = {}
+        self._queue_order = itertools.count()  # FIFO within a rank
+        self._playback_stats = {"played": 0, "skipped": 0, "dropped": 0, "failed": 0}
         
         # Ensure cache directory exists
         self.cache_dir = Path(config.cache_directory)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        self.tts_cache = TTSAudioCache(self.cache_dir, config.max_cache_size_mb) if config.tts_cache else None
+        self._background: Set[asyncio.Task] = set()
+    
+    async def prepare(self) -> None:
+        """Load the TTS cache and pre-render recurring phrases in the background"""
+        if not self.tts_cache:
+            return
+        
+        await self.tts_cache.load()
+        if self.config.prerender_phrases:
+            self._in_background(self.prerender(self.config.prerender_phrases))
+    
+    async def prerender(self, phrases: List[str], config: VoiceConfig = None) -> int:
+        """Synthesize phrases into the TTS cache ahead of time. Returns the number rendered."""
+        if not self.tts_cache:
+            return 0
+        
+        config = config or VoiceConfig()
+        rendered = 0
+        for phrase in phrases:
+            key = self.tts_cache.make_key(phrase, config, TTS_ENGINE)
+            if key in self.tts_cache:
+                continue
+            
+            audio = await self._synthesize(phrase, config)
+            if "error" not in audio.metadata:
+                await self.tts_cache.put(key, audio)
+                rendered += 1
+        
+        if rendered:
+            logger.info(f"🔊 Pre-rendered {rendered} recurring phrases")
+        return rendered
     
     async def text_to_speech(self, text: str, config: VoiceConfig = None) -> AudioData:
-        """Convert text to speech audio using system TTS"""
+        """Convert text to speech audio, from the TTS cache when it was spoken before"""
         
         if config is None:
             config = VoiceConfig()
         
+        if not self.tts_cache:
+            return await self._synthesize(text, config)
+        
+        key = self.tts_cache.make_key(text, config, TTS_ENGINE)
+        cached = await self.tts_cache.get(key)
+        if cached:
+            return cached
+        
+        audio = await self._synthesize(text, config)
+        if "error" not in audio.metadata:
+            # Written after playback has the audio, so a miss costs no disk latency
+            self._in_background(self.tts_cache.put(key, audio))
+        return audio
+    
+    async def _synthesize(self, text: str, config: VoiceConfig) -> AudioData:
+        """Convert text to speech audio using system TTS"""
         try:
-            # For now, we'll create a simple placeholder audio file
+            # For now, we return simple placeholder audio
             # In a real implementation, you'd integrate with a TTS service like:
             # - Azure Cognitive Services
             # - Google Cloud Text-to-Speech  
             # - Amazon Polly
             # - ElevenLabs
             
-            # Create a temporary audio file (placeholder)
-            # This would normally contain actual TTS audio
-            temp_file = tempfile.NamedTemporaryFile(suffix='.mp3', delete=False)
-            
-            # For demonstration, create minimal MP3 header (won't actually play)
-            # Replace this with actual TTS service integration
-            placeholder_data = b'\xFF\xFB\x90\x00' + b'\x00' * 1000  # Minimal MP3 header + silence
-            temp_file.write(placeholder_data)
-            temp_file.close()
-            
-            # Read the audio data
-            with open(temp_file.name, 'rb') as f:
-                audio_data = f.read()
-            
-            # Clean up temp file
-            os.unlink(temp_file.name)
+            # TTS engines return encoded bytes; keep them in memory, playback
+            # pipes them straight into FFmpeg
+            audio_data = PLACEHOLDER_MP3
             
             return AudioData(
                 data=audio_data,
@@ -63,10 +142,10 @@ class DiscordVoiceService(VoiceServiceInterface):
                     "text": text[:100],
                     "voice_id": config.voice_id,
                     "speed": config.speed,
-                    "source": "placeholder_tts"
+                    "source": TTS_ENGINE
                 }
             )
-            
+        
         except Exception as e:
             # Return minimal audio data on error
             return AudioData(
@@ -75,45 +154,67 @@ class DiscordVoiceService(VoiceServiceInterface):
                 metadata={"error": str(e), "text": text[:50]}
             )
     
-    async def play_audio(self, guild_id: str, audio_data: AudioData) -> bool:
-        """Play audio in a voice channel"""
+    async def play_audio(self, guild_id: str, audio_data: AudioData, priority: bool = False) -> bool:
+        """Queue audio in a guild's voice channel and wait until it has played"""
         
         if not self.config.enabled:
             return False
         
         voice_client = self.voice_clients.get(guild_id)
-        if not voice_client or not voice_client.is_connected():
+        queue = self.audio_queue.get(guild_id)
+        if not voice_client or not voice_client.is_connected() or queue is None:
             return False
         
+        item = PlaybackItem(audio=audio_data, done=asyncio.get_running_loop().create_future())
+        queue.put_nowait((PRIORITY_RANK if priority else NORMAL_RANK, next(self._queue_order), item))
+        
         try:
-            # Save audio to temporary file
-            temp_file = tempfile.NamedTemporaryFile(suffix=f'.{audio_data.format}', delete=False)
-            temp_file.write(audio_data.data)
-            temp_file.close()
-            
-            # Create FFmpeg audio source
-            audio_source = discord.FFmpegPCMAudio(
-                temp_file.name,
-                before_options='-f mp3',  # Input format
-                options='-vn'  # No video
-            )
-            
-            # Play audio (this will block until finished)
-            if not voice_client.is_playing():
-                voice_client.play(audio_source)
-                
-                # Wait for playback to finish
-                while voice_client.is_playing():
-                    await asyncio.sleep(0.1)
-            
-            # Clean up temp file
-            os.unlink(temp_file.name)
-            
-            return True
-            
-        except Exception as e:
-            print(f"❌ Error playing audio in guild {guild_id}: {e}")
+            return await asyncio.shield(item.done)
+        except asyncio.CancelledError:
+            # The caller gave up: drop the clip, or cut it off if it already started
+            item.cancelled = True
+            if self._now_playing.get(guild_id) is item:
+                voice_client.stop()
+            raise
+    
+    async def skip_audio(self, guild_id: str) -> bool:
+        """Stop the clip that is playing; the next queued clip starts"""
+        
+        item = self._now_playing.get(guild_id)
+        voice_client = self.voice_clients.get(guild_id)
+        if not item or not voice_client:
             return False
+        
+        item.skipped = True
+        voice_client.stop()
+        return True
+    
+    async def clear_audio_queue(self, guild_id: str, stop_current: bool = False) -> int:
+        """Drop every queued clip (and optionally the one playing). Returns the number dropped."""
+        
+        queue = self.audio_queue.get(guild_id)
+        dropped = self._drain(queue) if queue else 0
+        
+        if stop_current:
+            await self.skip_audio(guild_id)
+        return dropped
+    
+    async def get_queue_depth(self, guild_id: str) -> int:
+        """Clips waiting to play, plus the one playing"""
+        
+        queue = self.audio_queue.get(guild_id)
+        waiting = queue.qsize() if queue else 0
+        return waiting + (1 if guild_id in self._now_playing else 0)
+    
+    def get_playback_stats(self) -> Dict[str, Any]:
+        """Get playback counters and per-guild queue depths"""
+        return {
+            **self._playback_stats,
+            "queue_depth": {
+                guild_id: queue.qsize() + (1 if guild_id in self._now_playing else 0)
+                for guild_id, queue in self.audio_queue.items()
+            },
+        }
     
     async def join_voice_channel(self, guild_id: str, channel_id: str) -> bool:
         """Join a voice channel"""
@@ -133,7 +234,7 @@ class DiscordVoiceService(VoiceServiceInterface):
             self._mark_as_connected(guild_id, channel_id)
             
             return True
-            
+        
         except Exception as e:
             print(f"❌ Error joining voice channel {channel_id} in guild {guild_id}: {e}")
             return False
@@ -145,7 +246,7 @@ class DiscordVoiceService(VoiceServiceInterface):
         if voice_client and voice_client.is_connected():
             try:
                 await voice_client.disconnect()
-                del self.voice_clients[guild_id]
+                self.unregister_voice_client(guild_id)
             except Exception as e:
                 print(f"❌ Error leaving voice channel in guild {guild_id}: {e}")
     
@@ -174,17 +275,106 @@ class DiscordVoiceService(VoiceServiceInterface):
         """Register a voice client from the Discord bot"""
         self.voice_clients[guild_id] = voice_client
         
-        # Initialize audio queue for this guild
+        # Initialize audio queue and its playback worker for this guild
         if guild_id not in self.audio_queue:
-            self.audio_queue[guild_id] = asyncio.Queue()
+            self.audio_queue[guild_id] = asyncio.PriorityQueue()
+        
+        worker = self._playback_workers.get(guild_id)
+        if worker is None or worker.done():
+            self._playback_workers[guild_id] = asyncio.create_task(self._playback_worker(guild_id))
     
     def unregister_voice_client(self, guild_id: str):
         """Unregister a voice client"""
         if guild_id in self.voice_clients:
             del self.voice_clients[guild_id]
         
+        worker = self._playback_workers.pop(guild_id, None)
+        if worker:
+            worker.cancel()
+        
         if guild_id in self.audio_queue:
-            del self.audio_queue[guild_id]
+            self._drain(self.audio_queue.pop(guild_id))
+    
+    async def _playback_worker(self, guild_id: str) -> None:
+        """Play a guild's queued clips one after another"""
+        queue = self.audio_queue[guild_id]
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            _, _, item = await queue.get()
+            if item.cancelled or item.done.done():
+                continue
+            
+            voice_client = self.voice_clients.get(guild_id)
+            if not voice_client or not voice_client.is_connected():
+                self._finish(item, False, "dropped")
+                continue
+            
+            finished = asyncio.Event()
+            errors: List[Exception] = []
+            
+            def after(error: Optional[Exception]) -> None:
+                # Runs on discord.py's player thread
+                if error:
+                    errors.append(error)
+                loop.call_soon_threadsafe(finished.set)
+            
+            self._now_playing[guild_id] = item
+            source = None
+            try:
+                source = self._audio_source(item.audio)
+                voice_client.play(source, after=after)
+                await finished.wait()
+            except asyncio.CancelledError:
+                voice_client.stop()
+                self._finish(item, False, "dropped")
+                raise
+            except Exception as e:
+                # play() never took the source (disconnect race, already playing): stop FFmpeg here
+                if source:
+                    source.cleanup()
+                errors.append(e)
+            finally:
+                self._now_playing.pop(guild_id, None)
+            
+            if errors:
+                logger.error(f"❌ Error playing audio in guild {guild_id}: {errors[0]}")
+                self._finish(item, False, "failed")
+            elif item.skipped or item.cancelled:
+                self._finish(item, False, "skipped")
+            else:
+                self._finish(item, True, "played")
+    
+    def _finish(self, item: PlaybackItem, played: bool, outcome: str) -> None:
+        """Resolve a clip's waiter and count the outcome"""
+        self._playback_stats[outcome] += 1
+        if not item.done.done():
+            item.done.set_result(played)
+    
+    def _drain(self, queue: asyncio.PriorityQueue) -> int:
+        """Empty a queue, resolving each waiting clip as not played"""
+        dropped = 0
+        while not queue.empty():
+            _, _, item = queue.get_nowait()
+            if not item.done.done():
+                self._finish(item, False, "dropped")
+                dropped += 1
+        return dropped
+    
+    @staticmethod
+    def _audio_source(audio_data: AudioData) -> discord.AudioSource:
+        """FFmpeg source fed from memory through stdin (no temp files)
+        
+        FFmpegOpusAudio has FFmpeg encode straight to Opus, so discord.py
+        sends its packets without encoding PCM itself.
+        """
+        return discord.FFmpegOpusAudio(
+            io.BytesIO(audio_data.data),
+            pipe=True,
+            codec="copy" if audio_data.format == "opus" else None,
+            before_options=f"-f {FFMPEG_INPUT_FORMATS.get(audio_data.format, audio_data.format)}",
+            options="-vn"  # No video
+        )
     
     def _mark_as_connected(self, guild_id: str, channel_id: str):
         """Mark that we intend to be connected to a channel"""
@@ -193,35 +383,44 @@ class DiscordVoiceService(VoiceServiceInterface):
         pass
     
     async def cleanup_cache(self):
-        """Clean up old cached audio files"""
+        """Evict least recently used TTS clips beyond the size cap"""
+        if not self.tts_cache:
+            return
         
         try:
-            cache_size = 0
-            files_to_delete = []
-            
-            # Calculate current cache size
-            for file_path in self.cache_dir.glob("*"):
-                if file_path.is_file():
-                    cache_size += file_path.stat().st_size
-            
-            # Convert to MB
-            cache_size_mb = cache_size / (1024 * 1024)
-            
-            if cache_size_mb > self.config.max_cache_size_mb:
-                # Delete oldest files first
-                files = list(self.cache_dir.glob("*"))
-                files.sort(key=lambda x: x.stat().st_mtime)
-                
-                for file_path in files:
-                    if cache_size_mb <= self.config.max_cache_size_mb:
-                        break
-                    
-                    file_size_mb = file_path.stat().st_size / (1024 * 1024)
-                    file_path.unlink()
-                    cache_size_mb -= file_size_mb
-            
+            evicted = await self.tts_cache.enforce_limit()
+            if evicted:
+                logger.info(f"🧹 Evicted {evicted} TTS clips from the audio cache")
         except Exception as e:
-            print(f"❌ Error cleaning up audio cache: {e}")
+            logger.error(f"❌ Error cleaning up audio cache: {e}")
+    
+    async def close(self):
+        """Stop playback workers and background cache work, then persist the TTS cache index"""
+        workers = list(self._playback_workers.values())
+        for guild_id in list(self.voice_clients):
+            self.unregister_voice_client(guild_id)
+        await asyncio.gather(*workers, return_exceptions=True)
+        
+        tasks = [task for task in self._background if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        
+        await self.cleanup_cache()
+        if self.tts_cache:
+            logger.info(f"📊 TTS cache stats: {self.tts_cache.get_stats()}")
+    
+    def _in_background(self, work: Awaitable) -> None:
+        """Run cache work without holding up playback (kept referenced until done)"""
+        task = asyncio.ensure_future(work)
+        self._background.add(task)
+        task.add_done_callback(self._background_done)
+    
+    def _background_done(self, task: asyncio.Task) -> None:
+        """Forget a finished background task, logging its failure"""
+        self._background.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.warning(f"⚠️ TTS cache write failed: {task.exception()}")
 
 
 # TTS Integration Examples (commented out - choose one to implement)
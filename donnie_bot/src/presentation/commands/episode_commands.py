@@ -7,8 +7,12 @@ from discord import app_commands
 from typing import Optional
 
 from ..dependency_injection import container
-from ..utils import handle_use_case_result, create_episode_embed
-from ...application.dto import StartEpisodeCommand, EndEpisodeCommand, GetContextCommand
+from ..utils import (
+    handle_use_case_result, create_episode_embed, create_dm_response_embed,
+    StreamingEmbedEditor, EMBED_DESCRIPTION_LIMIT
+)
+from ...application.dto import StartEpisodeCommand, EndEpisodeCommand, GetContextCommand, PlayerActionCommand
+from ...infrastructure.config.settings import settings
 
 
 class EpisodeCommands(commands.Cog):
@@ -168,8 +172,19 @@ class EpisodeCommands(commands.Cog):
             await interaction.followup.send(**response)
     
     async def _handle_summary(self, interaction, episode_number):
-        """Generate episode summary"""
-        await interaction.followup.send("📝 Episode summary feature coming soon!")
+        """Show an episode's stored summary"""
+        result = await container.episode_use_case.get_episode_summary(str(interaction.guild.id), episode_number)
+        
+        if result.success:
+            embed = discord.Embed(
+                title=f"📚 Episode {result.episode.episode_number}: {result.episode.name}",
+                description=result.metadata["summary"][:EMBED_DESCRIPTION_LIMIT],
+                color=0x7B68EE
+            )
+            await interaction.followup.send(embed=embed)
+        else:
+            response = handle_use_case_result(result)
+            await interaction.followup.send(**response)
 
 
 class QuickActionCommands(commands.Cog):
@@ -193,13 +208,40 @@ class QuickActionCommands(commands.Cog):
             await interaction.followup.send("❌ Actions require AI service (missing API key)")
             return
         
-        await interaction.followup.send(f"🎲 {interaction.user.display_name} attempts: *{action}*\n\n⚡ Processing...")
+        command = PlayerActionCommand(
+            guild_id=str(interaction.guild.id),
+            discord_user_id=str(interaction.user.id),
+            action_text=action
+        )
+        
+        # Post a placeholder and stream the DM response into it
+        editor = None
+        if settings.ai.stream_responses:
+            build_embed = lambda text, in_progress: create_dm_response_embed(
+                interaction.user.display_name, action, text, in_progress
+            )
+            placeholder = await interaction.followup.send(embed=build_embed("", True), wait=True)
+            editor = StreamingEmbedEditor(
+                placeholder,
+                build_embed,
+                interval=settings.ai.stream_edit_interval_ms / 1000,
+                min_chars=settings.ai.stream_edit_min_chars
+            )
         
-        # For now, just acknowledge the action
-        embed = discord.Embed(
-            title="🎲 Action Received",
-            description=f"Action processing will be implemented soon!\n\nYour action: *{action}*",
-            color=0x7B68EE
+        result = await container.action_use_case.handle_player_action(
+            command,
+            on_text=editor.update if editor else None
         )
         
-        await interaction.edit_original_response(content=None, embed=embed)
\ No newline at end of file
+        if result.success and result.dm_response:
+            if editor:
+                await editor.finish(result.dm_response.text)
+            else:
+                embed = create_dm_response_embed(interaction.user.display_name, action, result.dm_response.text)
+                await interaction.followup.send(embed=embed)
+        else:
+            response = handle_use_case_result(result)
+            if editor:
+                await editor.message.edit(**response)
+            else:
+                await interaction.followup.send(**response)
@@ -25,6 +25,8 @@ class VoiceCommands(commands.Cog):
         app_commands.Choice(name="Join Voice Channel", value="join"),
         app_commands.Choice(name="Leave Voice Channel", value="leave"),
         app_commands.Choice(name="Speak Text", value="speak"),
+        app_commands.Choice(name="Skip Current Audio", value="skip"),
+        app_commands.Choice(name="Stop Audio", value="stop"),
         app_commands.Choice(name="Voice Status", value="status")
     ])
     async def voice(self,
@@ -46,11 +48,17 @@ class VoiceCommands(commands.Cog):
                 await self._handle_leave(interaction)
             elif action == "speak":
                 await self._handle_speak(interaction, text)
+            elif action == "skip":
+                result = await container.voice_use_case.skip_audio(str(interaction.guild_id))
+                await interaction.followup.send(result.message if result.success else f"❌ {result.error}")
+            elif action == "stop":
+                result = await container.voice_use_case.stop_audio(str(interaction.guild_id))
+                await interaction.followup.send(result.message if result.success else f"❌ {result.error}")
             elif action == "status":
                 await self._handle_status(interaction)
             else:
                 await interaction.followup.send("❌ Unknown voice action")
-                
+        
         except Exception as e:
             await interaction.followup.send(f"❌ Error: {str(e)}")
     
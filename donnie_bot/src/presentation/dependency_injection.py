@@ -6,11 +6,18 @@ from typing import Optional
 
 from ..infrastructure.config.settings import settings
 from ..infrastructure.database.sqlite_repository import SQLiteRepositoryFactory
+from ..infrastructure.database.maintenance import DatabaseMaintenanceWorker
 from ..infrastructure.ai.claude_service import ClaudeService
+from ..infrastructure.ai.response_cache import AIResponseCache
+from ..infrastructure.ai.batch_summarizer import BatchSummarizer
+from ..infrastructure.search import HashingEmbedder
 from ..infrastructure.voice.discord_voice import DiscordVoiceService
 from ..infrastructure.cache.memory_cache import MemoryCacheService
+from ..infrastructure.cache.cached_repositories import (
+    CachedCharacterRepository, CachedEpisodeRepository, CachedMemoryRepository
+)
 
-from ..domain.services import CharacterService, EpisodeService, MemoryService, CombatService
+from ..domain.services import CharacterService, EpisodeService, MemoryService, CombatService, RollingSummaryService
 from ..application.use_cases import (
     ManageCharacterUseCase,
     StartEpisodeUseCase, 
@@ -30,12 +37,15 @@ class DependencyContainer:
         self.ai_service: Optional[ClaudeService] = None
         self.voice_service: Optional[DiscordVoiceService] = None
         self.cache_service: Optional[MemoryCacheService] = None
+        self.batch_summarizer: Optional[BatchSummarizer] = None
+        self.maintenance_worker: Optional[DatabaseMaintenanceWorker] = None
         
         # Domain Services
         self.character_service: Optional[CharacterService] = None
         self.episode_service: Optional[EpisodeService] = None
         self.memory_service: Optional[MemoryService] = None
         self.combat_service: Optional[CombatService] = None
+        self.summary_service: Optional[RollingSummaryService] = None
         
         # Use Cases
         self.character_use_case: Optional[ManageCharacterUseCase] = None
@@ -58,7 +68,7 @@ class DependencyContainer:
             await self._initialize_use_cases()
             
             logger.info("✅ Dependency container initialized successfully")
-            
+        
         except Exception as e:
             logger.error(f"❌ Failed to initialize dependencies: {e}")
             raise
@@ -68,23 +78,22 @@ class DependencyContainer:
         logger.info("Initializing infrastructure layer...")
         
         # Database repositories
-        self.repository_factory = SQLiteRepositoryFactory(settings.database.path)
-        logger.info(f"📁 Database path: {settings.database.path}")
-        
-        # AI service (optional)
-        if settings.ai.is_available():
-            try:
-                self.ai_service = ClaudeService(settings.ai)
-                logger.info(f"🤖 AI service initialized (model: {settings.ai.model})")
-            except Exception as e:
-                logger.warning(f"⚠️ AI service failed to initialize: {e}")
-                self.ai_service = None
-        else:
-            logger.warning("⚠️ AI service not initialized - missing API key (AI features disabled)")
+        self.repository_factory = SQLiteRepositoryFactory(
+            settings.database.path,
+            pool_size=settings.database.pool_size,
+            acquire_timeout=settings.database.pool_acquire_timeout_seconds,
+            pragmas=settings.database.get_pragmas(),
+            checkpoint_interval=settings.database.wal_checkpoint_interval_seconds
+        )
+        logger.info(
+            f"📁 Database path: {settings.database.path} "
+            f"(pool size: {settings.database.pool_size}, durability: {settings.database.durability_profile})"
+        )
         
         # Voice service
         self.voice_service = DiscordVoiceService(settings.voice)
         if settings.voice.enabled:
+            await self.voice_service.prepare()
             logger.info("🔊 Voice service initialized")
         else:
             logger.info("🔇 Voice service disabled")
@@ -95,6 +104,26 @@ class DependencyContainer:
             logger.info(f"💾 Cache service initialized (max size: {settings.cache.max_size})")
         else:
             logger.info("Cache service disabled")
+        
+        # AI service (optional)
+        if settings.ai.is_available():
+            try:
+                # Persistent cache for repeatable calls (intent, character sheets, summaries)
+                response_cache = None
+                if settings.ai.response_cache_enabled:
+                    response_cache = AIResponseCache(
+                        await self.repository_factory.create_ai_response_cache_repository(),
+                        self.cache_service if settings.cache.enabled else None
+                    )
+                
+                # Every API attempt queues fairly per guild and priority lane inside the client
+                self.ai_service = ClaudeService(settings.ai, response_cache)
+                logger.info(f"🤖 AI service initialized (model: {settings.ai.model})")
+            except Exception as e:
+                logger.warning(f"⚠️ AI service failed to initialize: {e}")
+                self.ai_service = None
+        else:
+            logger.warning("⚠️ AI service not initialized - missing API key (AI features disabled)")
     
     async def _initialize_domain_services(self):
         """Initialize domain services"""
@@ -104,7 +133,42 @@ class DependencyContainer:
         character_repo = await self.repository_factory.create_character_repository()
         episode_repo = await self.repository_factory.create_episode_repository()
         guild_repo = await self.repository_factory.create_guild_repository()
-        memory_repo = await self.repository_factory.create_memory_repository()
+        memory_repo = await self.repository_factory.create_memory_repository(
+            embedder=HashingEmbedder(settings.database.embedding_dim) if settings.database.semantic_search else None,
+            keyword_weight=settings.database.hybrid_keyword_weight
+        )
+        
+        # Retention and compaction (started by the bot once it is set up)
+        if settings.maintenance.enabled:
+            response_cache = self.ai_service.response_cache if self.ai_service else None
+            self.maintenance_worker = DatabaseMaintenanceWorker(
+                pool=self.repository_factory.pool,
+                memory_store=memory_repo,
+                episode_store=episode_repo,
+                config=settings.maintenance,
+                ai_service=self.ai_service,  # Can be None
+                response_cache_store=response_cache.store if response_cache else None,
+                cache_service=self.cache_service if settings.cache.enabled else None
+            )
+        
+        # Read-through / write-through caching in front of SQLite
+        if settings.cache.enabled:
+            character_repo = CachedCharacterRepository(character_repo, self.cache_service)
+            episode_repo = CachedEpisodeRepository(episode_repo, self.cache_service)
+            memory_repo = CachedMemoryRepository(memory_repo, self.cache_service)
+        
+        # Offline episode summaries through the Message Batches API
+        summary_jobs = None
+        if self.ai_service and settings.ai.batch_summaries:
+            summary_jobs = await self.repository_factory.create_summary_job_repository()
+            self.batch_summarizer = BatchSummarizer(
+                self.ai_service,
+                summary_jobs,
+                episode_repo,
+                memory_repo,
+                settings.ai
+            )
+            self.batch_summarizer.start()
         
         # Character service
         self.character_service = CharacterService(
@@ -116,7 +180,8 @@ class DependencyContainer:
         self.episode_service = EpisodeService(
             episode_repo=episode_repo,
             memory_repo=memory_repo,
-            ai_service=self.ai_service  # Can be None
+            ai_service=self.ai_service,  # Can be None
+            summary_jobs=summary_jobs  # None means summaries are generated inline
         )
         
         # Memory service
@@ -128,6 +193,17 @@ class DependencyContainer:
         # Combat service (doesn't need AI)
         self.combat_service = CombatService()
         
+        # Rolling summaries keep prompt context bounded in long campaigns
+        if self.ai_service and settings.ai.rolling_summaries:
+            self.summary_service = RollingSummaryService(
+                memory_repo=memory_repo,
+                episode_repo=episode_repo,
+                ai_service=self.ai_service,
+                scene_size=settings.ai.scene_summary_interactions,
+                scenes_per_episode=settings.ai.scenes_per_episode_summary,
+                episodes_per_arc=settings.ai.episodes_per_arc_summary
+            )
+        
         logger.info("✅ Domain services initialized")
     
     async def _initialize_use_cases(self):
@@ -155,13 +231,20 @@ class DependencyContainer:
             ai_service=self.ai_service,  # Can be None
             memory_service=self.memory_service,
             combat_service=self.combat_service,
-            cache_service=self.cache_service
+            cache_service=self.cache_service,
+            summary_service=self.summary_service,  # Can be None
+            round_window_seconds=settings.ai.round_window_ms / 1000 if settings.ai.round_mode else None,
+            round_max_actions=settings.ai.round_max_actions,
+            context_memory_limit=settings.ai.context_candidate_memories,
+            relevant_memory_limit=settings.ai.context_relevant_memories
         )
         
         # Voice processing
         self.voice_use_case = ProcessVoiceUseCase(
             voice_service=self.voice_service,
-            cache_service=self.cache_service
+            cache_service=self.cache_service,
+            lookahead=settings.voice.speech_lookahead,
+            max_chunk_chars=settings.voice.speech_chunk_max_chars
         )
         
         logger.info("✅ Use cases initialized")
@@ -170,14 +253,40 @@ class DependencyContainer:
         """Cleanup resources"""
         logger.info("🧹 Cleaning up dependencies...")
         
+        # AI usage summary
+        if self.ai_service:
+            logger.info(f"📊 AI token usage: {self.ai_service.get_usage_stats()}")
+            logger.info(f"📊 AI scheduler stats: {self.ai_service.scheduler.get_stats()}")
+            logger.info(f"📊 AI queue stats: {self.ai_service.scheduler.admission.get_stats()}")
+            if self.ai_service.response_cache:
+                logger.info(f"📊 AI response cache stats: {self.ai_service.response_cache.get_stats()}")
+        
+        # Background workers
+        if self.maintenance_worker:
+            await self.maintenance_worker.stop()
+            logger.info(f"📊 Maintenance stats: {self.maintenance_worker.get_stats()}")
+        
+        if self.batch_summarizer:
+            await self.batch_summarizer.stop()
+            logger.info(f"📊 Batch summarizer stats: {self.batch_summarizer.get_stats()}")
+        
+        if self.summary_service:
+            await self.summary_service.stop()
+            logger.info(f"📊 Rolling summary stats: {self.summary_service.get_stats()}")
+        
         # Voice cleanup
         if self.voice_service:
-            await self.voice_service.cleanup_cache()
+            await self.voice_service.close()
         
         # Cache cleanup  
         if self.cache_service:
             await self.cache_service.clear()
         
+        # Database cleanup
+        if self.repository_factory:
+            logger.info(f"📊 Database pool stats: {self.repository_factory.get_pool_stats()}")
+            await self.repository_factory.close()
+        
         logger.info("✅ Cleanup completed")
 
 
@@ -47,6 +47,10 @@ class DonnieBot(commands.Bot):
             await container.initialize()
             self.dependencies_loaded = True
             
+            # Retention and compaction run in the background for the bot's lifetime
+            if container.maintenance_worker:
+                container.maintenance_worker.start()
+            
             # Add all command groups
             await self.add_cog(CharacterCommands(self))
             await self.add_cog(PartyCommands(self))
@@ -63,7 +67,7 @@ class DonnieBot(commands.Bot):
             logger.info(f"✅ Synced {len(synced)} commands")
             
             logger.info("🎲 Donnie the DM setup completed!")
-            
+        
         except Exception as e:
             logger.error(f"❌ Failed to setup bot: {e}")
             raise
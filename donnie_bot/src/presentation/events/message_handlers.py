@@ -8,7 +8,9 @@ import re
 from typing import Optional
 
 from ..dependency_injection import container
+from ..utils import create_dm_response_embed, StreamingEmbedEditor
 from ...application.dto import PlayerActionCommand, VoiceCommand
+from ...infrastructure.config.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -142,59 +144,84 @@ class MessageHandlers:
                     action_type="natural"
                 )
                 
-                result = await container.action_use_case.handle_player_action(command)
-                
-                # Remove thinking reaction
-                await message.remove_reaction('🤔', self.bot.user)
-                
-                if result.success and result.dm_response:
-                    # Create response
-                    response_text = result.dm_response.text
-                    
-                    # Add success reaction
-                    await message.add_reaction('✅')
-                    
-                    # Send response as reply
-                    embed = discord.Embed(
-                        description=response_text,
-                        color=0x7B68EE
+                # Stream into a placeholder reply so players see text as soon as it arrives
+                editor = None
+                if settings.ai.stream_responses:
+                    build_embed = lambda text, in_progress: create_dm_response_embed(
+                        message.author.display_name, action_text, text, in_progress
                     )
-                    
-                    embed.set_author(
-                        name=f"DM Response to {message.author.display_name}",
-                        icon_url="https://i.imgur.com/dice.png"
+                    placeholder = await message.reply(embed=build_embed("", True), mention_author=False)
+                    editor = StreamingEmbedEditor(
+                        placeholder,
+                        build_embed,
+                        interval=settings.ai.stream_edit_interval_ms / 1000,
+                        min_chars=settings.ai.stream_edit_min_chars
                     )
-                    
-                    # Reference the original message
-                    embed.add_field(
-                        name="💭 Action",
-                        value=f"*{action_text}*",
-                        inline=False
+                
+                # Narrate in voice as the response streams in, a sentence at a time
+                speech = None
+                if container.voice_use_case:
+                    speech = await container.voice_use_case.open_speech_stream(VoiceCommand(
+                        guild_id=str(message.guild.id),
+                        action="speak",
+                        priority=True  # DM narration
+                    ))
+                
+                async def on_text(text: str) -> None:
+                    if editor:
+                        await editor.update(text)
+                    if speech:
+                        await speech.feed(text)
+                
+                try:
+                    result = await container.action_use_case.handle_player_action(
+                        command,
+                        on_text=on_text if editor or speech else None
                     )
                     
-                    response_message = await message.reply(embed=embed, mention_author=False)
+                    # Remove thinking reaction
+                    await message.remove_reaction('🤔', self.bot.user)
                     
-                    # Try to speak response if voice is connected
-                    if container.voice_service:
-                        voice_connected = await container.voice_service.is_connected(str(message.guild.id))
-                        if voice_connected:
-                            voice_command = VoiceCommand(
-                                guild_id=str(message.guild.id),
-                                action="speak",
-                                text_to_speak=response_text
-                            )
+                    if result.success and result.dm_response:
+                        # Create response
+                        response_text = result.dm_response.text
+                        
+                        # Add success reaction
+                        await message.add_reaction('✅')
+                        
+                        if editor:
+                            await editor.finish(response_text)
+                        else:
+                            embed = create_dm_response_embed(message.author.display_name, action_text, response_text)
+                            await message.reply(embed=embed, mention_author=False)
+                        
+                        # Speak the rest of the response if voice is connected
+                        if speech:
                             try:
-                                await container.voice_use_case.speak_text(voice_command)
+                                await speech.finish(response_text)
                             except:
                                 pass  # Don't fail if voice fails
-                else:
-                    # Add error reaction
-                    await message.add_reaction('❌')
+                    else:
+                        # Add error reaction
+                        await message.add_reaction('❌')
+                        
+                        if result.metadata.get("busy"):
+                            # Shed under load: tell the player instead of failing silently
+                            if editor:
+                                await editor.message.edit(content=result.error, embed=None)
+                            else:
+                                await message.reply(result.error, mention_author=False)
+                        elif editor:
+                            await editor.message.delete()
+                finally:
+                    # Stop any narration that was not finished (errors, failed or shed actions)
+                    if speech:
+                        await speech.cancel()
             else:
                 # Add confused reaction if AI not available
                 await message.remove_reaction('🤔', self.bot.user)
                 await message.add_reaction('❓')
-                
+        
         except discord.Forbidden:
             # Bot doesn't have permission to add reactions
             pass
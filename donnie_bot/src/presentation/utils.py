@@ -1,11 +1,18 @@
 """
 Presentation layer utilities - shared functions
 """
+import asyncio
+import logging
 import discord
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Optional
 
 from ..application.dto import CommandResult
 
+logger = logging.getLogger(__name__)
+
+# Discord rejects embed descriptions longer than this
+EMBED_DESCRIPTION_LIMIT = 4096
+
 
 def handle_use_case_result(result: CommandResult, success_message: str = None) -> Dict[str, Any]:
     """Convert use case result to Discord response"""
@@ -122,4 +129,92 @@ def create_episode_embed(episode) -> discord.Embed:
             inline=False
         )
     
-    return embed
\ No newline at end of file
+    return embed
+
+
+def create_dm_response_embed(author_name: str,
+                             action_text: str,
+                             response_text: str,
+                             in_progress: bool = False) -> discord.Embed:
+    """Create the DM response embed for a player action (partial while streaming)"""
+    if not response_text:
+        response_text = "*The DM considers your action...*"
+    elif len(response_text) > EMBED_DESCRIPTION_LIMIT:
+        response_text = response_text[:EMBED_DESCRIPTION_LIMIT - 3] + "..."
+    
+    embed = discord.Embed(
+        description=response_text,
+        color=0x7B68EE
+    )
+    
+    embed.set_author(
+        name=f"DM Response to {author_name}",
+        icon_url="https://i.imgur.com/dice.png"
+    )
+    
+    embed.add_field(
+        name="💭 Action",
+        value=f"*{action_text[:1000]}*",
+        inline=False
+    )
+    
+    if in_progress:
+        embed.set_footer(text="✍️ The DM is writing...")
+    
+    return embed
+
+
+class StreamingEmbedEditor:
+    """Progressively edit a Discord message while response text streams in
+    
+    Edits are throttled to one every `interval` seconds unless `min_chars` of
+    new text has arrived, and at most one edit is in flight at a time so a
+    slow Discord edit never stalls the stream; the next edit simply picks up
+    the latest text.
+    """
+    
+    def __init__(self,
+                 message: discord.Message,
+                 build_embed: Callable[[str, bool], discord.Embed],
+                 interval: float = 0.75,
+                 min_chars: int = 200):
+        self.message = message
+        self.build_embed = build_embed
+        self.interval = interval
+        self.min_chars = min_chars
+        self.edits = 0
+        self._latest = ""
+        self._last_edit_at = 0.0
+        self._last_edit_len = 0
+        self._pending: Optional[asyncio.Task] = None
+    
+    async def update(self, text: str) -> None:
+        """Record new text and schedule an edit if one is due"""
+        self._latest = text
+        
+        if self._pending and not self._pending.done():
+            return
+        
+        now = asyncio.get_running_loop().time()
+        if (now - self._last_edit_at >= self.interval
+                or len(text) - self._last_edit_len >= self.min_chars):
+            self._pending = asyncio.create_task(self._edit(text, in_progress=True))
+    
+    async def finish(self, text: Optional[str] = None) -> None:
+        """Wait for any in-flight edit, then show the final text"""
+        if self._pending:
+            await self._pending
+            self._pending = None
+        
+        await self._edit(self._latest if text is None else text, in_progress=False)
+    
+    async def _edit(self, text: str, in_progress: bool) -> None:
+        """Edit the message, logging rather than raising on Discord errors"""
+        self._last_edit_at = asyncio.get_running_loop().time()
+        self._last_edit_len = len(text)
+        
+        try:
+            await self.message.edit(embed=self.build_embed(text, in_progress))
+            self.edits += 1
+        except discord.HTTPException as e:
+            logger.warning(f"Failed to edit streaming message: {e}")
@@ -0,0 +1,7 @@
+"""
+Shared test setup: import the bot the way main.py does
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,134 @@
+"""
+BatchSummarizer against the in-process Message Batches fake and a real SQLite file
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.domain.entities import Episode
+from src.infrastructure.ai.batch_summarizer import BatchSummarizer, CUSTOM_ID_PREFIX
+from src.infrastructure.ai.claude_service import ClaudeService
+from src.infrastructure.ai.fake_batch_client import FakeBatchClient
+from src.infrastructure.config.settings import AIConfig
+from src.infrastructure.database.sqlite_repository import SQLiteRepositoryFactory
+
+GUILD_ID = "guild-1"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def make_summarizer(db_path, episodes=1, max_attempts=3, **fake_options):
+    """Summarizer wired to temp-file repositories, with one queued job per episode"""
+    factory = SQLiteRepositoryFactory(str(db_path), pool_size=2)
+    episode_repo = await factory.create_episode_repository()
+    memory_repo = await factory.create_memory_repository()
+    jobs = await factory.create_summary_job_repository()
+    
+    for number in range(1, episodes + 1):
+        await episode_repo.save_episode(Episode(
+            guild_id=GUILD_ID,
+            episode_number=number,
+            name=f"Episode {number}",
+            start_time=datetime.now()
+        ))
+        await jobs.enqueue_summary(GUILD_ID, number)
+    
+    config = AIConfig(api_key="test-key", summary_job_max_attempts=max_attempts)
+    client = FakeBatchClient(**fake_options)
+    summarizer = BatchSummarizer(ClaudeService(config), jobs, episode_repo, memory_repo, config, client=client)
+    return factory, summarizer, client
+
+
+async def job_row(jobs, episode_number):
+    """(status, attempts, error) of an episode's latest job"""
+    async with jobs.read_connection() as db:
+        async with db.execute(
+            "SELECT status, attempts, error FROM summary_jobs WHERE guild_id = ? AND episode_number = ? ORDER BY id DESC",
+            (GUILD_ID, episode_number)
+        ) as cursor:
+            return await cursor.fetchone()
+
+
+def test_success_writes_summary_and_marks_job_done(tmp_path):
+    async def scenario():
+        factory, summarizer, _ = await make_summarizer(
+            tmp_path / "bot.db", respond=lambda params: "  The party found the dragon.  "
+        )
+        try:
+            assert await summarizer.submit_pending()
+            assert await summarizer.collect_results() == 1
+            
+            episode = await summarizer.episode_repo.get_episode(GUILD_ID, 1)
+            assert episode.summary == "The party found the dragon."
+            assert (await job_row(summarizer.jobs, 1))[0] == "done"
+            assert summarizer.get_stats()["summaries_written"] == 1
+        finally:
+            await factory.close()
+    
+    run(scenario())
+
+
+def test_failed_request_is_requeued_until_out_of_attempts(tmp_path):
+    async def scenario():
+        factory, summarizer, _ = await make_summarizer(
+            tmp_path / "bot.db", max_attempts=2, fail_custom_ids={f"{CUSTOM_ID_PREFIX}1"}
+        )
+        try:
+            await summarizer.run_once()
+            status, attempts, error = await job_row(summarizer.jobs, 1)
+            assert (status, attempts) == ("pending", 1)
+            assert "errored" in error
+            
+            await summarizer.run_once()
+            assert (await job_row(summarizer.jobs, 1))[:2] == ("failed", 2)
+            
+            # Failed for good: nothing left to submit
+            assert await summarizer.submit_pending() is None
+            assert (await summarizer.episode_repo.get_episode(GUILD_ID, 1)).summary == ""
+        finally:
+            await factory.close()
+    
+    run(scenario())
+
+
+def test_result_missing_from_batch_is_failed(tmp_path):
+    async def scenario():
+        factory, summarizer, client = await make_summarizer(tmp_path / "bot.db", episodes=2)
+        try:
+            batch_id = await summarizer.submit_pending()
+            
+            # The batch only reports on the first request
+            client.messages.batches.batches[batch_id]["requests"].pop()
+            
+            assert await summarizer.collect_results() == 1
+            assert (await job_row(summarizer.jobs, 1))[0] == "done"
+            status, _, error = await job_row(summarizer.jobs, 2)
+            assert status == "pending"
+            assert error == "missing from batch results"
+            assert summarizer.get_stats()["jobs_failed"] == 1
+        finally:
+            await factory.close()
+    
+    run(scenario())
+
+
+@pytest.mark.parametrize("polls_until_ended", [2, 3])
+def test_batch_in_progress_leaves_jobs_submitted(tmp_path, polls_until_ended):
+    async def scenario():
+        factory, summarizer, _ = await make_summarizer(tmp_path / "bot.db", polls_until_ended=polls_until_ended)
+        try:
+            await summarizer.submit_pending()
+            
+            for _ in range(polls_until_ended - 1):
+                assert await summarizer.collect_results() == 0
+                assert (await job_row(summarizer.jobs, 1))[0] == "submitted"
+            
+            assert await summarizer.collect_results() == 1
+            assert (await job_row(summarizer.jobs, 1))[0] == "done"
+        finally:
+            await factory.close()
+    
+    run(scenario())
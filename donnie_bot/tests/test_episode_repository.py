@@ -0,0 +1,69 @@
+"""
+Append-only episode interactions through the cached repository and a real SQLite file
+"""
+import asyncio
+
+from src.domain.entities import Episode
+from src.infrastructure.cache.cached_repositories import CachedEpisodeRepository
+from src.infrastructure.cache.memory_cache import MemoryCacheService
+from src.infrastructure.config.settings import CacheConfig
+from src.infrastructure.database.sqlite_repository import SQLiteRepositoryFactory
+
+GUILD_ID = "guild-1"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def play_episode(db_path, interactions):
+    """Start an episode and append `interactions` turns through the cached repository"""
+    factory = SQLiteRepositoryFactory(str(db_path), pool_size=2)
+    repo = CachedEpisodeRepository(await factory.create_episode_repository(), MemoryCacheService(CacheConfig()))
+    
+    episode = Episode(guild_id=GUILD_ID, episode_number=1, name="The Sunken Keep")
+    episode.start_episode("Rain hammers the drawbridge.")
+    await repo.save_episode(episode)
+    
+    # Appends go to the cached instance, as EpisodeService does
+    episode = await repo.get_current_episode(GUILD_ID)
+    for turn in range(1, interactions + 1):
+        interaction = episode.add_interaction("Thorin", f"action {turn}", f"response {turn}")
+        await repo.append_interaction(episode, interaction)
+    
+    return factory, repo
+
+
+def test_appends_are_numbered_in_order(tmp_path):
+    async def scenario():
+        factory, repo = await play_episode(tmp_path / "bot.db", 3)
+        try:
+            return await repo.get_interactions(GUILD_ID, 1)
+        finally:
+            await factory.close()
+    
+    interactions = run(scenario())
+    
+    assert [interaction.seq for interaction in interactions] == [1, 2, 3]
+    assert [interaction.player_action for interaction in interactions] == ["action 1", "action 2", "action 3"]
+
+
+def test_cached_episode_keeps_only_the_newest_interactions(tmp_path):
+    window = CachedEpisodeRepository.INTERACTION_WINDOW
+    
+    async def scenario():
+        factory, repo = await play_episode(tmp_path / "bot.db", window + 5)
+        try:
+            episode = await repo.get_current_episode(GUILD_ID)
+            older = await repo.get_interactions(GUILD_ID, 1, before_seq=episode.interactions[0].seq)
+            return episode, older
+        finally:
+            await factory.close()
+    
+    episode, older = run(scenario())
+    
+    assert len(episode.interactions) == window
+    assert episode.interactions[-1].seq == window + 5
+    assert episode.get_interaction_count() == window + 5
+    assert episode.has_unloaded_interactions()
+    assert [interaction.seq for interaction in older] == [1, 2, 3, 4, 5]
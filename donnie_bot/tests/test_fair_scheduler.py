@@ -0,0 +1,139 @@
+"""
+FairAIScheduler admission, fairness and cancellation
+"""
+import asyncio
+
+import pytest
+
+from src.domain.interfaces.ai_service import AIPriority, AIServiceBusyError
+from src.infrastructure.ai.fair_scheduler import FairAIScheduler
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def hold(scheduler, guild_id, release, lane=AIPriority.NORMAL, order=None):
+    """Take a slot and keep it until `release` is set"""
+    async with scheduler.slot(guild_id, lane):
+        if order is not None:
+            order.append(guild_id)
+        await release.wait()
+
+
+def test_cancelled_waiter_does_not_leak_the_released_slot():
+    async def scenario():
+        scheduler = FairAIScheduler(max_in_flight=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold(scheduler, "g1", release))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold(scheduler, "g2", asyncio.Event()))
+        await asyncio.sleep(0)
+        
+        # The holder releases before the cancelled waiter gets to withdraw
+        release.set()
+        waiter.cancel()
+        
+        await holder
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        
+        assert scheduler.in_flight == 0
+        assert scheduler.get_stats()["queued"] == 0
+        
+        async def take():
+            async with scheduler.slot("g3", AIPriority.NORMAL):
+                return True
+        
+        assert await asyncio.wait_for(take(), timeout=1)
+    
+    run(scenario())
+
+
+def test_cancelled_waiter_is_withdrawn():
+    async def scenario():
+        scheduler = FairAIScheduler(max_in_flight=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold(scheduler, "g1", release))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold(scheduler, "g2", asyncio.Event()))
+        await asyncio.sleep(0)
+        
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert scheduler.get_stats()["queued"] == 0
+        
+        release.set()
+        await holder
+        assert scheduler.in_flight == 0
+    
+    run(scenario())
+
+
+def test_guilds_take_turns():
+    async def scenario():
+        scheduler = FairAIScheduler(max_in_flight=1, max_queue_per_guild=10)
+        release = asyncio.Event()
+        order = []
+        
+        blocker = asyncio.create_task(hold(scheduler, "blocker", release))
+        await asyncio.sleep(0)
+        tasks = [asyncio.create_task(hold(scheduler, "busy", release, order=order)) for _ in range(3)]
+        tasks.append(asyncio.create_task(hold(scheduler, "quiet", release, order=order)))
+        await asyncio.sleep(0)
+        
+        release.set()
+        await asyncio.gather(blocker, *tasks)
+        
+        # The quiet guild does not wait behind the busy guild's whole backlog
+        assert order.index("quiet") == 1
+    
+    run(scenario())
+
+
+def test_requests_beyond_the_guild_queue_limit_are_shed():
+    async def scenario():
+        scheduler = FairAIScheduler(max_in_flight=1, max_queue_per_guild=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold(scheduler, "g", release))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(hold(scheduler, "g", release))
+        await asyncio.sleep(0)
+        
+        with pytest.raises(AIServiceBusyError):
+            async with scheduler.slot("g", AIPriority.NORMAL):
+                pass
+        
+        # High priority is only shed by the global limit
+        high = asyncio.create_task(hold(scheduler, "g", release, lane=AIPriority.HIGH))
+        await asyncio.sleep(0)
+        
+        release.set()
+        await asyncio.gather(holder, queued, high)
+        assert scheduler.get_stats()["lanes"]["normal"]["shed"] == 1
+    
+    run(scenario())
+
+
+def test_guild_at_its_cap_does_not_hold_slots_other_guilds_could_use():
+    async def scenario():
+        scheduler = FairAIScheduler(max_in_flight=2, max_in_flight_per_guild=1)
+        release = asyncio.Event()
+        order = []
+        
+        first = asyncio.create_task(hold(scheduler, "busy", release, order=order))
+        second = asyncio.create_task(hold(scheduler, "busy", release, order=order))
+        await asyncio.sleep(0)
+        assert scheduler.in_flight == 1
+        
+        other = asyncio.create_task(hold(scheduler, "quiet", release, order=order))
+        await asyncio.sleep(0)
+        assert order == ["busy", "quiet"]
+        
+        release.set()
+        await asyncio.gather(first, second, other)
+        assert order == ["busy", "quiet", "busy"]
+        assert scheduler.in_flight == 0
+    
+    run(scenario())
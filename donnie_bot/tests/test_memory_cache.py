@@ -0,0 +1,93 @@
+"""
+MemoryCacheService single-flight loads and per-entry TTLs
+"""
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from src.infrastructure.cache.memory_cache import MemoryCacheService
+from src.infrastructure.config.settings import CacheConfig
+
+KEY = "character:guild-1:user-1"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class SlowLoader:
+    """Loader that counts calls and returns `value` once `release` is set"""
+    
+    def __init__(self, value="loaded"):
+        self.value = value
+        self.calls = 0
+        self.release = asyncio.Event()
+    
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        return self.value
+
+
+def test_concurrent_misses_share_one_load():
+    async def scenario():
+        cache = MemoryCacheService(CacheConfig())
+        loader = SlowLoader()
+        callers = [asyncio.create_task(cache.get_or_load(KEY, loader)) for _ in range(5)]
+        await asyncio.sleep(0)
+        loader.release.set()
+        
+        results = await asyncio.gather(*callers)
+        return cache, loader, results
+    
+    cache, loader, results = run(scenario())
+    
+    assert results == ["loaded"] * 5
+    assert loader.calls == 1
+    assert cache.coalesced_loads == 4
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_load():
+    async def scenario():
+        cache = MemoryCacheService(CacheConfig())
+        loader = SlowLoader()
+        first = asyncio.create_task(cache.get_or_load(KEY, loader))
+        second = asyncio.create_task(cache.get_or_load(KEY, loader))
+        await asyncio.sleep(0)
+        
+        first.cancel()
+        loader.release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        
+        return await second, await cache.get(KEY), loader.calls
+    
+    assert run(scenario()) == ("loaded", "loaded", 1)
+
+
+def test_write_during_load_is_not_overwritten_by_the_stale_result():
+    async def scenario():
+        cache = MemoryCacheService(CacheConfig())
+        loader = SlowLoader("stale")
+        caller = asyncio.create_task(cache.get_or_load(KEY, loader))
+        await asyncio.sleep(0)
+        
+        await cache.set(KEY, "fresh")
+        loader.release.set()
+        
+        return await caller, await cache.get(KEY)
+    
+    assert run(scenario()) == ("stale", "fresh")
+
+
+def test_entries_expire_on_their_own_ttl():
+    async def scenario():
+        cache = MemoryCacheService(CacheConfig(character_ttl=3600))
+        await cache.set(KEY, "short", ttl=timedelta(milliseconds=50))
+        await cache.set("character:guild-1:user-2", "default")
+        
+        await asyncio.sleep(0.1)
+        return await cache.get(KEY), await cache.get("character:guild-1:user-2")
+    
+    assert run(scenario()) == (None, "default")
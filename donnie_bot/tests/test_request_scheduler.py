@@ -0,0 +1,158 @@
+"""
+AIRequestScheduler retries and circuit breaker
+"""
+import asyncio
+
+import pytest
+
+from src.infrastructure.ai.request_scheduler import AIRequestScheduler, CircuitBreaker, CircuitOpenError
+from src.infrastructure.config.settings import AIConfig
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def make_scheduler(**overrides) -> AIRequestScheduler:
+    options = dict(
+        api_key="test-key",
+        max_retries=2,
+        retry_base_delay_seconds=0.0,
+        retry_max_delay_seconds=0.0,
+        circuit_breaker_threshold=2,
+        circuit_breaker_reset_seconds=0.0,
+        requests_per_minute=6000,
+        timeout_seconds=5,
+    )
+    options.update(overrides)
+    return AIRequestScheduler(AIConfig(**options))
+
+
+def open_breaker(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_transient_errors_are_retried():
+    async def scenario():
+        scheduler = make_scheduler()
+        calls = []
+        
+        async def flaky():
+            calls.append(1)
+            if len(calls) < 2:
+                raise asyncio.TimeoutError()
+            return "ok"
+        
+        assert await scheduler.run(flaky) == "ok"
+        assert scheduler.get_stats()["retries"] == 1
+    
+    run(scenario())
+
+
+def test_backoff_does_not_hold_an_in_flight_slot():
+    async def scenario():
+        scheduler = make_scheduler(max_concurrent_requests=1)
+        scheduler.backoff_delay = lambda error, attempt: 0.2
+        calls = []
+        
+        async def flaky():
+            calls.append("flaky")
+            if calls.count("flaky") < 2:
+                raise asyncio.TimeoutError()
+            return "flaky"
+        
+        async def quick():
+            calls.append("quick")
+            return "quick"
+        
+        retrying = asyncio.create_task(scheduler.run(flaky, "g1"))
+        await asyncio.sleep(0.05)
+        
+        # Served while the other request sleeps off its backoff
+        assert await asyncio.wait_for(scheduler.run(quick, "g2"), timeout=0.1) == "quick"
+        assert await retrying == "flaky"
+        assert calls == ["flaky", "quick", "flaky"]
+    
+    run(scenario())
+
+
+def test_non_retryable_errors_are_raised_at_once():
+    async def scenario():
+        scheduler = make_scheduler()
+        
+        async def broken():
+            raise ValueError("bad request")
+        
+        with pytest.raises(ValueError):
+            await scheduler.run(broken)
+        assert scheduler.get_stats()["attempts"] == 1
+        assert scheduler.breaker.state == "closed"
+    
+    run(scenario())
+
+
+def test_breaker_fails_fast_while_open():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    open_breaker(breaker)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_half_open_allows_one_trial_and_closes_on_success():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    open_breaker(breaker)
+    
+    assert breaker.before_call() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.before_call() is False
+
+
+def test_cancelled_trial_does_not_leave_the_breaker_stuck():
+    async def scenario():
+        scheduler = make_scheduler()
+        open_breaker(scheduler.breaker)
+        started = asyncio.Event()
+        
+        async def hang():
+            started.set()
+            await asyncio.Event().wait()
+        
+        trial = asyncio.create_task(scheduler.run(hang))
+        await started.wait()
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        
+        async def ok():
+            return "ok"
+        
+        # The next call becomes the trial and closes the circuit
+        assert await scheduler.run(ok) == "ok"
+        assert scheduler.breaker.state == "closed"
+    
+    run(scenario())
+
+
+def test_abandoned_stream_trial_does_not_leave_the_breaker_stuck():
+    async def scenario():
+        scheduler = make_scheduler()
+        open_breaker(scheduler.breaker)
+        
+        async def stream():
+            async with scheduler.slot("guild"):
+                yield "first"
+                yield "second"
+        
+        deltas = stream()
+        assert await deltas.__anext__() == "first"
+        await deltas.aclose()  # GeneratorExit inside the slot
+        
+        assert scheduler.breaker.before_call() is True
+    
+    run(scenario())
@@ -0,0 +1,115 @@
+"""
+Round mode: actions posted in the same window are resolved by one AI call
+"""
+import asyncio
+
+from src.application.use_cases.handle_action import HandleActionUseCase
+from src.domain.entities import Character, CharacterClass, Episode, Race
+from src.domain.interfaces.ai_service import AIContext, AIResponse
+
+GUILD_ID = "guild-1"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class FakeRoundAI:
+    """Narrates each round action as "<name>: <action>", or fails every call"""
+    
+    def __init__(self, error=None):
+        self.error = error
+        self.rounds = []
+    
+    async def generate_round_results(self, context, actions):
+        self.rounds.append([action.character.name for action in actions])
+        if self.error:
+            raise self.error
+        return [AIResponse(text=f"{action.character.name}: {action.action_text}") for action in actions]
+
+
+def make_use_case(ai_service, window=0.05, max_actions=6):
+    return HandleActionUseCase(
+        episode_service=None,
+        character_service=None,
+        ai_service=ai_service,
+        round_window_seconds=window,
+        round_max_actions=max_actions
+    )
+
+
+def action_context(episode, name, action_text):
+    character = Character(
+        name=name,
+        player_name=name.lower(),
+        discord_user_id=f"user-{name.lower()}",
+        race=Race.HUMAN,
+        character_class=CharacterClass.FIGHTER
+    )
+    return AIContext(episode=episode, character=character, action_text=action_text)
+
+
+def test_actions_in_one_window_share_one_ai_call():
+    async def scenario():
+        ai = FakeRoundAI()
+        use_case = make_use_case(ai)
+        episode = Episode(guild_id=GUILD_ID, episode_number=1, name="The Sunken Keep")
+        
+        results = await asyncio.gather(
+            use_case._resolve_in_round(action_context(episode, "Thorin", "I bar the door")),
+            use_case._resolve_in_round(action_context(episode, "Lyra", "I light a torch"))
+        )
+        return ai, use_case, results
+    
+    ai, use_case, results = run(scenario())
+    
+    assert ai.rounds == [["Thorin", "Lyra"]]
+    assert [result.text for result in results] == ["Thorin: I bar the door", "Lyra: I light a torch"]
+    assert not use_case._rounds
+
+
+def test_action_alone_in_its_window_is_resolved_separately():
+    async def scenario():
+        ai = FakeRoundAI()
+        use_case = make_use_case(ai)
+        episode = Episode(guild_id=GUILD_ID, episode_number=1, name="The Sunken Keep")
+        return ai, await use_case._resolve_in_round(action_context(episode, "Thorin", "I bar the door"))
+    
+    ai, result = run(scenario())
+    
+    assert result is None
+    assert ai.rounds == []
+
+
+def test_full_round_resolves_without_waiting_out_the_window():
+    async def scenario():
+        ai = FakeRoundAI()
+        use_case = make_use_case(ai, window=30, max_actions=2)
+        episode = Episode(guild_id=GUILD_ID, episode_number=1, name="The Sunken Keep")
+        
+        await asyncio.wait_for(asyncio.gather(
+            use_case._resolve_in_round(action_context(episode, "Thorin", "I bar the door")),
+            use_case._resolve_in_round(action_context(episode, "Lyra", "I light a torch"))
+        ), timeout=1)
+        return ai
+    
+    assert run(scenario()).rounds == [["Thorin", "Lyra"]]
+
+
+def test_round_error_fails_every_waiting_action():
+    async def scenario():
+        use_case = make_use_case(FakeRoundAI(error=RuntimeError("overloaded")))
+        episode = Episode(guild_id=GUILD_ID, episode_number=1, name="The Sunken Keep")
+        
+        results = await asyncio.gather(
+            use_case._resolve_in_round(action_context(episode, "Thorin", "I bar the door")),
+            use_case._resolve_in_round(action_context(episode, "Lyra", "I light a torch")),
+            return_exceptions=True
+        )
+        return use_case, results
+    
+    use_case, results = run(scenario())
+    
+    assert [str(result) for result in results] == ["overloaded", "overloaded"]
+    assert not use_case._rounds
+    assert not use_case._round_tasks
@@ -0,0 +1,115 @@
+"""
+Sentence splitting and SpeechStream synthesis/playback against a fake voice service
+"""
+import asyncio
+
+import pytest
+
+from src.application.use_cases.process_voice import SpeechStream, take_sentences
+from src.domain.interfaces.voice_service import VoiceConfig
+
+GUILD_ID = "guild-1"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class FakeVoiceService:
+    """Synthesizes text to its bytes and records what was played"""
+    
+    def __init__(self, fail_tts=(), play_result=True, play_error=None):
+        self.fail_tts = set(fail_tts)
+        self.play_result = play_result
+        self.play_error = play_error
+        self.played = []
+    
+    async def text_to_speech(self, text, config):
+        await asyncio.sleep(0)
+        if text in self.fail_tts:
+            raise RuntimeError("tts down")
+        return text.encode()
+    
+    async def play_audio(self, guild_id, audio, priority=False):
+        await asyncio.sleep(0)
+        if self.play_error:
+            raise self.play_error
+        if self.play_result:
+            self.played.append(audio.decode())
+        return self.play_result
+
+
+def test_only_complete_sentences_are_taken_until_final():
+    text = "Dr. Vex raises 3.5 fingers. Then"
+    
+    chunks, offset = take_sentences(text, 0, 300)
+    assert chunks == ["Dr. Vex raises 3.5 fingers."]
+    
+    chunks, offset = take_sentences(text, offset, 300, final=True)
+    assert chunks == ["Then"]
+    assert offset == len(text)
+
+
+def test_long_sentences_are_cut_at_clauses_and_words():
+    text = "The goblin, snarling, leaps over the table and swings wildly at your head."
+    
+    chunks, _ = take_sentences(text, 0, 30, final=True)
+    
+    assert chunks == ["The goblin, snarling,", "leaps over the table and", "swings wildly at your head."]
+    assert all(len(chunk) <= 30 for chunk in chunks)
+
+
+def test_streamed_narration_is_played_in_order():
+    async def scenario():
+        voice = FakeVoiceService()
+        stream = SpeechStream(voice, GUILD_ID, VoiceConfig(), lookahead=1)
+        await stream.feed("The door creaks. A cold")
+        await stream.feed("The door creaks. A cold wind blows! Something")
+        result = await stream.finish()
+        return voice, result
+    
+    voice, result = run(scenario())
+    
+    assert result.success
+    assert voice.played == ["The door creaks.", "A cold wind blows!", "Something"]
+    assert result.metadata["chunks"] == 3
+
+
+def test_failed_synthesis_skips_only_that_sentence():
+    async def scenario():
+        voice = FakeVoiceService(fail_tts={"Second."})
+        stream = SpeechStream(voice, GUILD_ID, VoiceConfig())
+        return voice, await stream.finish("First. Second. Third.")
+    
+    voice, result = run(scenario())
+    
+    assert result.success
+    assert voice.played == ["First.", "Third."]
+    assert result.metadata["failed"] == 1
+
+
+def test_disconnect_stops_synthesis():
+    async def scenario():
+        stream = SpeechStream(FakeVoiceService(play_result=False), GUILD_ID, VoiceConfig(), lookahead=1)
+        result = await asyncio.wait_for(stream.finish("One. Two. Three. Four."), timeout=1)
+        await asyncio.sleep(0)
+        return result, stream._synthesizer.done()
+    
+    result, synthesizer_done = run(scenario())
+    
+    assert not result.success
+    assert synthesizer_done
+
+
+def test_playback_error_does_not_leave_the_synthesizer_blocked():
+    async def scenario():
+        voice = FakeVoiceService(play_error=RuntimeError("voice client gone"))
+        stream = SpeechStream(voice, GUILD_ID, VoiceConfig(), lookahead=1)
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(stream.finish("One. Two. Three. Four."), timeout=1)
+        
+        # Checked before asyncio.run cancels whatever is left
+        await asyncio.sleep(0)
+        return stream._synthesizer.done()
+    
+    assert run(scenario())